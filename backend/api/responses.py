@@ -0,0 +1,293 @@
+"""
+Response classes and middleware for the API
+orjson serialization for dict responses and negotiated gzip/brotli
+compression for large JSON and text bodies
+"""
+
+from typing import Any, Optional, Dict
+import hashlib
+import zlib
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional - gzip only without it
+    brotli = None
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson
+    
+    Routes that return raw store dicts (document detail with full_text)
+    skip pydantic, so this is what serializes them; orjson is several
+    times faster than the stdlib encoder on large strings.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS, default=str)
+
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+# Encodings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding the client accepts (q > 0), or None"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """ETag as set by the route, without the -gzip/-br suffix added on compression"""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def held_etag(if_none_match: Optional[str], etag: str) -> str:
+    """
+    Validator the client holds for etag, encoding suffix included
+    
+    A 304 must repeat the ETag of the cached representation; a compressed
+    one carries the -gzip/-br suffix that the route doesn't know about.
+    """
+    for candidate in (if_none_match or "").split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate != etag and strip_encoding_suffix(candidate) == etag:
+            return candidate
+    return etag
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that determine a representation"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as the RFC requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if strip_encoding_suffix(candidate) == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, max_age: Optional[int] = None) -> Dict[str, str]:
+    """
+    Validator and CDN-friendly Cache-Control for a cacheable GET
+    
+    Args:
+        max_age: Lifetime for browsers and shared caches alike (default:
+            cache_max_age / cdn_cache_max_age from settings)
+    """
+    if max_age is None:
+        cache_control = f"public, max-age={settings.cache_max_age}, s-maxage={settings.cdn_cache_max_age}"
+    else:
+        cache_control = f"public, max-age={max_age}"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(request: Request, etag: str, max_age: Optional[int] = None) -> Optional[Response]:
+    """304 response if the client's copy matches etag, else None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag, max_age))
+    return None
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with a Cache-Control lifetime
+    
+    Starlette already answers Range requests (206) and sends ETag and
+    Last-Modified; this adds the max-age so browsers and CDNs keep large
+    PDFs instead of revalidating them on every view.
+    """
+    
+    def __init__(self, *args, max_age: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+    
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", f"public, max-age={self.max_age}")
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression for JSON and text responses
+    
+    Bodies below compression_min_size are sent as-is. Compressible
+    responses always get Vary: Accept-Encoding, and a compressed
+    response's ETag is suffixed with the encoding so caches never serve
+    one encoding's bytes under another's validator; a 304 gets the
+    suffixed ETag back when that is the one the client revalidated. Range
+    responses, already-encoded responses and binary types pass through
+    untouched.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        responder = _CompressionResponder(
+            self.app, encoding, self.minimum_size, request_headers.get("if-none-match")
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: Optional[str], minimum_size: int, if_none_match: Optional[str]):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.if_none_match = if_none_match
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+    
+    async def send_with_compression(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            compressible = (
+                content_type.startswith(COMPRESSIBLE_TYPES)
+                and "content-encoding" not in headers
+                and "content-range" not in headers
+                and message["status"] not in (204, 206, 304)
+            )
+            if compressible:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            elif message["status"] == 304 and "etag" in headers:
+                self._revalidated(MutableHeaders(raw=message["headers"]))
+            # Hold the start message until the first body chunk shows the size
+            self.start_message = message
+            self.passthrough = not compressible or self.encoding is None
+            return
+        
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        
+        if self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send(message)
+                return
+            
+            self.compressor = _Compressor(self.encoding)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and etag.endswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+            
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(compressed))
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            
+            # Streaming: length is unknown until the end
+            del headers["Content-Length"]
+            await self._flush_start()
+        
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+    
+    def _revalidated(self, headers: MutableHeaders):
+        """Echo the compressed validator on a 304 for a compressed cached copy"""
+        etag = held_etag(self.if_none_match, headers["etag"])
+        if etag != headers["etag"]:
+            headers["ETag"] = etag
+            headers.add_vary_header("Accept-Encoding")
+    
+    async def _flush_start(self):
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor"""
+    
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=settings.brotli_quality)
+        else:
+            self._impl = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes) -> bytes:
+        if not data:
+            return b""
+        if self.encoding == "br":
+            return self._impl.process(data)
+        return self._impl.compress(data)
+    
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._impl.finish()
+        return self._impl.flush()
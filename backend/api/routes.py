@@ -3,18 +3,30 @@ API Routes for Government Truth Portal
 All endpoints for documents, Q&A, fact-checking, and translation
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
-from fastapi.responses import FileResponse
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from typing import Optional, List, Tuple, Dict
+import aiofiles
+import asyncio
+import hashlib
 import os
 import shutil
+import uuid
+import zlib
 
+from api.responses import make_etag, cache_headers, not_modified
 from api.schemas import (
-    DocumentListResponse, DocumentDetail, DocumentSummary, DocumentTimeline,
+    DocumentListResponse, DocumentDetail, DocumentSummary, DocumentTimeline, DocumentText,
+    DocumentBundle,
+    DocumentTablesResponse, TableSearchResponse,
     AskRequest, AskResponse, SourceCitation,
     FactCheckRequest, FactCheckResponse, Evidence,
     URLFactCheckRequest, URLFactCheckResponse,
     TranslateRequest, TranslateResponse,
+    TranslateBatchRequest, TranslateBatchResponse,
+    IngestionJobStatus,
     HealthStatus, ErrorResponse,
     DocumentCategory, Language, FactCheckVerdict
 )
@@ -24,12 +36,51 @@ from services.rag_engine import get_rag_engine
 from services.fact_checker import get_fact_checker
 from services.azure_translator import get_translator_service
 from services.gemini_client import get_gemini_client
+from services.llm_router import get_llm_router
 from services.url_extractor import get_url_extractor
+from services.ingestion import get_ingestion_queue, stored_filename, STAGES
+from services.table_index import get_table_index
+from services.page_index import page_for_offset, page_range_bounds
+from services.pdf_pages import get_pdf_page_service, file_version, MAX_SLICE_PAGES
+from services.url_cache import canonicalize_url, get_url_response_cache, url_cache_ttl
 from config import settings
 
 
 router = APIRouter()
 
+# Security: File size limit (50MB)
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_FORM_OVERHEAD = 64 * 1024  # Multipart boundaries and form fields
+
+# Upload form, documented by hand since the body is parsed as a stream
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file", "title"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "title": {"type": "string"},
+                "category": {"type": "string", "default": "report"},
+                "source_ministry": {"type": "string"},
+                "source_url": {"type": "string"},
+            },
+        }}},
+    }
+}
+
+ALLOWED_UPLOAD_EXTENSIONS = ('.pdf', '.doc', '.docx')
+
+# Most characters returned by one /documents/{doc_id}/text request
+MAX_TEXT_WINDOW = 50_000
+
+# Display fields translated for the viewer (the timeline is translated separately)
+TRANSLATED_FIELDS = ("title", "summary", "key_points")
+
+# Heavy or internal fields left out of the viewer bundle
+BUNDLE_EXCLUDED_FIELDS = {"full_text", "page_offsets", "timeline", "translations", "content_hash"}
+
 
 # ============== Health Check ==============
 
@@ -37,10 +88,15 @@ router = APIRouter()
 async def health_check():
     """Check API health and service availability"""
     services = settings.validate_required_keys()
+    try:
+        llm = get_llm_router().status()
+    except ValueError:
+        llm = None  # No LLM provider configured
     return HealthStatus(
         status="healthy",
         version="1.0.0",
-        services=services
+        services=services,
+        llm=llm
     )
 
 
@@ -48,12 +104,21 @@ async def health_check():
 
 @router.get("/documents", response_model=DocumentListResponse, tags=["Documents"])
 async def list_documents(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100)
 ):
     """Get list of all documents"""
     store = get_document_store()
+    
+    etag = make_etag("documents", store.generation, category, page, page_size)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers.update(cache_headers(etag))
+    
     result = store.get_all(category=category, page=page, page_size=page_size)
     
     # Convert to response model
@@ -66,7 +131,8 @@ async def list_documents(
             summary=doc.get("summary", "")[:300],
             source_ministry=doc.get("source_ministry"),
             published_date=doc.get("published_date"),
-            thumbnail_gradient=(hash(doc["id"]) % 4) + 1
+            # crc32, not hash(): str hashes differ per process and would break ETags
+            thumbnail_gradient=(zlib.crc32(doc["id"].encode("utf-8")) % 4) + 1
         ))
     
     return DocumentListResponse(
@@ -78,20 +144,177 @@ async def list_documents(
 
 
 @router.get("/documents/{doc_id}", tags=["Documents"])
-async def get_document(doc_id: str):
-    """Get full document details"""
+async def get_document(
+    doc_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,summary,key_points,pdf_url")
+):
+    """
+    Get document details
+    
+    Without `fields` the whole record is returned, including full_text;
+    use /documents/{doc_id}/text to read the text a window at a time.
+    """
     store = get_document_store()
     doc = store.get(doc_id)
     
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    return doc
+    wanted = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if wanted:
+        wanted.add("id")
+    
+    etag = _document_etag(doc, "detail", ",".join(sorted(wanted)))
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers.update(cache_headers(etag))
+    
+    if not wanted:
+        return doc
+    return {key: value for key, value in doc.items() if key in wanted}
+
+
+def _document_etag(doc: dict, *parts) -> str:
+    """ETag for a representation of a document; changes with every store update"""
+    return make_etag(doc["id"], doc.get("version", 1), doc.get("updated_at"), *parts)
+
+
+@router.get("/documents/{doc_id}/text", response_model=DocumentText, tags=["Documents"])
+async def get_document_text(
+    doc_id: str,
+    start_page: Optional[int] = Query(None, ge=1, description="First page of the range"),
+    end_page: Optional[int] = Query(None, ge=1, description="Last page of the range (default: start_page)"),
+    offset: int = Query(0, ge=0, description="Character offset into the page range (or the whole text)"),
+    length: int = Query(MAX_TEXT_WINDOW, ge=1, le=MAX_TEXT_WINDOW, description="Maximum characters to return")
+):
+    """
+    Get a window of a document's full text
+    
+    Select pages with start_page/end_page (resolved through the stored
+    page offsets) and/or a character window with offset/length. Long
+    ranges are truncated; request next_offset to continue.
+    """
+    store = get_document_store()
+    doc = store.get(doc_id)
+    
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    full_text = doc.get("full_text") or ""
+    if not full_text:
+        raise HTTPException(status_code=400, detail="Document text not available")
+    
+    page_offsets = doc.get("page_offsets") or []
+    range_start, range_end = 0, len(full_text)
+    
+    if start_page is not None or end_page is not None:
+        if not page_offsets:
+            raise HTTPException(status_code=400, detail="Page index not available for this document")
+        first = start_page or 1
+        last = end_page or first
+        if last < first:
+            raise HTTPException(status_code=400, detail="end_page must not be before start_page")
+        bounds = page_range_bounds(page_offsets, first, last)
+        if bounds is None:
+            raise HTTPException(status_code=404, detail="Pages not found in document")
+        range_start, range_end = bounds
+    
+    char_start = min(range_start + offset, range_end)
+    char_end = min(char_start + length, range_end)
+    
+    return DocumentText(
+        document_id=doc_id,
+        text=full_text[char_start:char_end],
+        char_start=char_start,
+        char_end=char_end,
+        total_chars=len(full_text),
+        first_page=page_for_offset(page_offsets, char_start),
+        last_page=page_for_offset(page_offsets, max(char_start, char_end - 1)),
+        next_offset=char_end - range_start if char_end < range_end else None
+    )
+
+
+@router.get("/documents/{doc_id}/pages", tags=["Documents"], response_class=Response)
+async def get_document_pages(
+    doc_id: str,
+    request: Request,
+    start: int = Query(1, ge=1, description="First page"),
+    end: Optional[int] = Query(None, ge=1, description="Last page (default: start)")
+):
+    """
+    Pages start..end of a document's PDF as a small standalone PDF
+    
+    Lets the viewer show a page of a multi-hundred-MB bill without
+    downloading the whole file.
+    """
+    file_path = _document_pdf_path(doc_id)
+    last = end or start
+    if last < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if last - start + 1 > MAX_SLICE_PAGES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SLICE_PAGES} pages per request")
+    
+    etag = make_etag(file_version(file_path), "pages", start, last)
+    unchanged = not_modified(request, etag, settings.pdf_cache_max_age)
+    if unchanged:
+        return unchanged
+    
+    try:
+        data = await get_pdf_page_service().page_slice(file_path, start, last)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    headers = cache_headers(etag, settings.pdf_cache_max_age)
+    headers["Content-Disposition"] = f'inline; filename="{doc_id}-pages-{start}-{last}.pdf"'
+    return Response(content=data, media_type="application/pdf", headers=headers)
+
+
+@router.get("/documents/{doc_id}/pages/{page}/thumbnail", tags=["Documents"], response_class=FileResponse)
+async def get_page_thumbnail(
+    doc_id: str,
+    page: int,
+    request: Request,
+    width: int = Query(settings.thumbnail_width, ge=64, le=800, description="Image width in pixels")
+):
+    """Low-resolution PNG of a page, rendered once per file and cached on disk"""
+    file_path = _document_pdf_path(doc_id)
+    service = get_pdf_page_service()
+    if not service.thumbnails_available():
+        raise HTTPException(status_code=501, detail="Thumbnails are not available (pypdfium2 not installed)")
+    
+    etag = make_etag(file_version(file_path), "thumbnail", page, width)
+    unchanged = not_modified(request, etag, settings.pdf_cache_max_age)
+    if unchanged:
+        return unchanged
+    
+    try:
+        path = await service.thumbnail(file_path, page, width)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return FileResponse(path, media_type="image/png", headers=cache_headers(etag, settings.pdf_cache_max_age))
+
+
+def _document_pdf_path(doc_id: str) -> str:
+    """Path of a document's PDF, or a 404"""
+    doc = get_document_store().get(doc_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    file_path = doc.get("file_path")
+    if not file_path or not file_path.lower().endswith(".pdf") or not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="PDF not available for this document")
+    return file_path
 
 
 @router.get("/documents/{doc_id}/timeline", tags=["Documents"])
 async def get_document_timeline(
     doc_id: str,
+    request: Request,
+    response: Response,
     language: Language = Language.ENGLISH
 ):
     """Get the 'Simply Put' timeline for a document"""
@@ -101,28 +324,201 @@ async def get_document_timeline(
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Check if timeline is already cached
-    if doc.get("timeline"):
-        timeline = doc["timeline"]
-    else:
-        # Generate timeline
-        rag = get_rag_engine()
-        full_text = doc.get("full_text", "")
-        
-        if not full_text:
-            raise HTTPException(status_code=400, detail="Document text not available")
-        
-        timeline = await rag.generate_timeline(
-            document_text=full_text,
-            language=language.value
-        )
-        
-        # Cache the timeline
-        store.update(doc_id, {"timeline": timeline})
+    # Only stored timelines get an ETag, so a match means nothing to generate
+    unchanged = not_modified(request, _document_etag(doc, "timeline", language.value))
+    if unchanged:
+        return unchanged
+    
+    timeline = await _canonical_timeline(doc)
+    
+    if language == Language.ENGLISH:
+        response.headers.update(cache_headers(_document_etag(doc, "timeline", language.value)))
+        return timeline
+    
+    translated = await _translated_timeline(doc, timeline, language.value)
+    if translated is None:
+        return timeline
     
+    response.headers.update(cache_headers(_document_etag(doc, "timeline", language.value)))
+    return translated
+
+
+@router.get("/documents/{doc_id}/bundle", response_model=DocumentBundle, tags=["Documents"])
+async def get_document_bundle(
+    doc_id: str,
+    request: Request,
+    response: Response,
+    language: Language = Language.ENGLISH
+):
+    """
+    Everything the document viewer needs in one response
+    
+    Returns the document metadata (without full_text), the English
+    timeline and the display fields translated into `language`. Pieces
+    not stored yet - the timeline, the translated fields, the translated
+    timeline - are computed concurrently and stored for the next request.
+    """
+    store = get_document_store()
+    doc = store.get(doc_id)
+    
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    # Only complete bundles get an ETag, so a match means nothing to compute
+    unchanged = not_modified(request, _document_etag(doc, "bundle", language.value))
+    if unchanged:
+        return unchanged
+    
+    async def timelines() -> Tuple[Optional[dict], Optional[dict]]:
+        try:
+            timeline = await _canonical_timeline(doc)
+        except HTTPException:
+            return None, None
+        except Exception as e:
+            print(f"Timeline generation failed: {e}")
+            return None, None
+        if language == Language.ENGLISH:
+            return timeline, None
+        return timeline, await _translated_timeline(doc, timeline, language.value)
+    
+    async def display_fields() -> Optional[dict]:
+        if language == Language.ENGLISH:
+            return None
+        return await _translated_fields(doc, language.value)
+    
+    (timeline, translated_timeline), translated = await asyncio.gather(timelines(), display_fields())
+    
+    translation = None
+    if translated or translated_timeline:
+        translation = dict(translated or {})
+        if translated_timeline:
+            translation["timeline"] = translated_timeline
+    
+    complete = timeline is not None and (
+        language == Language.ENGLISH or (translated is not None and translated_timeline is not None)
+    )
+    if complete:
+        response.headers.update(cache_headers(_document_etag(doc, "bundle", language.value)))
+    
+    return DocumentBundle(
+        document={key: value for key, value in doc.items() if key not in BUNDLE_EXCLUDED_FIELDS},
+        timeline=timeline,
+        language=language,
+        translation=translation
+    )
+
+
+async def _canonical_timeline(doc: dict) -> dict:
+    """The English timeline, generated by the LLM only once and stored"""
+    timeline = doc.get("timeline")
+    if timeline:
+        return timeline
+    
+    full_text = doc.get("full_text", "")
+    if not full_text:
+        raise HTTPException(status_code=400, detail="Document text not available")
+    
+    timeline = await get_rag_engine().generate_timeline(
+        document_text=full_text,
+        language=Language.ENGLISH.value
+    )
+    
+    # Cache the canonical timeline
+    get_document_store().update(doc["id"], {"timeline": timeline})
     return timeline
 
 
+async def _translated_timeline(doc: dict, timeline: dict, language: str) -> Optional[dict]:
+    """
+    Timeline in another language, or None if translation is unavailable
+    
+    Translations are cached per language code and derived from the English
+    canonical with a translation call, never another LLM call.
+    """
+    cached = (doc.get("translations") or {}).get(language, {}).get("timeline")
+    if cached:
+        return cached
+    
+    translator = get_translator_service()
+    if not translator.is_configured():
+        return None
+    
+    try:
+        translated = await translator.translate_timeline(timeline, language)
+    except Exception as e:
+        print(f"Timeline translation failed: {e}")
+        return None
+    
+    _store_translation(doc, language, {"timeline": translated})
+    return translated
+
+
+async def _translated_fields(doc: dict, language: str) -> Optional[dict]:
+    """Title, summary and key points in another language, or None if unavailable"""
+    stored = (doc.get("translations") or {}).get(language, {})
+    if all(field in stored for field in TRANSLATED_FIELDS):
+        return {field: stored[field] for field in TRANSLATED_FIELDS}
+    
+    translator = get_translator_service()
+    if not translator.is_configured():
+        return None
+    
+    fields = {
+        "title": doc.get("title") or "",
+        "summary": doc.get("summary") or "",
+        "key_points": doc.get("key_points") or [],
+    }
+    try:
+        translated = await translator.translate_document(fields, language)
+    except Exception as e:
+        print(f"Document translation failed: {e}")
+        return None
+    
+    _store_translation(doc, language, translated)
+    return translated
+
+
+def _store_translation(doc: dict, language: str, fields: dict):
+    """Merge translated fields into the document's stored translations"""
+    # Read the stored translations now, not before the translation call, so
+    # concurrent translations of one document merge instead of overwriting
+    translations = dict(doc.get("translations") or {})
+    translations[language] = {**translations.get(language, {}), **fields}
+    get_document_store().update(doc["id"], {"translations": translations})
+
+
+@router.get("/documents/{doc_id}/tables", response_model=DocumentTablesResponse, tags=["Documents"])
+async def get_document_tables(
+    doc_id: str,
+    page: Optional[int] = Query(None, ge=1, description="Only tables on this page")
+):
+    """Get the tables extracted from a document"""
+    if not get_document_store().get(doc_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return DocumentTablesResponse(
+        document_id=doc_id,
+        tables=get_table_index().get_tables(doc_id, page=page)
+    )
+
+
+@router.get("/documents/{doc_id}/tables/search", response_model=TableSearchResponse, tags=["Documents"])
+async def search_document_tables(
+    doc_id: str,
+    q: str = Query(..., min_length=2, max_length=500),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Find table rows matching a question, e.g. 'rate for income above 12 lakh'"""
+    if not get_document_store().get(doc_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return TableSearchResponse(
+        document_id=doc_id,
+        query=q,
+        matches=get_table_index().search(doc_id, q, limit=limit)
+    )
+
+
 @router.post("/documents/{doc_id}/ask", response_model=AskResponse, tags=["Q&A"])
 async def ask_document(doc_id: str, request: AskRequest):
     """Ask a question about a specific document"""
@@ -145,6 +541,7 @@ async def ask_document(doc_id: str, request: AskRequest):
             page=c.get("page"),
             section=c.get("section"),
             text=c.get("text", ""),
+            pdf_url=c.get("pdf_url"),
             relevance_score=c.get("relevance_score", 0)
         )
         for c in result.get("citations", [])
@@ -158,106 +555,220 @@ async def ask_document(doc_id: str, request: AskRequest):
     )
 
 
-@router.post("/documents/upload", tags=["Documents"])
-async def upload_document(
-    file: UploadFile = File(...),
-    title: str = Form(...),
-    category: str = Form("report"),
-    source_ministry: Optional[str] = Form(None),
-    source_url: Optional[str] = Form(None)
-):
-    """
-    Upload and process a new document (PDF, DOC, DOCX)
-    
-    This endpoint:
-    1. Saves the file
-    2. Extracts text using Azure Document Intelligence
-    3. Chunks the document
-    4. Generates summary and key points
-    5. Indexes chunks in Azure AI Search
+@router.post("/documents/upload", status_code=202, tags=["Documents"], openapi_extra=UPLOAD_FORM_SCHEMA)
+async def upload_document(request: Request):
     """
-    # Security: File size limit (50MB)
-    MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+    Upload a new document (PDF, DOC, DOCX) for processing
     
-    # Check file size - read first to get actual size
-    contents = await file.read()
-    file_size = len(contents)
+    This endpoint saves the file and returns 202 with a job ID. A background
+    worker then:
+    1. Extracts text using Azure Document Intelligence
+    2. Generates summary and key points
+    3. Generates the 'Simply Put' timeline
+    4. Pre-translates display fields into all supported languages
+    5. Stores the document
     
-    if file_size > MAX_FILE_SIZE:
+    Poll /api/ingestion/jobs/{job_id} for progress. Files whose content is
+    already stored return the existing document immediately.
+    """
+    # Reject obviously oversized requests before touching the body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE + UPLOAD_FORM_OVERHEAD:
         raise HTTPException(status_code=413, detail="File too large. Maximum size is 50MB")
     
-    if file_size == 0:
-        raise HTTPException(status_code=400, detail="Empty file")
+    # Stream the upload to disk, enforcing the size limit as bytes arrive
+    fields, filename, temp_path, file_size, content_hash = await _stream_upload(request, settings.documents_dir)
     
-    # Support PDF, DOC, and DOCX
-    allowed_extensions = ['.pdf', '.doc', '.docx']
-    file_ext = os.path.splitext(file.filename)[1].lower()
+    title = fields.get("title", "").strip()
+    category = fields.get("category") or "report"
+    source_ministry = fields.get("source_ministry") or None
+    source_url = fields.get("source_url") or None
     
-    if file_ext not in allowed_extensions:
-        raise HTTPException(status_code=400, detail="Supported formats: PDF, DOC, DOCX")
+    if not title or category not in [c.value for c in DocumentCategory]:
+        os.remove(temp_path)
+        if not title:
+            raise HTTPException(status_code=400, detail="Missing form field: title")
+        raise HTTPException(status_code=400, detail=f"Unknown category: {category}")
     
-    # Security: Sanitize filename to prevent path traversal
-    import re
-    safe_filename = re.sub(r'[^a-zA-Z0-9._-]', '_', file.filename)
-    if not safe_filename:
-        safe_filename = f"document_{hash(file.filename)}{file_ext}"
+    # Identical content was already ingested - reuse it instead of paying
+    # for extraction and summarization again
+    store = get_document_store()
+    existing = store.find_by_hash(content_hash)
+    if existing:
+        os.remove(temp_path)
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "document_id": existing["id"],
+                "title": existing["title"],
+                "page_count": existing.get("page_count"),
+                "summary": existing.get("summary", ""),
+                "duplicate": True
+            }
+        )
     
-    # Save file
-    os.makedirs(settings.documents_dir, exist_ok=True)
-    file_path = os.path.join(settings.documents_dir, safe_filename)
+    # The same content is already being processed - point at that job
+    queue = get_ingestion_queue()
+    pending = queue.find_pending_by_hash(content_hash)
+    if pending:
+        os.remove(temp_path)
+        return _job_accepted(pending)
     
-    with open(file_path, "wb") as buffer:
-        buffer.write(contents)
+    # Unique per content, so a same-named upload never replaces another document's file
+    file_path = os.path.join(settings.documents_dir, stored_filename(filename, content_hash))
+    os.replace(temp_path, file_path)
     
-    try:
-        # Extract text
-        doc_intel = get_document_intelligence()
-        extracted = await doc_intel.extract_from_file(file_path)
-        
-        full_text = extracted.get("text", "")
-        pages = extracted.get("pages", [])
-        page_count = extracted.get("page_count", 0)
-        
-        if not full_text:
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
-        
-        # Generate summary
-        try:
-            gemini = get_gemini_client()
-            summary = await gemini.generate_summary(full_text)
-            key_points = await gemini.extract_key_points(full_text)
-        except Exception as e:
-            print(f"Summary generation failed: {e}")
-            summary = full_text[:300] + "..."
-            key_points = []
-        
-        # Store document (no chunking/indexing needed - we use summaries directly)
-        store = get_document_store()
-        doc_id = store.create(
-            title=title,
-            category=DocumentCategory(category),
-            file_path=file_path,
-            source_url=source_url,
-            source_ministry=source_ministry,
-            summary=summary,
-            key_points=key_points,
-            full_text=full_text,
-            page_count=page_count
-        )
-        
-        return {
+    # Extraction, summarization and translation run in the background
+    job = queue.submit(
+        file_path=file_path,
+        title=title,
+        category=category,
+        source_url=source_url,
+        source_ministry=source_ministry,
+        content_hash=content_hash
+    )
+    
+    return _job_accepted(job)
+
+
+def _job_accepted(job: dict) -> JSONResponse:
+    """202 response pointing the client at the job status endpoint"""
+    return JSONResponse(
+        status_code=202,
+        content={
             "success": True,
-            "document_id": doc_id,
-            "title": title,
-            "page_count": page_count,
-            "summary": summary
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/api/ingestion/jobs/{job['id']}",
+            "title": job["title"],
+            "duplicate": False
         }
+    )
+
+
+@router.get("/ingestion/jobs/{job_id}", response_model=IngestionJobStatus, tags=["Documents"])
+async def get_ingestion_job(job_id: str):
+    """Get the stage, timings and result of a document ingestion job"""
+    job = get_ingestion_queue().get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return IngestionJobStatus(stages=STAGES, **job)
+
+
+async def _stream_upload(request: Request, directory: str) -> Tuple[Dict[str, str], str, str, int, str]:
+    """
+    Stream a multipart upload from the request body into a temporary file
+    
+    The body is parsed as it arrives instead of through request.form(),
+    which would spool the whole file before the handler runs. The file part
+    is hashed chunk by chunk and the upload is aborted as soon as it passes
+    MAX_UPLOAD_SIZE, including chunked requests without a Content-Length.
+    The temporary file lives in the destination directory so the caller can
+    rename it into place atomically.
+    
+    Returns:
+        (form fields, uploaded filename, temporary file path, size in bytes, sha256 hex digest)
+    
+    Raises:
+        HTTPException: 413 once the file passes MAX_UPLOAD_SIZE, 400 for a
+            malformed form or a missing, empty or unsupported file
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.upload")
+    
+    fields: Dict[str, bytearray] = {}
+    part = {}  # Name, filename and raw headers of the part being parsed
+    header = [b"", b""]
+    filename = None
+    form_size = 0
+    file_size = 0
+    sha256 = hashlib.sha256()
+    to_write: List[bytes] = []
+    
+    def on_part_begin():
+        part.clear()
+        part["headers"] = {}
+    
+    def on_header_field(data: bytes, start: int, end: int):
+        header[0] += data[start:end]
+    
+    def on_header_value(data: bytes, start: int, end: int):
+        header[1] += data[start:end]
+    
+    def on_header_end():
+        part["headers"][header[0].lower()] = header[1]
+        header[0] = header[1] = b""
+    
+    def on_headers_finished():
+        nonlocal filename
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" not in options:
+            fields[part["name"]] = bytearray()
+            return
         
-    except Exception as e:
-        # Clean up on failure
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        raise HTTPException(status_code=500, detail=str(e))
+        if filename is not None or part["name"] != "file":
+            raise HTTPException(status_code=400, detail="Upload exactly one file, in the 'file' field")
+        filename = options[b"filename"].decode("utf-8", "replace")
+        if os.path.splitext(filename)[1].lower() not in ALLOWED_UPLOAD_EXTENSIONS:
+            raise HTTPException(status_code=400, detail="Supported formats: PDF, DOC, DOCX")
+        part["file"] = True
+    
+    def on_part_data(data: bytes, start: int, end: int):
+        nonlocal file_size, form_size
+        chunk = data[start:end]
+        if part.get("file"):
+            file_size += len(chunk)
+            if file_size > MAX_UPLOAD_SIZE:
+                raise HTTPException(status_code=413, detail="File too large. Maximum size is 50MB")
+            sha256.update(chunk)
+            to_write.append(chunk)
+        else:
+            form_size += len(chunk)
+            if form_size > UPLOAD_FORM_OVERHEAD:
+                raise HTTPException(status_code=413, detail="Form fields too large")
+            fields[part["name"]] += chunk
+    
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+    
+    try:
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                # Callbacks can't await, so file data is written between chunks
+                for data in to_write:
+                    await buffer.write(data)
+                to_write.clear()
+            parser.finalize()
+        
+        if filename is None:
+            raise HTTPException(status_code=400, detail="Missing form field: file")
+        if file_size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except FormParserError:
+        os.remove(temp_path)
+        raise HTTPException(status_code=400, detail="Malformed multipart upload")
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    decoded = {name: value.decode("utf-8", "replace") for name, value in fields.items()}
+    return decoded, filename, temp_path, file_size, sha256.hexdigest()
 
 
 @router.delete("/documents/{doc_id}", tags=["Documents"])
@@ -272,6 +783,7 @@ async def delete_document(doc_id: str):
     # Delete file
     file_path = doc.get("file_path")
     if file_path and os.path.exists(file_path):
+        get_pdf_page_service().delete(file_path)
         os.remove(file_path)
     
     # Delete from store
@@ -309,6 +821,7 @@ async def fact_check(request: FactCheckRequest):
             page=e.get("page"),
             section=e.get("section"),
             quote=e.get("quote", ""),
+            pdf_url=e.get("pdf_url"),
             supports_claim=e.get("supports_claim", False)
         )
         for e in result.get("evidence", [])
@@ -336,7 +849,25 @@ async def fact_check_url(request: URLFactCheckRequest):
     4. Returns verdict with evidence and links to relevant official docs
     
     If content is NOT government-related, returns a message explaining this.
+    
+    Responses are cached per (canonical URL, language, context), so repeat
+    pastes of a viral link skip both the fetch and the LLM.
     """
+    key = (
+        canonicalize_url(request.url),
+        request.language.value,
+        (request.additional_context or "").strip()
+    )
+    response, _ = await get_url_response_cache().get_or_create(
+        key,
+        lambda: _fact_check_url(request),
+        ttl=lambda result: result[1]
+    )
+    return response.model_copy(update={"url": request.url})
+
+
+async def _fact_check_url(request: URLFactCheckRequest) -> Tuple[URLFactCheckResponse, float]:
+    """Run a URL fact-check; returns (response, seconds to cache it - 0 for transient failures)"""
     extractor = get_url_extractor()
     checker = get_fact_checker()
     
@@ -344,7 +875,7 @@ async def fact_check_url(request: URLFactCheckRequest):
     extracted = await extractor.extract_from_url(request.url)
     
     if not extracted.get("success"):
-        return URLFactCheckResponse(
+        response = URLFactCheckResponse(
             url=request.url,
             source_type=extracted.get("source_type", "unknown"),
             is_govt_related=False,
@@ -355,10 +886,11 @@ async def fact_check_url(request: URLFactCheckRequest):
             message=f"Could not extract content from this URL. Error: {extracted.get('error', 'Unknown error')}",
             relevant_documents=[]
         )
+        return response, url_cache_ttl(False, extracted.get("permanent_failure", False))
     
     # Check if government-related
     if not extracted.get("is_govt_related"):
-        return URLFactCheckResponse(
+        response = URLFactCheckResponse(
             url=request.url,
             source_type=extracted.get("source_type", "unknown"),
             is_govt_related=False,
@@ -369,6 +901,7 @@ async def fact_check_url(request: URLFactCheckRequest):
             message="This content does not appear to be related to Indian government policies, bills, or official matters. Our fact-checker only verifies claims about government-related information. Please share content that mentions government policies, bills, schemes, or official decisions.",
             relevant_documents=[]
         )
+        return response, url_cache_ttl(True)
     
     # Extract claims from the content
     content = f"{extracted.get('title', '')} {extracted.get('content', '')}"
@@ -396,6 +929,7 @@ async def fact_check_url(request: URLFactCheckRequest):
                 page=e.get("page"),
                 section=e.get("section"),
                 quote=e.get("quote", ""),
+                pdf_url=e.get("pdf_url"),
                 supports_claim=e.get("supports_claim", False)
             )
             for e in result.get("evidence", [])
@@ -425,7 +959,10 @@ async def fact_check_url(request: URLFactCheckRequest):
     else:
         message = f"⚠️ We could not find official documents to verify the claims in this {extracted.get('source_type', 'content')}. This doesn't mean it's false - we may not have the relevant documents indexed."
     
-    return URLFactCheckResponse(
+    # LLM errors come back as zero-confidence results - transient, so not cached
+    complete = all(fr.confidence > 0 for fr in fact_results)
+    
+    response = URLFactCheckResponse(
         url=request.url,
         source_type=extracted.get("source_type", "unknown"),
         is_govt_related=True,
@@ -436,6 +973,7 @@ async def fact_check_url(request: URLFactCheckRequest):
         message=message,
         relevant_documents=relevant_docs
     )
+    return response, url_cache_ttl(complete)
 
 
 # ============== Translation ==============
@@ -465,6 +1003,33 @@ async def translate_text(request: TranslateRequest):
     )
 
 
+@router.post("/translate/batch", response_model=TranslateBatchResponse, tags=["Translation"])
+async def translate_texts(request: TranslateBatchRequest):
+    """Translate a list of texts to the target language in one round trip"""
+    translator = get_translator_service()
+    
+    if not translator.is_configured():
+        raise HTTPException(
+            status_code=503,
+            detail="Translation service not configured"
+        )
+    
+    try:
+        translated = await translator.translate_batch(
+            texts=request.texts,
+            target_language=request.target_language.value,
+            source_language=request.source_language.value
+        )
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Translation failed: {e}")
+    
+    return TranslateBatchResponse(
+        translations=translated,
+        source_language=request.source_language,
+        target_language=request.target_language
+    )
+
+
 @router.get("/languages", tags=["Translation"])
 async def get_supported_languages():
     """Get list of supported languages"""
@@ -492,6 +1057,7 @@ async def ask_general(request: AskRequest):
             page=c.get("page"),
             section=c.get("section"),
             text=c.get("text", ""),
+            pdf_url=c.get("pdf_url"),
             relevance_score=c.get("relevance_score", 0)
         )
         for c in result.get("citations", [])
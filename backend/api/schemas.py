@@ -2,8 +2,8 @@
 Pydantic schemas for API request/response models
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -87,6 +87,7 @@ class DocumentDetail(DocumentBase):
     summary: str
     key_points: List[str]
     timeline: Optional[DocumentTimeline] = None
+    translations: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Pre-translated display fields keyed by language code")
     full_text: Optional[str] = None
     page_count: Optional[int] = None
     pdf_url: Optional[str] = None
@@ -102,6 +103,71 @@ class DocumentListResponse(BaseModel):
     page_size: int
 
 
+class IngestionJobStatus(BaseModel):
+    """Progress of a background document ingestion job"""
+    id: str
+    status: str  # queued, running, completed, failed
+    stage: Optional[str] = None  # Current stage, or "done"
+    stages: List[str]  # All stages in execution order
+    timings: Dict[str, float] = {}  # Seconds spent in each finished stage
+    title: str
+    document_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class DocumentBundle(BaseModel):
+    """Everything the document viewer needs, in one response"""
+    document: Dict[str, Any] = Field(..., description="Document metadata without full_text")
+    timeline: Optional[Dict[str, Any]] = None
+    language: Language
+    translation: Optional[Dict[str, Any]] = Field(None, description="Title, summary, key points and timeline in `language`")
+
+
+class DocumentText(BaseModel):
+    """A window of a document's full text"""
+    document_id: str
+    text: str
+    char_start: int
+    char_end: int
+    total_chars: int
+    first_page: Optional[int] = None
+    last_page: Optional[int] = None
+    next_offset: Optional[int] = Field(None, description="Offset for the next window of the same range, if truncated")
+
+
+class DocumentTable(BaseModel):
+    """A table extracted from a document"""
+    table_id: int
+    page_num: Optional[int] = None
+    header: List[str]
+    rows: List[List[str]]
+
+
+class DocumentTablesResponse(BaseModel):
+    """All indexed tables of a document"""
+    document_id: str
+    tables: List[DocumentTable]
+
+
+class TableRowMatch(BaseModel):
+    """A table row matching a search query"""
+    table_id: int
+    page_num: Optional[int] = None
+    row_index: int
+    header: List[str]
+    row: List[str]
+    score: float
+
+
+class TableSearchResponse(BaseModel):
+    """Table rows matching a query, best first"""
+    document_id: str
+    query: str
+    matches: List[TableRowMatch]
+
+
 # ============== Q&A Schemas ==============
 
 class AskRequest(BaseModel):
@@ -115,6 +181,7 @@ class SourceCitation(BaseModel):
     page: Optional[int] = None
     section: Optional[str] = None
     text: str
+    pdf_url: Optional[str] = None  # Opens the PDF at the cited page
     relevance_score: float = Field(..., ge=0, le=1)
 
 
@@ -141,6 +208,7 @@ class Evidence(BaseModel):
     page: Optional[int] = None
     section: Optional[str] = None
     quote: str
+    pdf_url: Optional[str] = None  # Opens the PDF at the quoted page
     supports_claim: bool
 
 
@@ -191,6 +259,32 @@ class TranslateResponse(BaseModel):
     target_language: Language
 
 
+# One batch request fits in one Azure Translator call
+MAX_TRANSLATE_BATCH_TEXTS = 100
+MAX_TRANSLATE_BATCH_CHARS = 50000
+
+
+class TranslateBatchRequest(BaseModel):
+    """Request to translate several texts in one call"""
+    texts: List[Annotated[str, Field(max_length=5000)]] = Field(..., min_length=1, max_length=MAX_TRANSLATE_BATCH_TEXTS)
+    target_language: Language
+    source_language: Language = Language.ENGLISH
+    
+    @model_validator(mode="after")
+    def check_total_length(self) -> "TranslateBatchRequest":
+        total = sum(len(text) for text in self.texts)
+        if total > MAX_TRANSLATE_BATCH_CHARS:
+            raise ValueError(f"texts total {total} characters, more than {MAX_TRANSLATE_BATCH_CHARS}")
+        return self
+
+
+class TranslateBatchResponse(BaseModel):
+    """Batch translation response, in the same order as the request"""
+    translations: List[str]
+    source_language: Language
+    target_language: Language
+
+
 # ============== Health & Status ==============
 
 class HealthStatus(BaseModel):
@@ -198,6 +292,7 @@ class HealthStatus(BaseModel):
     status: str = "healthy"
     version: str = "1.0.0"
     services: Dict[str, bool]
+    llm: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None  # LLM router stats per provider and method
 
 
 class ErrorResponse(BaseModel):
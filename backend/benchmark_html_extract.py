@@ -0,0 +1,95 @@
+"""
+HTML Extraction Benchmark for Niti Satya AI
+Compares the original regex tag-stripping with the incremental ArticleParser
+on saved pages (default: tests/fixtures/pages) for speed and output size
+
+Usage:
+    python benchmark_html_extract.py [directory] [--repeat 20]
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from services.html_extractor import ArticleParser, PlainTextParser
+
+PAGES_DIR = Path(__file__).parent / "tests" / "fixtures" / "pages"
+
+# Bytes per chunk fed to the parser, like a streamed response
+CHUNK_SIZE = 16 * 1024
+
+# Boilerplate that should not reach claim extraction
+JUNK_MARKERS = ["Advertisement", "All rights reserved", "Subscribe", "Related", "Share", "Report", "Sitemap", "Visitor counter"]
+
+
+def extract_regex(html: str) -> dict:
+    """The original extractor: strip scripts, styles and tags from the whole page"""
+    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
+    desc_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
+    content = re.sub(r'<script[^>]*>.*?(?:</script>|$)', '', html, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<style[^>]*>.*?(?:</style>|$)', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<[^>]+>', ' ', content)
+    content = re.sub(r'\s+', ' ', content).strip()
+    return {
+        "title": title_match.group(1).strip() if title_match else "",
+        "description": desc_match.group(1) if desc_match else "",
+        "content": content,
+    }
+
+
+def extract_parser(page: str, plain_text: bool) -> dict:
+    parser = PlainTextParser() if plain_text else ArticleParser()
+    for start in range(0, len(page), CHUNK_SIZE):
+        parser.feed(page[start:start + CHUNK_SIZE])
+    return parser.result()
+
+
+def timed(function, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def junk(result: dict) -> int:
+    return sum(marker in result["content"] for marker in JUNK_MARKERS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML main-content extraction")
+    parser.add_argument("directory", nargs="?", default=str(PAGES_DIR))
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page")
+    args = parser.parse_args()
+    
+    files = sorted(path for path in Path(args.directory).iterdir() if path.suffix in (".html", ".htm", ".txt"))
+    
+    print("=" * 86)
+    print(f"{'Page':<22} {'KB':>6} {'Regex':>9} {'Parser':>9} {'Regex out':>10} {'Parser out':>11} {'Junk':>9}")
+    print("=" * 86)
+    
+    regex_total = parser_total = 0.0
+    for path in files:
+        page = path.read_text(encoding="utf-8")
+        plain_text = path.suffix == ".txt"
+        
+        regex_result = extract_regex(page)
+        parser_result = extract_parser(page, plain_text)
+        regex_time = timed(lambda: extract_regex(page), args.repeat)
+        parser_time = timed(lambda: extract_parser(page, plain_text), args.repeat)
+        regex_total += regex_time
+        parser_total += parser_time
+        
+        print(f"{path.name[:22]:<22} {len(page.encode()) / 1024:>6.0f} {regex_time * 1000:>7.2f}ms {parser_time * 1000:>7.2f}ms "
+              f"{len(regex_result['content']):>10} {len(parser_result['content']):>11} "
+              f"{junk(regex_result):>4} → {junk(parser_result):<2}")
+    
+    print("=" * 86)
+    if regex_total:
+        print(f"{'Total':<29} {regex_total * 1000:>7.2f}ms {parser_total * 1000:>7.2f}ms "
+              f"({parser_total / regex_total:.1f}x the regex time)")
+    print("Junk: boilerplate markers (ads, share/subscribe, footer) left in the output")
+
+
+if __name__ == "__main__":
+    main()
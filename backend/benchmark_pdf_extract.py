@@ -0,0 +1,76 @@
+"""
+PDF Extraction Benchmark for Niti Satya AI
+Compares serial PyPDF2 extraction with the parallel page-range fallback
+on the PDFs in data/govt-portal
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from PyPDF2 import PdfReader
+
+from services.azure_doc_intel import AzureDocumentIntelligence
+
+PDF_DIR = Path(__file__).parent / "data" / "govt-portal"
+
+
+def extract_serial(file_path: str) -> str:
+    """The original fallback: one page at a time, string concatenation"""
+    reader = PdfReader(file_path)
+    full_text = ""
+    for page in reader.pages:
+        full_text += (page.extract_text() or "") + "\n\n"
+    return full_text.strip()
+
+
+async def main():
+    pdf_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else PDF_DIR
+    files = sorted(pdf_dir.glob("*.pdf"))
+    
+    extractor = AzureDocumentIntelligence()
+    extractor.client = None  # Always benchmark the fallback path
+    
+    print("=" * 78)
+    print(f"{'File':<44} {'Pages':>6} {'Serial':>9} {'Parallel':>9} {'Speedup':>7}")
+    print("=" * 78)
+    
+    serial_total = 0.0
+    parallel_total = 0.0
+    page_total = 0
+    
+    for path in files:
+        try:
+            started = time.perf_counter()
+            serial_text = extract_serial(str(path))
+            serial_time = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            result = await extractor._fallback_extract(str(path))
+            parallel_time = time.perf_counter() - started
+        except Exception as e:
+            print(f"{path.name[:44]:<44} ❌ {e}")
+            continue
+        
+        if result["text"] != serial_text:
+            print(f"⚠️ Output differs for {path.name}")
+        
+        serial_total += serial_time
+        parallel_total += parallel_time
+        page_total += result["page_count"]
+        print(f"{path.name[:44]:<44} {result['page_count']:>6} {serial_time:>8.2f}s {parallel_time:>8.2f}s "
+              f"{serial_time / parallel_time:>6.1f}x")
+    
+    await extractor.close()
+    
+    print("=" * 78)
+    if parallel_total:
+        print(f"{'Total':<44} {page_total:>6} {serial_total:>8.2f}s {parallel_total:>8.2f}s "
+              f"{serial_total / parallel_total:>6.1f}x")
+        print(f"Throughput: {page_total / serial_total:.1f} pages/s serial, "
+              f"{page_total / parallel_total:.1f} pages/s parallel")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     # Azure Document Intelligence
     azure_doc_intel_endpoint: str = Field(default="", env="AZURE_DOC_INTEL_ENDPOINT")
     azure_doc_intel_key: str = Field(default="", env="AZURE_DOC_INTEL_KEY")
+    # Split PDFs longer than this many pages into concurrently analyzed slices (0 = off)
+    azure_doc_intel_split_pages: int = Field(default=100, env="AZURE_DOC_INTEL_SPLIT_PAGES")
+    azure_doc_intel_concurrency: int = Field(default=4, env="AZURE_DOC_INTEL_CONCURRENCY")
     
     # Azure Translator
     azure_translator_key: str = Field(default="", env="AZURE_TRANSLATOR_KEY")
@@ -40,6 +43,70 @@ class Settings(BaseSettings):
     # Data paths
     documents_dir: str = Field(default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "documents"))
     
+    # Worker processes for the PyPDF2 fallback extractor
+    pdf_extract_workers: int = Field(default=os.cpu_count() or 2, env="PDF_EXTRACT_WORKERS")
+    
+    # Cached extraction results, keyed by file hash and extractor model
+    extraction_cache_dir: str = Field(default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "extractions"), env="EXTRACTION_CACHE_DIR")
+    
+    # Per-document table indexes built from Document Intelligence tables
+    tables_dir: str = Field(default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tables"), env="TABLES_DIR")
+    
+    # Rendered PDF page thumbnails (needs pypdfium2), keyed by file version
+    thumbnails_dir: str = Field(default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "thumbnails"), env="THUMBNAILS_DIR")
+    thumbnail_width: int = Field(default=240, env="THUMBNAIL_WIDTH")
+    
+    # Cache-Control max-age for PDFs, page slices and thumbnails (revalidated by ETag after)
+    pdf_cache_max_age: int = Field(default=7 * 24 * 3600, env="PDF_CACHE_MAX_AGE")
+    
+    # JSON keyword list or {keyword: weight} map for detecting government content in URLs
+    govt_keywords_file: Optional[str] = Field(default=None, env="GOVT_KEYWORDS_FILE")
+    
+    # Bytes of a page read when fact-checking a URL
+    url_fetch_max_bytes: int = Field(default=1024 * 1024, env="URL_FETCH_MAX_BYTES")
+    
+    # Shared HTTP client for URL fact-checks
+    url_max_connections: int = Field(default=100, env="URL_MAX_CONNECTIONS")
+    url_max_keepalive_connections: int = Field(default=20, env="URL_MAX_KEEPALIVE_CONNECTIONS")
+    url_max_per_host: int = Field(default=4, env="URL_MAX_PER_HOST")
+    # oEmbed endpoints serve every YouTube/X paste, so they get their own, higher cap
+    url_max_per_oembed_host: int = Field(default=32, env="URL_MAX_PER_OEMBED_HOST")
+    url_connect_timeout: float = Field(default=5.0, env="URL_CONNECT_TIMEOUT")
+    url_read_timeout: float = Field(default=15.0, env="URL_READ_TIMEOUT")
+    url_pool_timeout: float = Field(default=5.0, env="URL_POOL_TIMEOUT")
+    url_fetch_deadline: float = Field(default=20.0, env="URL_FETCH_DEADLINE")
+    url_http2: bool = Field(default=True, env="URL_HTTP2")  # Used when h2 is installed
+    
+    # URL fact-check caches (seconds); only permanent failures are cached, briefly
+    url_cache_ttl: float = Field(default=3600.0, env="URL_CACHE_TTL")
+    url_cache_negative_ttl: float = Field(default=60.0, env="URL_CACHE_NEGATIVE_TTL")
+    url_cache_max_entries: int = Field(default=5000, env="URL_CACHE_MAX_ENTRIES")
+    
+    # API response compression (bodies smaller than this are sent as-is)
+    compression_min_size: int = Field(default=1024, env="COMPRESSION_MIN_SIZE")
+    gzip_level: int = Field(default=6, env="GZIP_LEVEL")
+    brotli_quality: int = Field(default=5, env="BROTLI_QUALITY")  # Used when brotli is installed
+    
+    # Cache-Control for document GETs (browsers / shared caches); ETags make revalidation cheap
+    cache_max_age: int = Field(default=60, env="CACHE_MAX_AGE")
+    cdn_cache_max_age: int = Field(default=300, env="CDN_CACHE_MAX_AGE")
+    
+    # LLM routing across configured providers
+    llm_hedging: bool = Field(default=True, env="LLM_HEDGING")  # Race the next provider once the first passes its p95
+    llm_stats_window: int = Field(default=100, env="LLM_STATS_WINDOW")  # Recent calls per provider kept for p50/p95
+    llm_min_samples: int = Field(default=5, env="LLM_MIN_SAMPLES")
+    llm_max_error_rate: float = Field(default=0.5, env="LLM_MAX_ERROR_RATE")  # Above this a provider is ranked last
+    
+    # Background ingestion
+    ingestion_workers: int = Field(default=2, env="INGESTION_WORKERS")
+    ingestion_jobs_file: str = Field(default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ingestion_jobs.json"))
+    # Completed/failed jobs older than this are dropped from the jobs file on start
+    ingestion_job_retention_days: int = Field(default=7, env="INGESTION_JOB_RETENTION_DAYS")
+    
+    # Watch documents_dir and ingest new/changed files automatically
+    watch_documents: bool = Field(default=False, env="WATCH_DOCUMENTS")
+    watch_interval: float = Field(default=5.0, env="WATCH_INTERVAL")
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,16 +1,39 @@
 """
 Document Download Script for Niti Satya AI
 Downloads official government documents from verified sources
+
+Downloads run concurrently and stream to disk. Interrupted downloads resume
+from their .part file with a Range request, unchanged files are skipped with
+ETag / If-Modified-Since, and every file's sha256 is recorded in
+manifest.json next to the PDFs.
+
+Usage:
+    python download_documents.py [--concurrency 4] [--force]
 """
 
+import argparse
+import asyncio
+import json
 import os
-import requests
+from datetime import datetime
 from pathlib import Path
 
+import aiofiles
+import httpx
+
+from services.extraction_cache import hash_file
+
 # Create documents directory
 DOCS_DIR = Path(__file__).parent / "data" / "documents" / "pdfs"
 DOCS_DIR.mkdir(parents=True, exist_ok=True)
 
+MANIFEST_FILE = DOCS_DIR / "manifest.json"
+
+CHUNK_SIZE = 256 * 1024
+
+# Smaller responses are error pages, not documents
+MIN_DOCUMENT_SIZE = 1000
+
 # Official document sources
 DOCUMENTS = [
     {
@@ -37,58 +60,198 @@ DOCUMENTS = [
     }
 ]
 
-def download_document(doc):
+
+class Manifest:
+    """sha256, size and HTTP validators of every downloaded file"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.files = {}
+        if path.exists():
+            try:
+                self.files = json.loads(path.read_text(encoding="utf-8")).get("files", {})
+            except (json.JSONDecodeError, IOError):
+                self.files = {}
+    
+    def get(self, filename: str) -> dict:
+        return self.files.get(filename, {})
+    
+    def update(self, filename: str, **fields):
+        self.files[filename] = {**self.get(filename), **fields}
+        self.save()
+    
+    def save(self):
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"files": self.files}, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def validators(response: httpx.Response) -> dict:
+    return {
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+
+
+async def fetch(client: httpx.AsyncClient, doc: dict, url: str, manifest: Manifest, force: bool) -> str:
+    """
+    Download one source URL into place
+    
+    Returns "downloaded" or "unchanged"; raises on failure
+    """
+    filename = doc["filename"]
+    filepath = DOCS_DIR / filename
+    part_path = DOCS_DIR / f"{filename}.part"
+    entry = manifest.get(filename)
+    
+    headers = {}
+    if filepath.exists() and entry.get("url") == url and not force:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    # Resume a partial download if it came from the same URL and version
+    partial = entry.get("partial") or {}
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if offset and partial.get("url") == url and (partial.get("etag") or partial.get("last_modified")):
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+    else:
+        offset = 0
+    
+    async with client.stream("GET", url, headers=headers) as response:
+        if response.status_code == 304:
+            return "unchanged"
+        
+        if response.status_code == 416:
+            # Stale partial file - start over on the next attempt
+            part_path.unlink()
+            manifest.update(filename, partial=None)
+            raise ValueError("partial download no longer matches the source")
+        
+        if response.status_code == 206:
+            mode = "ab"
+            print(f"↪️  Resuming {filename} at {offset // 1024} KB")
+        elif response.status_code == 200:
+            mode, offset = "wb", 0
+            manifest.update(filename, partial={"url": url, **validators(response)})
+        else:
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code}", request=response.request, response=response
+            )
+        
+        async with aiofiles.open(part_path, mode) as f:
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                await f.write(chunk)
+        
+        final_validators = validators(response) if response.status_code == 200 else {
+            key: value for key, value in partial.items() if key != "url"
+        }
+    
+    size = part_path.stat().st_size
+    if size < MIN_DOCUMENT_SIZE:
+        part_path.unlink()
+        raise ValueError(f"response too small ({size} bytes)")
+    
+    loop = asyncio.get_running_loop()
+    sha256 = await loop.run_in_executor(None, hash_file, str(part_path))
+    os.replace(part_path, filepath)
+    
+    manifest.update(
+        filename,
+        name=doc["name"],
+        url=url,
+        sha256=sha256,
+        size=size,
+        downloaded_at=datetime.utcnow().isoformat(),
+        partial=None,
+        **final_validators
+    )
+    return "downloaded"
+
+
+async def download_document(
+    client: httpx.AsyncClient,
+    doc: dict,
+    manifest: Manifest,
+    semaphore: asyncio.Semaphore,
+    force: bool = False
+) -> bool:
     """Try to download from multiple sources"""
-    filepath = DOCS_DIR / doc["filename"]
+    # Try the source that worked last time first, so its validators apply
+    last_url = manifest.get(doc["filename"]).get("url")
+    sources = sorted(doc["sources"], key=lambda url: url != last_url)
     
-    for url in doc["sources"]:
-        try:
-            print(f"⏳ Downloading {doc['name']} from {url[:50]}...")
-            response = requests.get(url, timeout=60, allow_redirects=True)
+    async with semaphore:
+        for url in sources:
+            try:
+                print(f"⏳ Downloading {doc['name']} from {url[:50]}...")
+                status = await fetch(client, doc, url, manifest, force)
+            except Exception as e:
+                print(f"❌ Failed from {url[:30]}...: {e}")
+                continue
             
-            if response.status_code == 200 and len(response.content) > 1000:
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-                print(f"✅ Downloaded: {doc['filename']} ({len(response.content) // 1024} KB)")
-                return True
-        except Exception as e:
-            print(f"❌ Failed from {url[:30]}...: {e}")
+            entry = manifest.get(doc["filename"])
+            if status == "unchanged":
+                print(f"⏭️  Unchanged: {doc['filename']}")
+            else:
+                print(f"✅ Downloaded: {doc['filename']} ({entry['size'] // 1024} KB, "
+                      f"sha256 {entry['sha256'][:12]})")
+            return True
     
     return False
 
-def main():
+
+async def main():
+    parser = argparse.ArgumentParser(description="Download official government documents")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent downloads")
+    parser.add_argument("--force", action="store_true", help="Re-download files even if unchanged")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Niti Satya AI - Document Downloader")
     print("=" * 60)
     print()
     
-    success_count = 0
-    for doc in DOCUMENTS:
-        if download_document(doc):
-            success_count += 1
-        print()
+    manifest = Manifest(MANIFEST_FILE)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    timeout = httpx.Timeout(60.0, connect=15.0)
+    
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        results = await asyncio.gather(*[
+            download_document(client, doc, manifest, semaphore, args.force)
+            for doc in DOCUMENTS
+        ])
+    
+    success_count = sum(results)
     
+    print()
     print("=" * 60)
     print(f"Downloaded {success_count}/{len(DOCUMENTS)} documents")
     print(f"Location: {DOCS_DIR}")
-    print()
-    print("MANUAL DOWNLOAD INSTRUCTIONS:")
-    print("If automatic download fails, please manually download:")
-    print()
-    print("1. Income Tax Bill 2025:")
-    print("   https://prsindia.org/billtrack/the-income-tax-bill-2025")
-    print("   → Click 'Bill Text' → Save as 'income-tax-bill-2025.pdf'")
-    print()
-    print("2. Shiksha Adhishthan Bill 2025:")
-    print("   https://prsindia.org/billtrack/viksit-bharat-shiksha-adhishthan-bill-2025")
-    print("   → Click 'Bill Text' → Save as 'shiksha-bill-2025.pdf'")
-    print()
-    print("3. Securities Markets Code 2025:")
-    print("   https://prsindia.org/billtrack/securities-markets-code-2025")
-    print("   → Click 'Bill Text' → Save as 'securities-code-2025.pdf'")
-    print()
-    print(f"Save all files to: {DOCS_DIR}")
+    print(f"Manifest: {MANIFEST_FILE}")
+    
+    if success_count < len(DOCUMENTS):
+        print()
+        print("MANUAL DOWNLOAD INSTRUCTIONS:")
+        print("If automatic download fails, please manually download:")
+        print()
+        print("1. Income Tax Bill 2025:")
+        print("   https://prsindia.org/billtrack/the-income-tax-bill-2025")
+        print("   → Click 'Bill Text' → Save as 'income-tax-bill-2025.pdf'")
+        print()
+        print("2. Shiksha Adhishthan Bill 2025:")
+        print("   https://prsindia.org/billtrack/viksit-bharat-shiksha-adhishthan-bill-2025")
+        print("   → Click 'Bill Text' → Save as 'shiksha-bill-2025.pdf'")
+        print()
+        print("3. Securities Markets Code 2025:")
+        print("   https://prsindia.org/billtrack/securities-markets-code-2025")
+        print("   → Click 'Bill Text' → Save as 'securities-code-2025.pdf'")
+        print()
+        print(f"Save all files to: {DOCS_DIR}")
     print("=" * 60)
 
+
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
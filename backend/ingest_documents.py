@@ -0,0 +1,201 @@
+"""
+Bulk Document Ingestion for Niti Satya AI
+Ingests every document in a directory (default: data/govt-portal) with
+resumable checkpoints
+
+Usage:
+    python ingest_documents.py [directory] [--extract-concurrency 4] [--llm-concurrency 2] [--translate-concurrency 2]
+
+Stop the API server first - both write data/documents/metadata.json.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from config import settings
+from services.azure_doc_intel import get_document_intelligence
+from services.document_store import get_document_store
+from services.extraction_cache import hash_file
+from services.ingestion import (
+    IngestionPipeline, ALLOWED_EXTENSIONS, guess_category, safe_filename, stored_filename, title_from_filename
+)
+
+DEFAULT_DIR = Path(__file__).parent / "data" / "govt-portal"
+DEFAULT_CHECKPOINT = Path(__file__).parent / "data" / "ingest_checkpoint.json"
+
+
+class Checkpoint:
+    """Per-file progress, saved after every file so a crash resumes where it stopped"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.files = {}
+        if path.exists():
+            try:
+                self.files = json.loads(path.read_text(encoding="utf-8")).get("files", {})
+            except (json.JSONDecodeError, IOError):
+                self.files = {}
+    
+    def is_done(self, file_path: str, content_hash: str) -> bool:
+        entry = self.files.get(file_path)
+        return bool(entry) and entry["status"] == "done" and entry["hash"] == content_hash
+    
+    def record(self, file_path: str, **entry):
+        self.files[file_path] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"files": self.files}, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def document_path(path: Path, content_hash: str, args) -> str:
+    """Path the ingested document is served from (unique per content, like uploads)"""
+    if args.no_copy or path.resolve().parent == Path(settings.documents_dir).resolve():
+        return str(path)
+    return os.path.join(settings.documents_dir, stored_filename(path.name, content_hash))
+
+
+def stored_from_file(store, path: Path, content_hash: str, args) -> bool:
+    """
+    True if the store already has a document for this file's content at its
+    document path, or at the plain filename older copies were stored under.
+    Records seeded without a content hash get it backfilled, so later runs
+    (and uploads) dedupe against them by hash.
+    """
+    candidates = [document_path(path, content_hash, args)]
+    if candidates[0] != str(path):
+        candidates.append(os.path.join(settings.documents_dir, safe_filename(path.name)))
+    
+    for file_path in candidates:
+        docs = store.find_by_file_path(file_path)
+        if not docs:
+            continue
+        if file_path != str(path) and hash_file(file_path) != content_hash:
+            continue  # Same name, different content
+        
+        for doc in docs:
+            if not doc.get("content_hash"):
+                store.update(doc["id"], {"content_hash": content_hash})
+        return True
+    return False
+
+
+async def ingest_file(
+    path: Path,
+    content_hash: str,
+    pipeline: IngestionPipeline,
+    checkpoint: Checkpoint,
+    args,
+    stats: dict
+):
+    loop = asyncio.get_running_loop()
+    key = str(path.resolve())
+    
+    # Serve the file from the documents directory like an upload
+    file_path = document_path(path, content_hash, args)
+    if file_path != str(path):
+        await loop.run_in_executor(None, shutil.copy2, str(path), file_path)
+    
+    started = time.perf_counter()
+    try:
+        result = await pipeline.run(
+            file_path=file_path,
+            title=title_from_filename(path.name),
+            category=args.category or guess_category(path.name),
+            content_hash=content_hash
+        )
+    except Exception as e:
+        if file_path != str(path) and os.path.exists(file_path):
+            os.remove(file_path)
+        stats["failed"] += 1
+        checkpoint.record(key, hash=content_hash, status="failed", error=str(e))
+        print(f"❌ {path.name}: {e}")
+        return
+    
+    stats["ingested"] += 1
+    stats["pages"] += result["page_count"] or 0
+    checkpoint.record(key, hash=content_hash, status="done", document_id=result["document_id"])
+    print(f"✅ {path.name} → {result['document_id']} "
+          f"({result['page_count']} pages, {time.perf_counter() - started:.1f}s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest government documents")
+    parser.add_argument("directory", nargs="?", default=str(DEFAULT_DIR))
+    parser.add_argument("--category", help="Category for every file (default: guessed from filename)")
+    parser.add_argument("--extract-concurrency", type=int, default=4, help="Concurrent extractions")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="Concurrent LLM calls")
+    parser.add_argument("--translate-concurrency", type=int, default=2, help="Documents pre-translated at once")
+    parser.add_argument("--checkpoint", default=str(DEFAULT_CHECKPOINT), help="Checkpoint file")
+    parser.add_argument("--no-copy", action="store_true", help="Don't copy files into the documents directory")
+    args = parser.parse_args()
+    
+    files = sorted(
+        path for path in Path(args.directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in ALLOWED_EXTENSIONS
+    )
+    
+    print("=" * 60)
+    print("Niti Satya AI - Bulk Document Ingestion")
+    print("=" * 60)
+    print(f"Found {len(files)} documents in {args.directory}")
+    print()
+    
+    os.makedirs(settings.documents_dir, exist_ok=True)
+    pipeline = IngestionPipeline(
+        extract_limit=asyncio.Semaphore(args.extract_concurrency),
+        llm_limit=asyncio.Semaphore(args.llm_concurrency),
+        translate_limit=asyncio.Semaphore(args.translate_concurrency)
+    )
+    checkpoint = Checkpoint(Path(args.checkpoint))
+    stats = {"ingested": 0, "skipped": 0, "failed": 0, "pages": 0}
+    
+    started = time.perf_counter()
+    
+    # Hash everything first so identical files in the directory run only once
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(*[
+        loop.run_in_executor(None, hash_file, str(path)) for path in files
+    ])
+    
+    store = get_document_store()
+    pending = {}
+    for path, content_hash in zip(files, hashes):
+        if content_hash in pending:
+            stats["skipped"] += 1
+            print(f"⏭️  {path.name} (same content as {pending[content_hash].name})")
+        elif (
+            store.find_by_hash(content_hash)
+            or checkpoint.is_done(str(path.resolve()), content_hash)
+            or stored_from_file(store, path, content_hash, args)
+        ):
+            stats["skipped"] += 1
+            print(f"⏭️  {path.name} (already ingested)")
+        else:
+            pending[content_hash] = path
+    
+    await asyncio.gather(*[
+        ingest_file(path, content_hash, pipeline, checkpoint, args, stats)
+        for content_hash, path in pending.items()
+    ])
+    elapsed = time.perf_counter() - started
+    
+    await get_document_intelligence().close()
+    
+    print()
+    print("=" * 60)
+    print(f"Ingested {stats['ingested']}, skipped {stats['skipped']}, failed {stats['failed']} "
+          f"in {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {stats['pages'] / elapsed:.1f} pages/s, "
+              f"{stats['ingested'] / elapsed * 60:.1f} docs/min")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
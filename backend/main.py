@@ -4,13 +4,18 @@ FastAPI application entry point
 """
 
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
 
 from api.routes import router
+from api.responses import ORJSONResponse, CompressionMiddleware, CachedStaticFiles
 from config import settings
+from services.ingestion import get_ingestion_queue
+from services.azure_doc_intel import get_document_intelligence
+from services.document_watcher import get_document_watcher
+from services.url_extractor import get_url_extractor
 
 
 # Create FastAPI app
@@ -36,7 +41,10 @@ app = FastAPI(
     """,
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson for routes returning dicts; routes with a response_model keep
+    # FastAPI's pydantic serialization since this stays a default
+    default_response_class=Default(ORJSONResponse)
 )
 
 
@@ -63,15 +71,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for large JSON responses such as document detail
+app.add_middleware(CompressionMiddleware)
+
 
 # Include API routes
 app.include_router(router, prefix="/api")
 
 
-# Serve documents directory for PDF viewing
+# Serve documents directory for PDF viewing (byte ranges let viewers show page 1 early)
 documents_path = os.path.join(os.path.dirname(__file__), settings.documents_dir)
 os.makedirs(documents_path, exist_ok=True)
-app.mount("/documents", StaticFiles(directory=documents_path), name="documents")
+app.mount(
+    "/documents",
+    CachedStaticFiles(directory=documents_path, max_age=settings.pdf_cache_max_age),
+    name="documents"
+)
 
 
 # Root redirect to docs
@@ -106,6 +121,15 @@ async def startup():
         except Exception as e:
             print(f"⚠️ Search index creation failed: {e}")
     
+    # Start background ingestion workers (resumes unfinished jobs). With
+    # several server workers only the one holding the runner lock does this
+    runs_ingestion = await get_ingestion_queue().start()
+    
+    # Optionally pick up documents dropped into the documents directory
+    # (in the ingestion process only, so each file is queued once)
+    if settings.watch_documents and runs_ingestion:
+        await get_document_watcher().start()
+    
     print("\n✨ API ready at http://localhost:8000/docs")
 
 
@@ -113,6 +137,10 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     print("👋 Government Truth Portal API shutting down...")
+    await get_document_watcher().stop()
+    await get_ingestion_queue().stop()
+    await get_document_intelligence().close()
+    await get_url_extractor().aclose()
 
 
 if __name__ == "__main__":
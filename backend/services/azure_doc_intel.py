@@ -4,13 +4,28 @@ Extracts text and structure from PDF documents
 Microsoft Imagine Cup Service #1
 """
 
-from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import AnalyzeResult, AnalyzeDocumentRequest
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
+from azure.ai.documentintelligence.models import AnalyzeResult, AnalyzeDocumentRequest, StringIndexType
 from azure.core.credentials import AzureKeyCredential
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+import aiofiles
+import asyncio
+import io
 import os
 
 from config import settings
+from services.extraction_cache import get_extraction_cache, hash_file
+
+
+LAYOUT_MODEL_ID = "prebuilt-layout"
+FALLBACK_MODEL_ID = "pypdf2-fallback"
+
+# Bump when the extraction output shape changes to invalidate cached results
+EXTRACTOR_VERSION = 4
+
+# Separator between page texts in the full text
+PAGE_SEPARATOR = "\n\n"
 
 
 class AzureDocumentIntelligence:
@@ -20,6 +35,8 @@ class AzureDocumentIntelligence:
     """
     
     def __init__(self):
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        
         if not settings.azure_doc_intel_endpoint or not settings.azure_doc_intel_key:
             self.client = None
             print("⚠️ Azure Document Intelligence not configured - using fallback PDF parser")
@@ -30,10 +47,17 @@ class AzureDocumentIntelligence:
             credential=AzureKeyCredential(settings.azure_doc_intel_key)
         )
     
-    async def extract_from_file(self, file_path: str) -> Dict[str, Any]:
+    async def extract_from_file(self, file_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract text and structure from a PDF file
         
+        Results are cached on disk by (sha256, model_id), so extracting the
+        same bytes again - on any worker - skips the service entirely.
+        
+        Args:
+            file_path: Path to the document
+            content_hash: sha256 of the file, if the caller already has it
+        
         Returns:
             {
                 "text": "full document text",
@@ -42,11 +66,54 @@ class AzureDocumentIntelligence:
                 "metadata": {...}
             }
         """
-        if not self.client:
-            return await self._fallback_extract(file_path)
+        loop = asyncio.get_running_loop()
+        if not content_hash:
+            content_hash = await loop.run_in_executor(None, hash_file, file_path)
+        
+        cache = get_extraction_cache()
+        cache_key = f"{self.model_id}-v{EXTRACTOR_VERSION}"
         
-        with open(file_path, "rb") as f:
-            document_bytes = f.read()
+        cached = await cache.get(content_hash, cache_key)
+        if cached is not None:
+            return cached
+        
+        result = await self._extract_uncached(file_path)
+        if result["metadata"].get("model_id") == FALLBACK_MODEL_ID:
+            # A fallback after an Azure failure must not stand in for the layout result
+            cache_key = f"{FALLBACK_MODEL_ID}-v{EXTRACTOR_VERSION}"
+        await cache.put(content_hash, cache_key, result)
+        return result
+    
+    @property
+    def model_id(self) -> str:
+        """Model that produces this instance's extraction results"""
+        return LAYOUT_MODEL_ID if self.client else FALLBACK_MODEL_ID
+    
+    async def _extract_uncached(self, file_path: str) -> Dict[str, Any]:
+        """Extract a file with Azure, or the PyPDF2 fallback if Azure is unconfigured or fails"""
+        if self.client:
+            try:
+                return await self._analyze_file(file_path)
+            except Exception as e:
+                print(f"⚠️ Azure Document Intelligence failed, using fallback PDF parser: {e}")
+        return await self._fallback_extract(file_path)
+    
+    async def _analyze_file(self, file_path: str) -> Dict[str, Any]:
+        """Analyze a file with Azure, splitting large PDFs into page ranges"""
+        async with aiofiles.open(file_path, "rb") as f:
+            document_bytes = await f.read()
+        
+        split_pages = settings.azure_doc_intel_split_pages
+        if split_pages > 0 and file_path.lower().endswith(".pdf"):
+            loop = asyncio.get_running_loop()
+            try:
+                parts = await loop.run_in_executor(None, _split_pdf_bytes, document_bytes, split_pages)
+            except Exception as e:
+                print(f"⚠️ Could not split PDF, analyzing it whole: {e}")
+                parts = []
+            
+            if len(parts) > 1:
+                return await self._analyze_split(parts)
         
         return await self._analyze_document(document_bytes)
     
@@ -55,28 +122,90 @@ class AzureDocumentIntelligence:
         if not self.client:
             raise ValueError("Azure Document Intelligence not configured")
         
-        poller = self.client.begin_analyze_document(
-            "prebuilt-layout",
-            AnalyzeDocumentRequest(url_source=url)
+        poller = await self.client.begin_analyze_document(
+            LAYOUT_MODEL_ID,
+            AnalyzeDocumentRequest(url_source=url),
+            string_index_type=StringIndexType.UNICODE_CODE_POINT
         )
-        result: AnalyzeResult = poller.result()
+        result: AnalyzeResult = await poller.result()
         
         return self._process_result(result)
     
+    async def close(self):
+        """Close the Azure client and release worker processes"""
+        if self.client is not None:
+            await self.client.close()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
     async def _analyze_document(self, document_bytes: bytes) -> Dict[str, Any]:
         """Analyze document bytes using Azure"""
         try:
-            poller = self.client.begin_analyze_document(
-                "prebuilt-layout",
+            poller = await self.client.begin_analyze_document(
+                LAYOUT_MODEL_ID,
                 document_bytes,
-                content_type="application/pdf"
+                content_type="application/pdf",
+                # Span offsets are used as Python str indices; the default
+                # (grapheme clusters) drifts on Devanagari text
+                string_index_type=StringIndexType.UNICODE_CODE_POINT
             )
-            result: AnalyzeResult = poller.result()
+            result: AnalyzeResult = await poller.result()
             return self._process_result(result)
         except Exception as e:
             print(f"Azure Document Intelligence error: {e}")
             raise
     
+    async def _analyze_split(self, parts: List[Tuple[int, bytes]]) -> Dict[str, Any]:
+        """
+        Analyze page-range slices of a large PDF concurrently
+        
+        Args:
+            parts: [(first page number - 1, slice PDF bytes), ...] in page order
+        """
+        semaphore = asyncio.Semaphore(settings.azure_doc_intel_concurrency)
+        
+        async def analyze(part_bytes: bytes) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._analyze_document(part_bytes)
+        
+        results = await asyncio.gather(*[analyze(part_bytes) for _, part_bytes in parts])
+        return self._merge_results([
+            (page_offset, result) for (page_offset, _), result in zip(parts, results)
+        ])
+    
+    def _merge_results(self, parts: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Merge processed page-range results, shifting page numbers and char offsets into place"""
+        texts = []
+        pages = []
+        tables = []
+        paragraphs = []
+        char_offset = 0
+        
+        for page_offset, result in parts:
+            texts.append(result["text"])
+            
+            pages.extend(
+                _shift_chars(_shift_page(page, page_offset), char_offset)
+                for page in result["pages"]
+            )
+            char_offset += len(result["text"]) + len(PAGE_SEPARATOR)
+            
+            tables.extend(_shift_page(table, page_offset) for table in result["tables"])
+            paragraphs.extend(_shift_page(para, page_offset) for para in result["paragraphs"])
+        
+        return {
+            "text": PAGE_SEPARATOR.join(texts),
+            "pages": pages,
+            "tables": tables,
+            "paragraphs": paragraphs,
+            "page_count": len(pages),
+            "metadata": {
+                "model_id": parts[0][1]["metadata"].get("model_id") if parts else None,
+                "split_parts": len(parts),
+            }
+        }
+    
     def _process_result(self, result: AnalyzeResult) -> Dict[str, Any]:
         """Process Azure analysis result into structured output"""
         
@@ -91,11 +220,14 @@ class AzureDocumentIntelligence:
                 if page.lines:
                     page_text = "\n".join([line.content for line in page.lines])
                 
+                char_start, char_end = _span_range(page.spans)
                 pages.append({
                     "page_num": page.page_number,
                     "text": page_text,
                     "width": page.width,
                     "height": page.height,
+                    "char_start": char_start,
+                    "char_end": char_end,
                 })
         
         # Process tables
@@ -105,6 +237,7 @@ class AzureDocumentIntelligence:
                 table_data = {
                     "row_count": table.row_count,
                     "column_count": table.column_count,
+                    "page_num": _first_page(table),
                     "cells": []
                 }
                 if table.cells:
@@ -113,6 +246,7 @@ class AzureDocumentIntelligence:
                             "row": cell.row_index,
                             "column": cell.column_index,
                             "content": cell.content,
+                            "kind": cell.kind,
                         })
                 tables.append(table_data)
         
@@ -122,7 +256,8 @@ class AzureDocumentIntelligence:
             for para in result.paragraphs:
                 paragraphs.append({
                     "content": para.content,
-                    "role": para.role if hasattr(para, 'role') else None
+                    "role": para.role if hasattr(para, 'role') else None,
+                    "page_num": _first_page(para)
                 })
         
         return {
@@ -137,32 +272,142 @@ class AzureDocumentIntelligence:
         }
     
     async def _fallback_extract(self, file_path: str) -> Dict[str, Any]:
-        """Fallback PDF extraction using PyPDF2 when Azure is not configured"""
+        """
+        Fallback PDF extraction using PyPDF2 when Azure is not configured
+        
+        Large PDFs are split into page ranges that are extracted in parallel
+        worker processes, so neither the CPU work nor the event loop is
+        serialized on one core.
+        """
         try:
-            from PyPDF2 import PdfReader
+            loop = asyncio.get_running_loop()
+            page_total = await loop.run_in_executor(None, _count_pdf_pages, file_path)
             
-            reader = PdfReader(file_path)
-            full_text = ""
-            pages = []
+            if page_total <= FALLBACK_PAGES_PER_TASK:
+                # Not worth the process hop - extract in a thread
+                page_texts = await loop.run_in_executor(
+                    None, _extract_page_range, file_path, 0, page_total
+                )
+            else:
+                pool = self._get_process_pool()
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(pool, _extract_page_range, file_path, start, end)
+                    for start, end in _split_page_ranges(page_total, settings.pdf_extract_workers)
+                ])
+                page_texts = [text for texts in results for text in texts]
             
-            for page_num, page in enumerate(reader.pages, 1):
-                page_text = page.extract_text() or ""
-                full_text += page_text + "\n\n"
-                pages.append({
-                    "page_num": page_num,
-                    "text": page_text,
-                })
+            full_text, pages = _join_pages(page_texts)
             
             return {
-                "text": full_text.strip(),
+                "text": full_text,
                 "pages": pages,
                 "tables": [],
                 "paragraphs": [],
                 "page_count": len(pages),
-                "metadata": {"model_id": "pypdf2-fallback"}
+                "metadata": {"model_id": FALLBACK_MODEL_ID}
             }
         except Exception as e:
             raise ValueError(f"Could not extract PDF: {e}")
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Get or create the process pool for fallback extraction"""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=settings.pdf_extract_workers)
+        return self._process_pool
+
+
+def _first_page(element) -> Optional[int]:
+    """Page number of the first bounding region of a DI element"""
+    regions = getattr(element, "bounding_regions", None)
+    return regions[0].page_number if regions else None
+
+
+def _span_range(spans) -> Tuple[Optional[int], Optional[int]]:
+    """Character range [start, end) in result.content covered by DI spans"""
+    if not spans:
+        return None, None
+    return (
+        min(span.offset for span in spans),
+        max(span.offset + span.length for span in spans)
+    )
+
+
+def _shift_chars(page: Dict[str, Any], char_offset: int) -> Dict[str, Any]:
+    """Copy of a processed page with its char range shifted into the merged text"""
+    if page.get("char_start") is None or not char_offset:
+        return page
+    return {
+        **page,
+        "char_start": page["char_start"] + char_offset,
+        "char_end": page["char_end"] + char_offset,
+    }
+
+
+def _join_pages(page_texts: List[str]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Join page texts into full text, recording each page's char range"""
+    joined = PAGE_SEPARATOR.join(page_texts)
+    full_text = joined.strip()
+    lead = len(joined) - len(joined.lstrip())
+    
+    pages = []
+    position = 0
+    for page_num, page_text in enumerate(page_texts, 1):
+        start = max(0, min(position - lead, len(full_text)))
+        end = max(start, min(position + len(page_text) - lead, len(full_text)))
+        pages.append({"page_num": page_num, "text": page_text, "char_start": start, "char_end": end})
+        position += len(page_text) + len(PAGE_SEPARATOR)
+    return full_text, pages
+
+
+def _shift_page(item: Dict[str, Any], page_offset: int) -> Dict[str, Any]:
+    """Copy of a processed page/table/paragraph with its page number shifted"""
+    if item.get("page_num") is None:
+        return item
+    return {**item, "page_num": item["page_num"] + page_offset}
+
+
+def _split_pdf_bytes(document_bytes: bytes, pages_per_part: int) -> List[Tuple[int, bytes]]:
+    """Split a PDF into page-range PDFs of at most pages_per_part pages"""
+    from PyPDF2 import PdfReader, PdfWriter
+    
+    reader = PdfReader(io.BytesIO(document_bytes))
+    page_total = len(reader.pages)
+    if page_total <= pages_per_part:
+        return [(0, document_bytes)]
+    
+    parts = []
+    for start in range(0, page_total, pages_per_part):
+        writer = PdfWriter()
+        for i in range(start, min(start + pages_per_part, page_total)):
+            writer.add_page(reader.pages[i])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        parts.append((start, buffer.getvalue()))
+    return parts
+
+
+# Fallback extraction runs in worker processes, so these are module-level
+
+# Pages per task below which a PDF is extracted in a single thread
+FALLBACK_PAGES_PER_TASK = 25
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    from PyPDF2 import PdfReader
+    return len(PdfReader(file_path).pages)
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Extract text for pages [start, end) of a PDF"""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _split_page_ranges(page_total: int, workers: int) -> List[Tuple[int, int]]:
+    """Split pages into contiguous ranges, a few per worker for load balancing"""
+    chunk = max(FALLBACK_PAGES_PER_TASK, -(-page_total // (workers * 4)))
+    return [(start, min(start + chunk, page_total)) for start in range(0, page_total, chunk)]
 
 
 # Singleton instance
@@ -8,7 +8,7 @@ from typing import Dict, Any, List, Optional
 import json
 
 try:
-    from openai import AzureOpenAI
+    from openai import AsyncAzureOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -32,7 +32,7 @@ class AzureOpenAIClient:
             
         if settings.azure_openai_endpoint and settings.azure_openai_key:
             try:
-                self.client = AzureOpenAI(
+                self.client = AsyncAzureOpenAI(
                     api_key=settings.azure_openai_key,
                     api_version="2024-02-15-preview",
                     azure_endpoint=settings.azure_openai_endpoint
@@ -52,7 +52,8 @@ class AzureOpenAIClient:
             raise ValueError("Azure OpenAI not configured")
         
         try:
-            response = self.client.chat.completions.create(
+            # Async client: cancelling a losing hedge aborts the HTTP request
+            response = await self.client.chat.completions.create(
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": "You are an AI assistant analyzing official Indian government documents. Be factual, unbiased, and cite sources when possible."},
@@ -143,7 +144,7 @@ Respond in JSON format:
         context_chunks: List[str],
         document_title: str = "Government Document"
     ) -> Dict[str, Any]:
-        """Answer question using RAG context - with Gemini fallback"""
+        """Answer question using RAG context"""
         context = "\n\n---\n\n".join(context_chunks[:5])
         
         prompt = f"""Based ONLY on the following excerpts from "{document_title}", answer the question.
@@ -157,32 +158,19 @@ Question: {question}
 
 Answer:"""
         
-        # Try Azure OpenAI first
-        try:
-            answer = await self._generate(prompt)
-            return {
-                "answer": answer,
-                "confidence": 0.85 if "not available" not in answer.lower() else 0.3
-            }
-        except Exception as e:
-            print(f"⚠️ Azure OpenAI failed: {e}. Falling back to Gemini...")
-            # Fallback to Gemini
-            try:
-                from services.gemini_client import get_gemini_client
-                gemini = get_gemini_client()
-                return await gemini.answer_question(question, context_chunks, document_title)
-            except Exception as gemini_error:
-                return {
-                    "answer": f"Sorry, both Azure OpenAI and Gemini failed. Please check your API configuration. Error: {str(e)}",
-                    "confidence": 0.0
-                }
+        # Failures propagate so the LLM router can use another provider
+        answer = await self._generate(prompt)
+        return {
+            "answer": answer,
+            "confidence": 0.85 if "not available" not in answer.lower() else 0.3
+        }
     
     async def fact_check(
         self,
         claim: str,
         relevant_chunks: List[Dict[str, str]]
     ) -> Dict[str, Any]:
-        """Verify a claim against document evidence - with Gemini fallback"""
+        """Verify a claim against document evidence"""
         evidence_text = "\n\n".join([
             f"From '{chunk.get('document_title', 'Document')}':\n{chunk.get('text', '')[:500]}"
             for chunk in relevant_chunks[:5]
@@ -209,32 +197,17 @@ Be very careful: only mark as "true" if clearly supported, "false" if contradict
 Mark "partially_true" if some aspects are correct but context is missing.
 Mark "unverifiable" if documents don't contain relevant information."""
         
-        # Try Azure OpenAI first
+        # Failures propagate so the LLM router can use another provider
+        result = await self._generate(prompt, max_tokens=1200)
         try:
-            result = await self._generate(prompt, max_tokens=1200)
-            try:
-                return json.loads(result)
-            except:
-                return {
-                    "verdict": "unverifiable",
-                    "confidence": 0.3,
-                    "explanation": result[:500],
-                    "evidence": []
-                }
-        except Exception as e:
-            print(f"⚠️ Azure OpenAI failed for fact-check: {e}. Falling back to Gemini...")
-            # Fallback to Gemini
-            try:
-                from services.gemini_client import get_gemini_client
-                gemini = get_gemini_client()
-                return await gemini.fact_check(claim, relevant_chunks)
-            except Exception as gemini_error:
-                return {
-                    "verdict": "unverifiable",
-                    "confidence": 0.0,
-                    "explanation": f"Both Azure OpenAI and Gemini failed. Error: {str(e)}",
-                    "evidence": []
-                }
+            return json.loads(result)
+        except:
+            return {
+                "verdict": "unverifiable",
+                "confidence": 0.3,
+                "explanation": result[:500],
+                "evidence": []
+            }
 
 
 # Singleton instance
@@ -6,7 +6,10 @@ Microsoft Imagine Cup Service #3
 
 from azure.ai.translation.text import TextTranslationClient
 from azure.core.credentials import AzureKeyCredential
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+import asyncio
+import copy
 import httpx
 
 from config import settings
@@ -35,10 +38,21 @@ class AzureTranslatorService:
         "as": "Assamese",
     }
     
+    # Fields inside translated structures that hold references, not prose
+    UNTRANSLATED_FIELDS = {"source_reference"}
+    
+    # Azure Translator request limits
+    MAX_BATCH_TEXTS = 100
+    MAX_BATCH_CHARS = 50000
+    
+    # In-memory translation cache size (entries)
+    CACHE_MAX_ENTRIES = 10000
+    
     def __init__(self):
         self.api_key = settings.azure_translator_key
         self.region = settings.azure_translator_region
         self.endpoint = "https://api.cognitive.microsofttranslator.com"
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
         
         if not self.api_key:
             print("⚠️ Azure Translator not configured - translation disabled")
@@ -69,6 +83,10 @@ class AzureTranslatorService:
         if target_language not in self.SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {target_language}")
         
+        cached = self._cache_get(source_language, target_language, text)
+        if cached is not None:
+            return cached
+        
         url = f"{self.endpoint}/translate"
         
         params = {
@@ -94,7 +112,9 @@ class AzureTranslatorService:
                 if result and len(result) > 0:
                     translations = result[0].get("translations", [])
                     if translations:
-                        return translations[0].get("text", text)
+                        translated = translations[0].get("text", text)
+                        self._cache_put(source_language, target_language, text, translated)
+                        return translated
         except httpx.HTTPStatusError as e:
             if e.response.status_code in [401, 403]:
                 raise ValueError("Azure Translator API key is invalid or expired. Please update AZURE_TRANSLATOR_KEY in .env")
@@ -141,28 +161,175 @@ class AzureTranslatorService:
             "Content-Type": "application/json"
         }
         
-        # Azure Translator has a limit of 100 texts per request
-        translated = []
-        batch_size = 100
+        # Only send texts that are not cached, and each distinct text once
+        cached = [self._cache_get(source_language, target_language, t) for t in texts]
+        pending = list(dict.fromkeys(t for t, c in zip(texts, cached) if c is None))
+        fresh: Dict[str, str] = {}
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            body = [{"text": t} for t in batch]
-            
-            async with httpx.AsyncClient() as client:
+        # Azure Translator allows 100 texts and 50,000 characters per request
+        async with httpx.AsyncClient() as client:
+            for batch in self._split_batches(pending):
+                body = [{"text": t} for t in batch]
                 response = await client.post(url, params=params, headers=headers, json=body)
                 response.raise_for_status()
                 
                 result = response.json()
-                for item in result:
+                for text, item in zip(batch, result):
                     translations = item.get("translations", [])
                     if translations:
-                        translated.append(translations[0].get("text", ""))
-                    else:
-                        translated.append("")
+                        fresh[text] = translations[0].get("text", "")
+                        self._cache_put(source_language, target_language, text, fresh[text])
         
+        return [c if c is not None else fresh.get(t, "") for t, c in zip(texts, cached)]
+    
+    def _split_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized batches"""
+        batches = []
+        batch = []
+        batch_chars = 0
+        for text in texts:
+            if batch and (len(batch) >= self.MAX_BATCH_TEXTS or batch_chars + len(text) > self.MAX_BATCH_CHARS):
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            batch.append(text)
+            batch_chars += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _cache_get(self, source_language: str, target_language: str, text: str) -> Optional[str]:
+        """Look up a cached translation, marking it recently used"""
+        key = (source_language, target_language, text)
+        translated = self._cache.get(key)
+        if translated is not None:
+            self._cache.move_to_end(key)
         return translated
     
+    def _cache_put(self, source_language: str, target_language: str, text: str, translated: str):
+        """Cache a translation, evicting the least recently used entries"""
+        self._cache[(source_language, target_language, text)] = translated
+        self._cache.move_to_end((source_language, target_language, text))
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+    
+    async def translate_timeline(
+        self,
+        timeline: Dict[str, Any],
+        target_language: str,
+        source_language: str = "en"
+    ) -> Dict[str, Any]:
+        """
+        Translate a 'Simply Put' timeline in a single batch request
+        
+        Args:
+            timeline: Timeline dict with before/change/result sections
+            target_language: Target language code
+            source_language: Language the timeline is written in
+            
+        Returns:
+            A new timeline dict with translated titles, summaries and key points
+        """
+        return await self._translate_nested(timeline, target_language, source_language)
+    
+    async def translate_document(
+        self,
+        fields: Dict[str, Any],
+        target_language: str,
+        source_language: str = "en"
+    ) -> Dict[str, Any]:
+        """
+        Translate the display fields of a document in a single batch request
+        
+        Args:
+            fields: {"title": str, "summary": str, "key_points": [...], "timeline": {...}}
+            target_language: Target language code
+            source_language: Language the fields are written in
+            
+        Returns:
+            A new dict with the same shape, translated
+        """
+        return await self._translate_nested(fields, target_language, source_language)
+    
+    async def pretranslate_document(
+        self,
+        fields: Dict[str, Any],
+        source_language: str = "en",
+        max_concurrency: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Translate document display fields into every supported language
+        
+        Used at ingest time so that reads in any language need no external calls.
+        Languages that fail to translate are left out and fall back to on-demand
+        translation.
+        
+        Returns:
+            {"hi": {...translated fields...}, "ta": {...}, ...}
+        """
+        if not self.api_key:
+            return {}
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def translate_one(language: str):
+            async with semaphore:
+                try:
+                    return language, await self.translate_document(fields, language, source_language)
+                except Exception as e:
+                    print(f"⚠️ Pre-translation to {language} failed: {e}")
+                    return language, None
+        
+        results = await asyncio.gather(*[
+            translate_one(language)
+            for language in self.SUPPORTED_LANGUAGES
+            if language != source_language
+        ])
+        
+        return {language: translated for language, translated in results if translated}
+    
+    async def _translate_nested(
+        self,
+        value: Any,
+        target_language: str,
+        source_language: str
+    ) -> Any:
+        """Translate every string inside a nested dict/list with one batch call"""
+        translated = copy.deepcopy(value)
+        if target_language == source_language:
+            return translated
+        
+        # Flatten every translatable string so the whole structure costs one call
+        slots = []
+        texts = []
+        self._collect_translatable(translated, slots, texts)
+        
+        if not texts:
+            return translated
+        
+        results = await self.translate_batch(texts, target_language, source_language)
+        for (container, key), text in zip(slots, results):
+            container[key] = text
+        
+        return translated
+    
+    def _collect_translatable(self, value: Any, slots: list, texts: List[str]):
+        """Collect (container, key) slots for every non-empty string"""
+        if isinstance(value, dict):
+            items = [(k, v) for k, v in value.items() if k not in self.UNTRANSLATED_FIELDS]
+        elif isinstance(value, list):
+            items = list(enumerate(value))
+        else:
+            return
+        
+        for key, item in items:
+            if isinstance(item, str):
+                if item.strip():
+                    slots.append((value, key))
+                    texts.append(item)
+            else:
+                self._collect_translatable(item, slots, texts)
+    
     async def detect_language(self, text: str) -> Dict[str, any]:
         """
         Detect the language of input text
@@ -23,6 +23,10 @@ class DocumentStore:
         self.data_dir = settings.documents_dir
         self.metadata_file = os.path.join(self.data_dir, "metadata.json")
         self.documents: Dict[str, Dict[str, Any]] = {}
+        self._hash_index: Dict[str, str] = {}  # content sha256 -> doc_id
+        # Store-wide change counter for list ETags; starts from the metadata
+        # file's mtime so a restart never reuses a generation
+        self.generation = 0
         
         # Create data directory if needed
         os.makedirs(self.data_dir, exist_ok=True)
@@ -38,6 +42,13 @@ class DocumentStore:
                     self.documents = json.load(f)
             except (json.JSONDecodeError, IOError):
                 self.documents = {}
+            self.generation = int(os.path.getmtime(self.metadata_file) * 1000)
+        
+        self._hash_index = {
+            doc["content_hash"]: doc_id
+            for doc_id, doc in self.documents.items()
+            if doc.get("content_hash")
+        }
     
     def _save(self):
         """Save documents to metadata file"""
@@ -56,7 +67,10 @@ class DocumentStore:
         key_points: Optional[List[str]] = None,
         full_text: Optional[str] = None,
         page_count: Optional[int] = None,
+        page_offsets: Optional[List[List[int]]] = None,
         timeline: Optional[Dict] = None,
+        translations: Optional[Dict[str, Dict]] = None,
+        content_hash: Optional[str] = None,
     ) -> str:
         """Create a new document record"""
         doc_id = str(uuid.uuid4())[:8]  # Short ID for readability
@@ -68,6 +82,8 @@ class DocumentStore:
             "title": title,
             "category": category.value if isinstance(category, DocumentCategory) else category,
             "file_path": file_path,
+            "content_hash": content_hash,
+            "version": 1,
             "source_url": source_url,
             "source_ministry": source_ministry,
             "published_date": published_date.isoformat() if published_date else None,
@@ -75,12 +91,18 @@ class DocumentStore:
             "key_points": key_points or [],
             "full_text": full_text,
             "page_count": page_count,
+            "page_offsets": page_offsets or [],
             "timeline": timeline,
+            "translations": translations or {},
             "pdf_url": f"/documents/{os.path.basename(file_path)}" if file_path else None,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat(),
         }
         
+        if content_hash:
+            self._hash_index[content_hash] = doc_id
+        
+        self.generation += 1
         self._save()
         return doc_id
     
@@ -88,6 +110,19 @@ class DocumentStore:
         """Get a document by ID"""
         return self.documents.get(doc_id)
     
+    def find_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the document whose source file has this sha256, if any"""
+        doc_id = self._hash_index.get(content_hash)
+        return self.documents.get(doc_id) if doc_id else None
+    
+    def find_by_file_path(self, file_path: str) -> List[Dict[str, Any]]:
+        """Get all documents stored from this file"""
+        target = os.path.abspath(file_path)
+        return [
+            doc for doc in self.documents.values()
+            if doc.get("file_path") and os.path.abspath(doc["file_path"]) == target
+        ]
+    
     def get_all(
         self,
         category: Optional[str] = None,
@@ -122,8 +157,13 @@ class DocumentStore:
         if doc_id not in self.documents:
             return False
         
+        doc = self.documents[doc_id]
         updates["updated_at"] = datetime.utcnow().isoformat()
-        self.documents[doc_id].update(updates)
+        updates["version"] = doc.get("version", 1) + 1
+        if updates.get("content_hash"):
+            self._hash_index[updates["content_hash"]] = doc_id
+        doc.update(updates)
+        self.generation += 1
         self._save()
         return True
     
@@ -132,8 +172,16 @@ class DocumentStore:
         if doc_id not in self.documents:
             return False
         
+        content_hash = self.documents[doc_id].get("content_hash")
+        if content_hash and self._hash_index.get(content_hash) == doc_id:
+            del self._hash_index[content_hash]
+        
         del self.documents[doc_id]
+        self.generation += 1
         self._save()
+        
+        from services.table_index import get_table_index
+        get_table_index().delete(doc_id)
         return True
     
     def get_document_text(self, doc_id: str) -> Optional[str]:
@@ -0,0 +1,182 @@
+"""
+Document Watcher - Incremental ingestion of the documents directory
+Picks up PDFs that ops drop into the documents directory, re-ingests changed
+files and removes records for deleted ones, without full rescans
+"""
+
+from typing import Optional, Dict, Tuple
+import asyncio
+import os
+
+from config import settings
+from services.document_store import get_document_store
+from services.extraction_cache import hash_file
+from services.ingestion import get_ingestion_queue, ALLOWED_EXTENSIONS, guess_category, title_from_filename
+
+
+# (mtime_ns, size) of a file
+FileStat = Tuple[int, int]
+
+
+class DocumentWatcher:
+    """
+    Polls a directory with os.scandir and diffs (mtime, size) snapshots
+    
+    One scandir call per interval costs a single directory read, so this
+    stays cheap with thousands of files and needs no inotify support. A file
+    is only acted on once its stat is unchanged across two scans, so files
+    still being copied in are not ingested half-written.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, interval: Optional[float] = None):
+        self.directory = os.path.abspath(directory or settings.documents_dir)
+        self.interval = interval or settings.watch_interval
+        self._known: Dict[str, FileStat] = {}  # Stat when last handled
+        self._last_scan: Dict[str, FileStat] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Take the initial snapshot and start polling"""
+        if self._task is not None:
+            return
+        
+        loop = asyncio.get_running_loop()
+        self._last_scan = await loop.run_in_executor(None, self._scan)
+        
+        # Files that already have a stored document are up to date; anything
+        # else in the directory gets ingested on the next scan
+        store = get_document_store()
+        self._known = {
+            path: stat for path, stat in self._last_scan.items()
+            if store.find_by_file_path(path)
+        }
+        
+        # Records whose file disappeared while we were down
+        for doc in list(store.documents.values()):
+            file_path = doc.get("file_path")
+            if file_path and self._is_watched(file_path) and not os.path.exists(file_path):
+                self._remove_records(file_path)
+        
+        self._task = asyncio.create_task(self._run())
+        print(f"👀 Watching {self.directory} for new documents")
+    
+    async def stop(self):
+        """Stop polling"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.scan_once()
+            except Exception as e:
+                print(f"⚠️ Document watcher scan failed: {e}")
+    
+    async def scan_once(self):
+        """Diff the directory against the last scan and sync the store"""
+        loop = asyncio.get_running_loop()
+        current = await loop.run_in_executor(None, self._scan)
+        
+        # Removed files
+        for path in list(self._known):
+            if path not in current:
+                del self._known[path]
+                self._remove_records(path)
+        
+        # New and changed files that have settled since the last scan
+        for path, stat in current.items():
+            if self._known.get(path) == stat or self._last_scan.get(path) != stat:
+                continue
+            
+            if path in self._known:
+                print(f"🔄 Document changed: {os.path.basename(path)}")
+            
+            self._known[path] = stat
+            await self._ingest(path)
+        
+        self._last_scan = current
+    
+    def _scan(self) -> Dict[str, FileStat]:
+        """Stat every supported document in the directory"""
+        snapshot = {}
+        if not os.path.isdir(self.directory):
+            return snapshot
+        
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in ALLOWED_EXTENSIONS:
+                    continue
+                stat = entry.stat()
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def _is_watched(self, file_path: str) -> bool:
+        return os.path.dirname(os.path.abspath(file_path)) == self.directory
+    
+    async def _ingest(self, path: str):
+        """
+        Queue a new or changed file for ingestion unless its content is already known
+        
+        Records for this path whose content hash differs from the file's are
+        stale. They are replaced by the re-ingested document once its job
+        completes, not deleted up front, so a failed re-ingest loses nothing.
+        Records that still match the file (including ones the app's own
+        upload just created) are left alone.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            content_hash = await loop.run_in_executor(None, hash_file, path)
+        except OSError:
+            return  # Removed again before we could read it
+        
+        store = get_document_store()
+        queue = get_ingestion_queue()
+        stale = [
+            doc["id"] for doc in store.find_by_file_path(path)
+            if doc.get("content_hash") != content_hash
+        ]
+        
+        existing = store.find_by_hash(content_hash)
+        if existing or queue.find_pending_by_hash(content_hash):
+            # Content already stored for this path: the stale records are superseded
+            if existing and stale and os.path.abspath(existing.get("file_path") or "") == path:
+                self._remove_ids(stale, path)
+            return
+        
+        filename = os.path.basename(path)
+        queue.submit(
+            file_path=path,
+            title=title_from_filename(filename),
+            category=guess_category(filename),
+            content_hash=content_hash,
+            remove_on_failure=False,
+            replaces=stale
+        )
+        print(f"📄 Queued {'changed' if stale else 'new'} document: {filename}")
+    
+    def _remove_records(self, file_path: str):
+        """Delete every stored document built from this (deleted) file"""
+        self._remove_ids([doc["id"] for doc in get_document_store().find_by_file_path(file_path)], file_path)
+    
+    def _remove_ids(self, doc_ids, file_path: str):
+        store = get_document_store()
+        for doc_id in doc_ids:
+            store.delete(doc_id)
+            print(f"🗑️ Removed document {doc_id} ({os.path.basename(file_path)})")
+
+
+# Singleton instance
+_document_watcher: Optional[DocumentWatcher] = None
+
+
+def get_document_watcher() -> DocumentWatcher:
+    """Get or create document watcher instance"""
+    global _document_watcher
+    if _document_watcher is None:
+        _document_watcher = DocumentWatcher()
+    return _document_watcher
@@ -0,0 +1,85 @@
+"""
+Extraction Cache - On-disk store of document extraction results
+Keyed by file sha256 and extractor model so re-indexing never pays for
+Azure Document Intelligence twice for the same bytes
+"""
+
+from typing import Optional, Dict, Any
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import uuid
+
+from config import settings
+
+
+class ExtractionCache:
+    """
+    Gzipped JSON extraction results in a shared directory
+    
+    Entries are written to a temp file and renamed into place, so several
+    workers (or hosts on a shared volume) can read and fill the cache
+    concurrently without ever seeing a partial entry.
+    """
+    
+    def __init__(self):
+        self.cache_dir = settings.extraction_cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    async def get(self, content_hash: str, model_id: str) -> Optional[Dict[str, Any]]:
+        """Get a cached extraction result, or None on a miss"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, self._path(content_hash, model_id))
+    
+    async def put(self, content_hash: str, model_id: str, result: Dict[str, Any]):
+        """Store an extraction result"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, self._path(content_hash, model_id), result)
+    
+    def _path(self, content_hash: str, model_id: str) -> str:
+        safe_model = re.sub(r'[^a-zA-Z0-9._-]', '_', model_id)
+        return os.path.join(self.cache_dir, f"{content_hash}-{safe_model}.json.gz")
+    
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+    
+    def _write(self, path: str, result: Dict[str, Any]):
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(result, f, ensure_ascii=False, separators=(",", ":"), default=str)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """sha256 of a file, read in chunks"""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+# Singleton instance
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create extraction cache instance"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
@@ -8,26 +8,13 @@ from typing import List, Dict, Any, Optional
 import re
 import json
 
-from config import settings
 from services.azure_translator import get_translator_service
+from services.llm_router import get_llm_router
 from services.document_store import get_document_store
+from services.page_index import find_quote_page, page_link
 from api.schemas import FactCheckVerdict
 
 
-def get_llm_client():
-    """Get the best available LLM client"""
-    provider = settings.get_available_llm()
-    
-    if provider == "azure_openai":
-        from services.azure_openai import get_azure_openai_client
-        return get_azure_openai_client()
-    elif provider == "gemini":
-        from services.gemini_client import get_gemini_client
-        return get_gemini_client()
-    else:
-        raise ValueError("No LLM provider configured")
-
-
 class FactCheckerService:
     """
     Fact-checking service that verifies claims against official documents
@@ -40,9 +27,13 @@ class FactCheckerService:
     """
     
     def __init__(self):
-        self.llm_client = get_llm_client()
+        self.llm_client = get_llm_router()
         self.translator = get_translator_service()
-        self.llm_provider = settings.get_available_llm()
+    
+    @property
+    def llm_provider(self) -> str:
+        """Provider that answered this request's last LLM call (or the preferred one)"""
+        return self.llm_client.answered_by() or self.llm_client.provider_names[0]
     
     def _get_all_document_evidence(self) -> List[Dict[str, Any]]:
         """Get summaries and key points from all documents as evidence"""
@@ -74,6 +65,24 @@ class FactCheckerService:
         
         return evidence
     
+    def _find_document(self, document_id: str, document_title: str) -> Optional[Dict[str, Any]]:
+        """Stored document an LLM evidence item refers to, by ID or title"""
+        try:
+            store = get_document_store()
+        except Exception:
+            return None
+        
+        if document_id and store.get(document_id):
+            return store.get(document_id)
+        
+        title = (document_title or "").strip().lower()
+        if not title:
+            return None
+        for doc in store.documents.values():
+            if (doc.get("title") or "").strip().lower() == title:
+                return doc
+        return None
+    
     async def check_claim(
         self,
         claim: str,
@@ -156,12 +165,19 @@ class FactCheckerService:
         llm_evidence = llm_result.get("evidence", [])
         
         for ev in llm_evidence[:5]:  # Limit to 5 evidence items
+            document_title = ev.get("source", ev.get("document_title", "Government Document"))
+            quote = ev.get("quote", "")
+            doc = self._find_document(ev.get("document_id", ""), document_title)
+            page = None
+            if doc:
+                page = find_quote_page(doc.get("full_text") or "", doc.get("page_offsets") or [], quote)
             evidence.append({
-                "document_id": ev.get("document_id", ""),
-                "document_title": ev.get("source", ev.get("document_title", "Government Document")),
-                "page": None,
-                "section": "Document Summary",
-                "quote": ev.get("quote", "")[:300],
+                "document_id": ev.get("document_id", "") or (doc["id"] if doc else ""),
+                "document_title": document_title,
+                "page": page,
+                "section": f"Page {page}" if page else "Document Summary",
+                "quote": quote[:300],
+                "pdf_url": page_link(doc.get("pdf_url"), page) if doc else None,
                 "supports_claim": ev.get("supports_claim", verdict == FactCheckVerdict.TRUE)
             })
         
@@ -261,7 +261,8 @@ JSON response:"""
     async def _generate(self, prompt: str) -> str:
         """Internal method to generate response"""
         try:
-            response = self.model.generate_content(
+            # Async call: cancelling a losing hedge aborts the request
+            response = await self.model.generate_content_async(
                 prompt,
                 safety_settings=self.safety_settings,
                 generation_config={
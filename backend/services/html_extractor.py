@@ -0,0 +1,277 @@
+"""
+HTML Article Extractor - Main-content extraction from streamed HTML
+A readability-style scorer built on the stdlib incremental HTML tokenizer:
+chunks are fed as they arrive, and title, og:title, og:description and the
+article body all come out of the same single pass.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
+from html.parser import HTMLParser
+import re
+
+
+# Elements whose text is never article content
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe", "button",
+    "select", "nav", "footer", "aside",
+}
+
+# Elements that end a paragraph of text
+BLOCK_TAGS = {
+    "p", "div", "article", "section", "main", "li", "ul", "ol", "td", "th", "tr", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "header", "figure",
+    "figcaption", "dd", "dt", "body",
+}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+POSITIVE_HINTS = re.compile(r'article|body|content|entry|main|post|story|text|blog', re.IGNORECASE)
+NEGATIVE_HINTS = re.compile(
+    r'comment|footer|nav|sidebar|menu|share|social|sponsor|promo|related|breadcrumb|'
+    r'cookie|banner|subscribe|newsletter|widget|\bads?\b|advert',
+    re.IGNORECASE
+)
+
+# Forms that hold widgets rather than the page. Other forms are kept: ASP.NET
+# WebForms portals (PIB and many other government sites) wrap the whole
+# page body in a single <form id="form1">
+FORM_HINTS = re.compile(r'search|login|log-in|signin|sign-in|subscribe|newsletter|feedback|comment|poll', re.IGNORECASE)
+
+# Paragraphs shorter than this don't vote for their container
+MIN_PARAGRAPH_CHARS = 25
+
+# Longest title taken from the first line of a plain-text page
+TITLE_MAX_CHARS = 200
+
+
+class ArticleParser(HTMLParser):
+    """
+    Incremental main-content extractor
+    
+    Every run of text is collected into the paragraph of its nearest block
+    element. Each paragraph adds a score (based on its length and commas)
+    to its parent and, at half weight, its grandparent, like Mozilla
+    Readability. The highest-scoring container, discounted by link density
+    and adjusted by id/class hints, is taken as the article.
+    
+    Usage:
+        parser = ArticleParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        result = parser.result()
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.meta: Dict[str, str] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._open: Dict[str, int] = {}  # Open elements per tag name
+        self._next_id = 0
+        self._skip_depth = 0
+        self._in_title = False
+        self._link_depth = 0
+        self._text: List[str] = []
+        self._link_chars = 0
+        self._paragraphs: List[Dict[str, Any]] = []
+        self._containers: Dict[int, Dict[str, Any]] = {}
+    
+    # ---- tokenizer callbacks ----
+    
+    def handle_starttag(self, tag: str, attrs):
+        attributes = dict(attrs)
+        
+        if tag == "meta":
+            self._handle_meta(attributes)
+            return
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._text.append(" ")
+            return
+        
+        if tag == "title" and not self._skip_depth:
+            self._in_title = True
+        
+        # <p> cannot contain blocks - an unclosed one ends here
+        if tag in BLOCK_TAGS and self._stack and self._stack[-1]["tag"] == "p":
+            self._close("p")
+        
+        if tag in BLOCK_TAGS:
+            self._end_paragraph()
+        
+        self._next_id += 1
+        hints = f"{attributes.get('id') or ''} {attributes.get('class') or ''}"
+        element = {"tag": tag, "id": self._next_id, "hints": hints}
+        self._stack.append(element)
+        self._open[tag] = self._open.get(tag, 0) + 1
+        
+        if tag in SKIP_TAGS or _skipped_block(tag, hints) or (
+            tag == "form" and FORM_HINTS.search(f"{hints} {attributes.get('action') or ''} {attributes.get('role') or ''}")
+        ):
+            self._skip_depth += 1
+            element["skip"] = True
+        if tag == "a":
+            self._link_depth += 1
+    
+    def handle_endtag(self, tag: str):
+        if tag == "title":
+            self._in_title = False
+        if self._open.get(tag):
+            self._close(tag)
+    
+    def handle_data(self, data: str):
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth or not self._stack:
+            return
+        self._text.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
+    
+    # ---- results ----
+    
+    def result(self, max_chars: Optional[int] = None) -> Dict[str, str]:
+        """
+        Extracted page
+        
+        Returns:
+            {"title": str, "description": str, "content": str}
+        """
+        self._end_paragraph()
+        
+        content = "\n\n".join(self._article_paragraphs())
+        if max_chars and len(content) > max_chars:
+            content = content[:max_chars] + "..."
+        
+        return {
+            "title": _clean(self.meta.get("og:title") or self.title),
+            "description": _clean(self.meta.get("og:description") or self.meta.get("description", "")),
+            "content": content,
+        }
+    
+    # ---- internals ----
+    
+    def _handle_meta(self, attributes: Dict[str, Optional[str]]):
+        key = (attributes.get("property") or attributes.get("name") or "").lower()
+        if key in ("og:title", "og:description", "description") and attributes.get("content"):
+            self.meta.setdefault(key, attributes["content"])
+    
+    def _close(self, tag: str):
+        """Pop elements up to and including the innermost open `tag`"""
+        while self._stack:
+            element = self._stack.pop()
+            self._open[element["tag"]] -= 1
+            if element["tag"] in BLOCK_TAGS:
+                self._end_paragraph(closing=element)
+            if element.get("skip"):
+                self._skip_depth -= 1
+            if element["tag"] == "a":
+                self._link_depth -= 1
+            if element["tag"] == tag:
+                return
+    
+    def _end_paragraph(self, closing: Optional[Dict[str, Any]] = None):
+        """Finish the current run of text and credit it to its containers"""
+        if not self._text:
+            self._link_chars = 0
+            return
+        text = _clean("".join(self._text))
+        link_chars = self._link_chars
+        self._text = []
+        self._link_chars = 0
+        if not text or self._skip_depth:
+            return
+        
+        # Ancestors: the block being closed (if any) is the paragraph itself
+        ancestors = [element for element in self._stack if element["tag"] in BLOCK_TAGS]
+        if closing is not None:
+            ancestors.append(closing)
+        ancestor_ids = [element["id"] for element in ancestors]
+        self._paragraphs.append({"text": text, "ancestors": ancestor_ids})
+        
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            return
+        
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        containers = ancestors[:-1][-2:] if len(ancestors) > 1 else ancestors
+        for depth, element in enumerate(reversed(containers)):
+            container = self._containers.setdefault(element["id"], {
+                "score": _hint_score(element["hints"]),
+                "chars": 0,
+                "link_chars": 0,
+            })
+            container["score"] += score / (depth + 1)
+            container["chars"] += len(text)
+            container["link_chars"] += link_chars
+    
+    def _article_paragraphs(self) -> List[str]:
+        best_id = None
+        best_score = 0.0
+        for container_id, container in self._containers.items():
+            link_density = container["link_chars"] / container["chars"] if container["chars"] else 1.0
+            score = container["score"] * (1 - link_density)
+            if score > best_score:
+                best_id, best_score = container_id, score
+        
+        if best_id is None:
+            return [p["text"] for p in self._paragraphs if len(p["text"]) >= MIN_PARAGRAPH_CHARS]
+        return [p["text"] for p in self._paragraphs if best_id in p["ancestors"]]
+
+
+class PlainTextParser:
+    """
+    ArticleParser's feed()/result() interface for text/plain pages
+    
+    The HTML tokenizer only keeps text inside elements, so a plain-text
+    body fed to ArticleParser comes out empty. Here blank lines separate
+    paragraphs and the first line is the title.
+    """
+    
+    def __init__(self):
+        self._chunks: List[str] = []
+    
+    def feed(self, data: str):
+        self._chunks.append(data)
+    
+    def result(self, max_chars: Optional[int] = None) -> Dict[str, str]:
+        text = "".join(self._chunks)
+        paragraphs = [_clean(paragraph) for paragraph in re.split(r'\n\s*\n', text)]
+        content = "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+        if max_chars and len(content) > max_chars:
+            content = content[:max_chars] + "..."
+        
+        first_line = next((line for line in text.splitlines() if line.strip()), "")
+        return {
+            "title": _clean(first_line)[:TITLE_MAX_CHARS],
+            "description": "",
+            "content": content,
+        }
+
+
+@lru_cache(maxsize=1024)
+def _hint_flags(hints: str) -> Tuple[bool, bool]:
+    """(positive, negative) id/class hints; pages repeat the same few class lists"""
+    if not hints.strip():
+        return False, False
+    return bool(POSITIVE_HINTS.search(hints)), bool(NEGATIVE_HINTS.search(hints))
+
+
+def _skipped_block(tag: str, hints: str) -> bool:
+    if tag not in BLOCK_TAGS:
+        return False
+    positive, negative = _hint_flags(hints)
+    return negative and not positive
+
+
+def _hint_score(hints: str) -> float:
+    positive, negative = _hint_flags(hints)
+    return 25.0 * positive - 25.0 * negative
+
+
+def _clean(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or "").strip()
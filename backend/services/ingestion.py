@@ -0,0 +1,537 @@
+"""
+Ingestion Service - Background document processing
+Runs extract → summarize → key points → timeline → translate → index outside
+the HTTP request, with per-stage progress persisted so jobs survive restarts.
+"""
+
+from typing import Optional, List, Dict, Any, Callable
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+
+from config import settings
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+from services.azure_doc_intel import get_document_intelligence
+from services.azure_translator import get_translator_service
+from services.page_index import build_page_offsets
+from services.table_index import get_table_index
+
+try:
+    import fcntl
+except ImportError:  # Windows - a single worker process is assumed
+    fcntl = None
+
+
+# Pipeline stages, in execution order
+STAGES = ["extract", "summarize", "key_points", "timeline", "translate", "index"]
+
+# File types the pipeline accepts
+ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
+
+# Seconds between checks of the jobs file for jobs submitted by other worker processes
+JOB_PICKUP_INTERVAL = 2.0
+
+
+def guess_category(filename: str) -> str:
+    """Best-effort document category from a filename"""
+    name = filename.lower()
+    if "notification" in name:
+        return "notification"
+    if "bill" in name:
+        return "bill"
+    if "circular" in name or "policy" in name:
+        return "policy"
+    if "act" in re.split(r'[^a-z]+', name):
+        return "act"
+    return "report"
+
+
+def safe_filename(filename: str) -> str:
+    """Filename with anything outside [a-zA-Z0-9._-] replaced (no path traversal)"""
+    return re.sub(r'[^a-zA-Z0-9._-]', '_', os.path.basename(filename))
+
+
+def stored_filename(filename: str, content_hash: str) -> str:
+    """
+    Name a file is stored under in documents_dir
+    
+    Prefixed with the content hash, so two different files with the same
+    name never overwrite each other (or each other's document's file).
+    """
+    return f"{content_hash[:12]}_{safe_filename(filename)}"
+
+
+def title_from_filename(filename: str) -> str:
+    """Readable document title from a filename"""
+    title = re.sub(r'[_\-]+', ' ', os.path.splitext(os.path.basename(filename))[0])
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+class IngestionPipeline:
+    """
+    Turns a saved file into a stored document
+    
+    Extraction, LLM and Translator calls can be throttled independently by
+    passing semaphores, so bulk ingestion can keep every service busy
+    without exceeding any one's rate limits. Pre-translation has its own
+    limit: it calls the Translator, not the LLM, and a 12-language run must
+    not hold an LLM slot other documents' summaries are waiting for.
+    """
+    
+    def __init__(
+        self,
+        extract_limit: Optional[asyncio.Semaphore] = None,
+        llm_limit: Optional[asyncio.Semaphore] = None,
+        translate_limit: Optional[asyncio.Semaphore] = None
+    ):
+        self.extract_limit = extract_limit
+        self.llm_limit = llm_limit
+        self.translate_limit = translate_limit
+    
+    async def run(
+        self,
+        file_path: str,
+        title: str,
+        category: str = "report",
+        source_url: Optional[str] = None,
+        source_ministry: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        on_stage: Optional[Callable[[str, Dict[str, float]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every stage for one file
+        
+        Args:
+            on_stage: Called with (stage, timings) when each stage starts
+                and once more with ("done", timings) at the end
+        
+        Returns:
+            {"document_id": str, "page_count": int, "summary": str, "timings": {...}}
+        """
+        timings: Dict[str, float] = {}
+        
+        def start(stage: str) -> float:
+            if on_stage:
+                on_stage(stage, timings)
+            return time.perf_counter()
+        
+        def finish(stage: str, started: float):
+            timings[stage] = round(time.perf_counter() - started, 3)
+        
+        # Extract text
+        started = start("extract")
+        extracted = await self._limited(self.extract_limit, self._extract(file_path, content_hash))
+        finish("extract", started)
+        
+        full_text = extracted.get("text", "")
+        page_count = extracted.get("page_count", 0)
+        
+        if not full_text:
+            raise ValueError("Could not extract text from PDF")
+        
+        llm = self._get_llm()
+        
+        # Generate summary
+        started = start("summarize")
+        summary = None
+        if llm:
+            try:
+                summary = await self._limited(self.llm_limit, llm.generate_summary(full_text))
+            except Exception as e:
+                print(f"Summary generation failed: {e}")
+        if not summary:
+            summary = full_text[:300] + "..."
+        finish("summarize", started)
+        
+        # Extract key points
+        started = start("key_points")
+        key_points = []
+        if llm:
+            try:
+                key_points = await self._limited(self.llm_limit, llm.extract_key_points(full_text))
+            except Exception as e:
+                print(f"Key point extraction failed: {e}")
+        finish("key_points", started)
+        
+        # Generate the canonical English timeline
+        started = start("timeline")
+        timeline = None
+        if llm:
+            try:
+                timeline = await self._limited(self.llm_limit, llm.generate_timeline(full_text))
+            except Exception as e:
+                print(f"Timeline generation failed: {e}")
+        finish("timeline", started)
+        
+        # Pre-translate display fields so reads in any language are free
+        started = start("translate")
+        fields = {"title": title, "summary": summary, "key_points": key_points}
+        if timeline:
+            fields["timeline"] = timeline
+        translations = await self._limited(self.translate_limit, get_translator_service().pretranslate_document(fields))
+        finish("translate", started)
+        
+        # Store document (no chunking/indexing needed - we use summaries directly)
+        started = start("index")
+        doc_id = get_document_store().create(
+            title=title,
+            category=DocumentCategory(category),
+            file_path=file_path,
+            source_url=source_url,
+            source_ministry=source_ministry,
+            summary=summary,
+            key_points=key_points,
+            full_text=full_text,
+            page_count=page_count,
+            page_offsets=build_page_offsets(full_text, extracted.get("pages", [])),
+            timeline=timeline,
+            translations=translations,
+            content_hash=content_hash
+        )
+        if extracted.get("tables"):
+            get_table_index().save(doc_id, extracted["tables"])
+        finish("index", started)
+        
+        if on_stage:
+            on_stage("done", timings)
+        
+        return {
+            "document_id": doc_id,
+            "page_count": page_count,
+            "summary": summary,
+            "timings": timings
+        }
+    
+    async def _extract(self, file_path: str, content_hash: Optional[str]) -> Dict[str, Any]:
+        doc_intel = get_document_intelligence()
+        return await doc_intel.extract_from_file(file_path, content_hash=content_hash)
+    
+    def _get_llm(self):
+        """Get the summarization client, or None if no provider is configured"""
+        try:
+            from services.llm_router import get_llm_router
+            return get_llm_router()
+        except Exception as e:
+            print(f"⚠️ Summarization LLM unavailable: {e}")
+            return None
+    
+    async def _limited(self, semaphore: Optional[asyncio.Semaphore], coro):
+        if semaphore is None:
+            return await coro
+        async with semaphore:
+            return await coro
+
+
+class IngestionQueue:
+    """
+    Persistent background ingestion queue
+    
+    Jobs are stored in a JSON file like the document store. Jobs that were
+    queued or running when the process stopped are re-queued on start and
+    run again from the first stage, unless their file was stored as a
+    document meanwhile. Finished jobs are kept for
+    ingestion_job_retention_days so clients can still poll them.
+    
+    With several server workers (gunicorn -w N) only one process runs jobs:
+    start() takes an exclusive lock next to the jobs file, and the other
+    processes only submit. Their jobs reach the runner through the jobs
+    file, which every process rewrites under a second lock, and their
+    status reads come from the file.
+    """
+    
+    def __init__(self, num_workers: Optional[int] = None):
+        self.jobs_file = settings.ingestion_jobs_file
+        self.num_workers = num_workers or settings.ingestion_workers
+        self.lock_file = f"{self.jobs_file}.lock"
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pipeline = IngestionPipeline()
+        self.runner = False  # This process holds the runner lock
+        self._runner_lock = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._seen_mtime = 0.0
+        
+        os.makedirs(os.path.dirname(self.jobs_file), exist_ok=True)
+        self._load()
+    
+    def _load(self):
+        """Load jobs from the jobs file"""
+        self.jobs = self._read()
+    
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.jobs_file):
+            return {}
+        try:
+            with open(self.jobs_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+    
+    def _save(self):
+        """
+        Save jobs atomically, merged with what other processes wrote
+        
+        The runner adopts jobs queued by other processes and its copy wins;
+        other processes add their jobs to what the file holds.
+        """
+        with _locked(self.lock_file):
+            on_disk = self._read()
+            if self.runner:
+                self._adopt(on_disk)
+            else:
+                on_disk.update(self.jobs)  # Read just before (see _refresh), so current
+                self.jobs = on_disk
+            
+            temp_file = f"{self.jobs_file}.{os.getpid()}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.jobs, f, indent=2, default=str)
+            os.replace(temp_file, self.jobs_file)
+            self._seen_mtime = os.path.getmtime(self.jobs_file)
+    
+    def _adopt(self, on_disk: Dict[str, Dict[str, Any]]):
+        """Take over jobs that other processes queued"""
+        for job_id, job in on_disk.items():
+            if job_id not in self.jobs and job["status"] == "queued":
+                self.jobs[job_id] = job
+                if self._queue is not None:
+                    self._queue.put_nowait(job_id)
+    
+    def _refresh(self):
+        """Non-runner processes read job state from the file the runner keeps"""
+        if not self.runner:
+            self._load()
+    
+    def submit(
+        self,
+        file_path: str,
+        title: str,
+        category: str = "report",
+        source_url: Optional[str] = None,
+        source_ministry: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        remove_on_failure: bool = True,
+        replaces: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a saved file for ingestion and return the job record
+        
+        Args:
+            remove_on_failure: Delete the file if ingestion fails (uploads);
+                files placed by operators are left alone
+            replaces: Document IDs to delete once this job has stored its
+                document (stale records of a file changed in place)
+        """
+        job_id = uuid.uuid4().hex[:12]
+        now = datetime.utcnow().isoformat()
+        
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "stage": None,
+            "timings": {},
+            "file_path": file_path,
+            "title": title,
+            "category": category,
+            "source_url": source_url,
+            "source_ministry": source_ministry,
+            "content_hash": content_hash,
+            "remove_on_failure": remove_on_failure,
+            "replaces": replaces or [],
+            "document_id": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.jobs[job_id] = job
+        self._save()
+        
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        
+        return job
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+        self._refresh()
+        return self.jobs.get(job_id)
+    
+    def find_pending_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a queued or running job for the same file content, if any"""
+        self._refresh()
+        for job in self.jobs.values():
+            if job.get("content_hash") == content_hash and job["status"] in ("queued", "running"):
+                return job
+        return None
+    
+    async def start(self) -> bool:
+        """
+        Start the worker pool and resume unfinished jobs
+        
+        Returns:
+            True if this process runs ingestion, False if another one holds
+            the runner lock
+        """
+        if self._queue is not None:
+            return True
+        
+        if not self._acquire_runner_lock():
+            print("📥 Ingestion runs in another worker process")
+            return False
+        
+        self.runner = True
+        with _locked(self.lock_file):
+            for job_id, job in self._read().items():
+                self.jobs.setdefault(job_id, job)  # Submitted since this process loaded
+        self._queue = asyncio.Queue()
+        self._prune()
+        
+        store = get_document_store()
+        pending = [job for job in self.jobs.values() if job["status"] in ("queued", "running")]
+        pending.sort(key=lambda job: job["created_at"])
+        resumed = 0
+        for job in pending:
+            # Stored before the restart (or by another path): nothing left to do
+            existing = store.find_by_hash(job["content_hash"]) if job.get("content_hash") else None
+            if existing:
+                self._update(job, status="completed", document_id=existing["id"])
+                continue
+            self._update(job, status="queued", stage=None, timings={})
+            self._queue.put_nowait(job["id"])
+            resumed += 1
+        
+        if resumed:
+            print(f"📥 Resuming {resumed} ingestion job(s)")
+        
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.num_workers)
+        ]
+        self._workers.append(asyncio.create_task(self._pickup()))
+        return True
+    
+    async def stop(self):
+        """Stop the worker pool; running jobs resume on next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self.runner = False
+        if self._runner_lock is not None:
+            self._runner_lock.close()  # Releases the lock
+            self._runner_lock = None
+    
+    def _acquire_runner_lock(self) -> bool:
+        if fcntl is None:
+            return True
+        handle = open(f"{self.jobs_file}.runner.lock", "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._runner_lock = handle
+        return True
+    
+    async def _pickup(self):
+        """Poll the jobs file for jobs submitted by other worker processes"""
+        while True:
+            await asyncio.sleep(JOB_PICKUP_INTERVAL)
+            try:
+                if os.path.getmtime(self.jobs_file) != self._seen_mtime:
+                    with _locked(self.lock_file):
+                        self._adopt(self._read())
+            except OSError:
+                pass
+    
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.jobs.get(job_id)
+                if job and job["status"] == "queued":
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: Dict[str, Any]):
+        self._update(job, status="running")
+        
+        def on_stage(stage: str, timings: Dict[str, float]):
+            self._update(job, stage=stage, timings=dict(timings))
+        
+        try:
+            result = await self.pipeline.run(
+                file_path=job["file_path"],
+                title=job["title"],
+                category=job["category"],
+                source_url=job["source_url"],
+                source_ministry=job["source_ministry"],
+                content_hash=job["content_hash"],
+                on_stage=on_stage
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Ingestion job {job['id']} failed: {e}")
+            # Clean up on failure
+            if job.get("remove_on_failure", True) and job["file_path"] and os.path.exists(job["file_path"]):
+                os.remove(job["file_path"])
+            self._update(job, status="failed", error=str(e))
+            return
+        
+        store = get_document_store()
+        for doc_id in job.get("replaces") or []:
+            if doc_id != result["document_id"] and store.delete(doc_id):
+                print(f"🗑️ Replaced document {doc_id}")
+        
+        self._update(job, status="completed", document_id=result["document_id"])
+    
+    def _prune(self):
+        """Drop completed and failed jobs older than the retention window"""
+        cutoff = (datetime.utcnow() - timedelta(days=settings.ingestion_job_retention_days)).isoformat()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["status"] in ("completed", "failed") and job["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if expired:
+            self._save()
+    
+    def _update(self, job: Dict[str, Any], **updates):
+        updates["updated_at"] = datetime.utcnow().isoformat()
+        job.update(updates)
+        self._save()
+
+
+@contextmanager
+def _locked(lock_path: str):
+    """Exclusive cross-process lock held for the duration of the block"""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+# Singleton instance
+_ingestion_queue: Optional[IngestionQueue] = None
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    """Get or create ingestion queue instance"""
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        _ingestion_queue = IngestionQueue()
+    return _ingestion_queue
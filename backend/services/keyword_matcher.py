@@ -0,0 +1,121 @@
+"""
+Keyword Matcher - Single-pass weighted multi-keyword search
+Compiles a keyword list into one regex alternation with word boundaries that
+understand Devanagari, so a page is scanned once instead of once per keyword.
+"""
+
+from typing import Optional, List, Dict, Tuple, Union
+import json
+import re
+import unicodedata
+
+
+# Word characters for boundary checks. Python's \w does not include
+# Devanagari vowel signs and viramas, so the whole block is added.
+WORD_CHARS = r'\w\u0900-\u097F'
+
+# Inflections allowed after a keyword: an English plural, or Devanagari
+# vowel signs / nasalization (सरकार → सरकारी, सरकारों; योजना → योजनाओं)
+SUFFIX = r'(?:e?s|[\u090F\u0913]?[\u0900-\u0903\u093A-\u094F\u0962\u0963]+|[\u090F\u0913])?'
+
+
+def normalize(text: str) -> str:
+    """NFKC + casefold, so full-width, ligature and case variants compare equal"""
+    return unicodedata.normalize("NFKC", text or "").casefold()
+
+
+class KeywordMatcher:
+    """
+    Weighted keyword search over normalized text
+    
+    Matches are whole words (optionally inflected): 'act' no longer matches
+    "impact" and 'ec' no longer matches "secretary". Multi-word keywords
+    match across any whitespace, and also count the keywords they contain
+    ('finance ministry' counts 'ministry').
+    """
+    
+    def __init__(self, weights: Dict[str, float]):
+        self.weights: Dict[str, float] = {}
+        for keyword, weight in weights.items():
+            key = re.sub(r'\s+', ' ', normalize(keyword)).strip()
+            if key:
+                self.weights[key] = float(weight)
+        
+        self.pattern = re.compile(
+            rf'(?<![{WORD_CHARS}])({_trie_pattern(self.weights)}){SUFFIX}(?![{WORD_CHARS}])'
+        ) if self.weights else None
+        
+        # Keywords implied by a longer keyword that contains them
+        self.implied: Dict[str, List[str]] = {
+            keyword: [
+                other for other in self.weights
+                if other != keyword and re.search(rf'(?<![{WORD_CHARS}]){re.escape(other)}(?![{WORD_CHARS}])', keyword)
+            ]
+            for keyword in self.weights if " " in keyword
+        }
+    
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordMatcher":
+        """
+        Load keywords from a JSON file
+        
+        Either {"keyword": weight, ...} or ["keyword", ...] (weight 1 each)
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data: Union[Dict[str, float], List[str]] = json.load(f)
+        if isinstance(data, list):
+            data = {keyword: 1.0 for keyword in data}
+        return cls(data)
+    
+    def find(self, text: str) -> List[Tuple[str, float]]:
+        """Distinct keywords in text with their weights, in order of first appearance"""
+        if self.pattern is None:
+            return []
+        
+        found: Dict[str, float] = {}
+        for match in self.pattern.finditer(normalize(text)):
+            keyword = re.sub(r'\s+', ' ', match.group(1))
+            for hit in [keyword] + self.implied.get(keyword, []):
+                if hit not in found:
+                    found[hit] = self.weights[hit]
+        return list(found.items())
+    
+    def score(self, text: str, limit: Optional[int] = None) -> Tuple[float, List[str]]:
+        """
+        Total weight of the distinct keywords in text
+        
+        Returns:
+            (score, keywords) with keywords ordered by weight, then appearance
+        """
+        found = self.find(text)
+        total = sum(weight for _, weight in found)
+        keywords = [keyword for keyword, _ in sorted(found, key=lambda item: -item[1])]
+        return total, keywords[:limit] if limit else keywords
+
+
+def _trie_pattern(keywords) -> str:
+    """
+    Regex alternation of keywords factored into a prefix trie
+
+    Shared prefixes are tried once ('ministry'/'mining'/'modi' branch after
+    'm'), which keeps the scan close to a single pass over the text. Longer
+    keywords win over their prefixes ('income tax' over 'income').
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            (r'\s+' if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if "" in node else pattern
+    
+    return build(trie)
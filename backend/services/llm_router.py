@@ -0,0 +1,245 @@
+"""
+LLM Router - One client over every configured LLM provider
+Tracks rolling latency and error rates per provider and method, sends each
+call to the fastest healthy provider for that method and, when it runs slower
+than its own p95, hedges with the next provider: the first answer wins, the
+other is cancelled.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from collections import deque
+from contextvars import ContextVar
+import asyncio
+import time
+
+from config import settings
+
+
+# Provider that produced the most recent answer in the current request
+_answered_by: ContextVar[Optional[str]] = ContextVar("llm_answered_by", default=None)
+
+
+# Error rate is taken over the last ERROR_RATE_CALLS calls within
+# ERROR_RATE_SECONDS: an outage shows up within a few calls, and a provider
+# marked unhealthy is tried first again once its errors age out
+ERROR_RATE_CALLS = 20
+ERROR_RATE_SECONDS = 60.0
+
+
+# Methods routed through the provider clients
+METHODS = (
+    "generate_summary", "extract_key_points", "generate_timeline",
+    "answer_question", "fact_check", "_generate",
+)
+
+
+class ProviderStats:
+    """Rolling latency and error samples for one provider and method"""
+    
+    def __init__(self, window: int):
+        self._samples: "deque[Tuple[float, float, bool]]" = deque(maxlen=window)  # (time, latency, ok)
+    
+    def record(self, latency: float, ok: bool):
+        self._samples.append((time.monotonic(), latency, ok))
+    
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+    
+    def _recent(self) -> List[bool]:
+        cutoff = time.monotonic() - ERROR_RATE_SECONDS
+        return [ok for at, _, ok in list(self._samples)[-ERROR_RATE_CALLS:] if at >= cutoff]
+    
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls among the recent ones"""
+        recent = self._recent()
+        if not recent:
+            return 0.0
+        return recent.count(False) / len(recent)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile of successful calls, or None without enough samples"""
+        latencies = sorted(latency for _, latency, ok in self._samples if ok)
+        if len(latencies) < settings.llm_min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+    
+    @property
+    def healthy(self) -> bool:
+        recent = self._recent()
+        return len(recent) < settings.llm_min_samples or self.error_rate <= settings.llm_max_error_rate
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "error_rate": round(self.error_rate, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "healthy": self.healthy,
+        }
+
+
+class LLMRouter:
+    """
+    Latency-aware router with the same interface as the provider clients
+    
+    Stats are kept per (provider, method): a whole-document summary and a
+    short answer have very different latencies, so each method is ranked
+    and hedged against its own baseline. Order: healthy providers before
+    unhealthy ones, then lowest p50; providers without enough samples yet
+    keep their configured preference and are tried first so they get
+    measured. A failed call falls through to the next provider.
+    """
+    
+    def __init__(self, providers: List[Tuple[str, Any]]):
+        """
+        Args:
+            providers: [(name, client), ...] in order of preference
+        """
+        self.providers = providers
+        self.stats = {
+            (name, method): ProviderStats(settings.llm_stats_window)
+            for name, _ in providers for method in METHODS
+        }
+    
+    @property
+    def provider_names(self) -> List[str]:
+        return [name for name, _ in self.providers]
+    
+    def answered_by(self) -> Optional[str]:
+        """Provider that answered the last call made in this request"""
+        return _answered_by.get()
+    
+    def ranked(self, method: str) -> List[Tuple[str, Any]]:
+        """Providers in the order they should be tried for method"""
+        def key(item):
+            index, (name, _) = item
+            stats = self.stats[(name, method)]
+            return (not stats.healthy, stats.percentile(0.5) or 0.0, index)
+        return [provider for _, provider in sorted(enumerate(self.providers), key=key)]
+    
+    def status(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Latency/error snapshot per provider and method, for /health"""
+        return {
+            name: {
+                method: self.stats[(name, method)].snapshot()
+                for method in METHODS if self.stats[(name, method)].samples
+            }
+            for name, _ in self.providers
+        }
+    
+    # ---- provider client interface ----
+    
+    async def generate_summary(self, document_text: str) -> str:
+        return await self._call("generate_summary", document_text)
+    
+    async def extract_key_points(self, document_text: str) -> List[str]:
+        return await self._call("extract_key_points", document_text)
+    
+    async def generate_timeline(self, document_text: str, previous_law_text: Optional[str] = None) -> Dict[str, Any]:
+        return await self._call("generate_timeline", document_text, previous_law_text)
+    
+    async def answer_question(self, question: str, context_chunks: List[str], document_title: str) -> Dict[str, Any]:
+        return await self._call("answer_question", question, context_chunks, document_title)
+    
+    async def fact_check(self, claim: str, relevant_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._call("fact_check", claim, relevant_chunks)
+    
+    async def _generate(self, prompt: str) -> str:
+        return await self._call("_generate", prompt)
+    
+    # ---- routing ----
+    
+    async def _call(self, method: str, *args) -> Any:
+        order = self.ranked(method)
+        if not order:
+            raise ValueError("No LLM provider configured")
+        
+        last_error: Optional[BaseException] = None
+        pending = list(order)
+        
+        while pending:
+            primary = pending.pop(0)
+            started = time.perf_counter()
+            task = asyncio.ensure_future(self._timed(primary, method, args))
+            running = {task: primary}
+            
+            # Hedge only with a measured p95 - a cold provider has no baseline to beat
+            hedge_after = self.stats[(primary[0], method)].percentile(0.95) if settings.llm_hedging and pending else None
+            
+            try:
+                if hedge_after is not None:
+                    done, _ = await asyncio.wait([task], timeout=hedge_after)
+                    if not done:
+                        secondary = pending.pop(0)
+                        running[asyncio.ensure_future(self._timed(secondary, method, args))] = secondary
+                
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for finished in done:
+                        name = running.pop(finished)[0]
+                        if finished.exception() is None:
+                            if task in running and not task.done():
+                                # The primary lost the race after passing its p95:
+                                # counted as a timeout, not as a latency sample
+                                self.stats[(primary[0], method)].record(time.perf_counter() - started, ok=False)
+                            _answered_by.set(name)
+                            return finished.result()
+                        last_error = finished.exception()
+                        print(f"⚠️ LLM provider {name} failed for {method}: {last_error}")
+            finally:
+                # The losing (or abandoned) request is cancelled
+                for leftover in running:
+                    leftover.cancel()
+        
+        raise last_error
+    
+    async def _timed(self, provider: Tuple[str, Any], method: str, args: tuple) -> Any:
+        name, client = provider
+        stats = self.stats[(name, method)]
+        started = time.perf_counter()
+        # A cancelled call raises CancelledError (not an Exception): its
+        # truncated time is no latency sample, and _call records a lost race
+        try:
+            result = await getattr(client, method)(*args)
+        except Exception:
+            stats.record(time.perf_counter() - started, ok=False)
+            raise
+        stats.record(time.perf_counter() - started, ok=True)
+        return result
+
+
+def _configured_providers() -> List[Tuple[str, Any]]:
+    """Configured provider clients in order of preference (Azure OpenAI first)"""
+    providers = []
+    
+    if settings.azure_openai_endpoint and settings.azure_openai_key:
+        from services.azure_openai import get_azure_openai_client
+        client = get_azure_openai_client()
+        if client.is_configured():
+            providers.append(("azure_openai", client))
+    
+    if settings.gemini_api_key:
+        try:
+            from services.gemini_client import get_gemini_client
+            providers.append(("gemini", get_gemini_client()))
+        except Exception as e:
+            print(f"⚠️ Gemini unavailable: {e}")
+    
+    return providers
+
+
+# Singleton instance
+_llm_router: Optional[LLMRouter] = None
+
+
+def get_llm_router() -> LLMRouter:
+    """Get or create the LLM router; raises ValueError if no provider is configured"""
+    global _llm_router
+    if _llm_router is None:
+        providers = _configured_providers()
+        if not providers:
+            raise ValueError("No LLM provider configured. Set GEMINI_API_KEY or AZURE_OPENAI_* in .env")
+        _llm_router = LLMRouter(providers)
+    return _llm_router
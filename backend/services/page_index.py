@@ -0,0 +1,157 @@
+"""
+Page Index - Maps character offsets in a document's full text to PDF pages
+Stored as a compact [[page_num, start, end], ...] table sorted by start, so a
+quote found anywhere in full_text resolves to its page with a binary search.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from bisect import bisect_right
+import re
+
+
+# [[page_num, start, end], ...] with start/end indexing into full_text
+PageOffsets = List[List[int]]
+
+# Leading characters of a page used to locate it in full_text
+PAGE_ANCHOR_CHARS = 80
+
+# Words of a quote used for the whitespace-insensitive search
+QUOTE_ANCHOR_WORDS = 12
+
+# Characters per passage when searching full_text for a question
+PASSAGE_CHARS = 800
+
+
+def build_page_offsets(full_text: str, pages: List[Dict[str, Any]]) -> PageOffsets:
+    """
+    Build the page-offset table for an extraction result
+    
+    Pages that carry char_start/char_end (Document Intelligence spans, or
+    offsets computed by the fallback join) are used as-is. Otherwise each
+    page's text is located in full_text in order.
+    """
+    offsets = []
+    cursor = 0
+    
+    for page in pages:
+        page_num = page.get("page_num")
+        if page_num is None:
+            continue
+        
+        start = page.get("char_start")
+        end = page.get("char_end")
+        if start is None or end is None:
+            start = _locate(full_text, page.get("text", ""), cursor)
+            if start is None:
+                continue
+            end = start + len(page.get("text", "").strip())
+        
+        start = max(0, min(start, len(full_text)))
+        end = max(start, min(end, len(full_text)))
+        offsets.append([page_num, start, end])
+        cursor = end
+    
+    offsets.sort(key=lambda entry: entry[1])
+    return offsets
+
+
+def page_for_offset(page_offsets: PageOffsets, offset: int) -> Optional[int]:
+    """Page containing a character offset (or the page preceding it, if between pages)"""
+    if not page_offsets or offset < 0:
+        return None
+    # key= bisects the table in place instead of copying out the starts on every call
+    index = bisect_right(page_offsets, offset, key=lambda entry: entry[1]) - 1
+    if index < 0:
+        return None
+    return page_offsets[index][0]
+
+
+def find_quote_page(full_text: str, page_offsets: PageOffsets, quote: str) -> Optional[int]:
+    """Page on which a quoted span of full_text starts, or None if it isn't found"""
+    if not full_text or not page_offsets or not quote:
+        return None
+    
+    quote = quote.strip().strip('"“”')
+    index = full_text.find(quote)
+    
+    if index < 0:
+        # PDF text wraps lines and LLMs normalize whitespace - match on words
+        words = re.findall(r'\w+', quote)[:QUOTE_ANCHOR_WORDS]
+        if len(words) < 3:
+            return None
+        pattern = r'\W+'.join(re.escape(word) for word in words)
+        match = re.search(pattern, full_text, re.IGNORECASE)
+        if not match:
+            return None
+        index = match.start()
+    
+    return page_for_offset(page_offsets, index)
+
+
+def find_passages(full_text: str, page_offsets: PageOffsets, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+    """
+    Passages of full_text sharing the most words with a query, best first
+    
+    Returns:
+        [{"text": str, "start": int, "page": int or None, "score": int}, ...]
+    """
+    terms = {word for word in re.findall(r'\w+', query.lower()) if len(word) > 3}
+    if not full_text or not terms:
+        return []
+    
+    # Passages never straddle a page, so each one cites a single page
+    lowered = full_text.lower()
+    bounds = [(start, end) for _, start, end in page_offsets] or [(0, len(full_text))]
+    scored = []
+    for page_start, page_end in bounds:
+        for start in range(page_start, page_end, PASSAGE_CHARS):
+            end = min(start + PASSAGE_CHARS, page_end)
+            score = len(terms.intersection(re.findall(r'\w+', lowered[start:end])))
+            if score:
+                scored.append((score, start, full_text[start:end]))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    
+    passages = []
+    for score, start, passage in scored[:limit]:
+        # The page of the first character, not of leading whitespace
+        first = start + len(passage) - len(passage.lstrip())
+        passages.append({
+            "text": passage.strip(),
+            "start": first,
+            "page": page_for_offset(page_offsets, first),
+            "score": score,
+        })
+    return passages
+
+
+def page_range_bounds(page_offsets: PageOffsets, first: int, last: int) -> Optional[Tuple[int, int]]:
+    """(start, end) character span covering pages first..last (inclusive), or None"""
+    spans = [(start, end) for page_num, start, end in page_offsets if first <= page_num <= last]
+    if not spans:
+        return None
+    return min(start for start, _ in spans), max(end for _, end in spans)
+
+
+def page_range_text(full_text: str, page_offsets: PageOffsets, first: int, last: int) -> str:
+    """Text of pages first..last (inclusive)"""
+    bounds = page_range_bounds(page_offsets, first, last)
+    if bounds is None:
+        return ""
+    return full_text[bounds[0]:bounds[1]]
+
+
+def page_link(pdf_url: Optional[str], page: Optional[int]) -> Optional[str]:
+    """Link that opens a PDF at a page in browser viewers"""
+    if not pdf_url:
+        return None
+    return f"{pdf_url}#page={page}" if page else pdf_url
+
+
+def _locate(full_text: str, page_text: str, cursor: int) -> Optional[int]:
+    anchor = page_text.strip()[:PAGE_ANCHOR_CHARS]
+    if not anchor:
+        return None
+    index = full_text.find(anchor, cursor)
+    if index < 0:
+        index = full_text.find(anchor)
+    return index if index >= 0 else None
@@ -0,0 +1,168 @@
+"""
+PDF Pages - Page slices and thumbnails of stored PDFs
+Lets the viewer fetch one page (or a few) of a bill that runs to hundreds of
+MB, and a small preview image of any page, without downloading the file.
+"""
+
+from typing import Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import struct
+import uuid
+import zlib
+
+from config import settings
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # Listed in requirements; thumbnails answer 501 without it
+    pdfium = None
+
+
+# Most pages served in one slice
+MAX_SLICE_PAGES = 50
+
+# Recently built slices kept in memory (slices are small; first pages are hot)
+SLICE_CACHE_ENTRIES = 32
+
+
+class PdfPageService:
+    """
+    Builds page-range PDFs with PyPDF2 and renders page thumbnails with
+    pypdfium2. Both run in a worker thread. Thumbnails are
+    written to thumbnails_dir once per (file version, page, width) and
+    served from disk afterwards.
+    """
+    
+    def __init__(self):
+        self.thumbnails_dir = settings.thumbnails_dir
+        os.makedirs(self.thumbnails_dir, exist_ok=True)
+        self._slices: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+    
+    def thumbnails_available(self) -> bool:
+        return pdfium is not None
+    
+    async def page_slice(self, file_path: str, first: int, last: int) -> bytes:
+        """
+        PDF containing pages first..last (1-based, inclusive)
+        
+        Raises:
+            ValueError: If the range is outside the document
+        """
+        key = (file_version(file_path), first, last)
+        cached = self._slices.get(key)
+        if cached is not None:
+            self._slices.move_to_end(key)
+            return cached
+        
+        data = await asyncio.to_thread(_slice_pdf, file_path, first, last)
+        self._slices[key] = data
+        while len(self._slices) > SLICE_CACHE_ENTRIES:
+            self._slices.popitem(last=False)
+        return data
+    
+    async def thumbnail(self, file_path: str, page: int, width: int) -> str:
+        """
+        Path of a PNG thumbnail of a page, rendering it on first request
+        
+        Raises:
+            RuntimeError: If pypdfium2 is not installed
+            ValueError: If the page is outside the document
+        """
+        if pdfium is None:
+            raise RuntimeError("Thumbnails need pypdfium2 (pip install pypdfium2)")
+        
+        path = os.path.join(self.thumbnails_dir, file_version(file_path), f"{page}-{width}.png")
+        if os.path.exists(path):
+            return path
+        
+        png = await asyncio.to_thread(_render_thumbnail, file_path, page, width)
+        
+        # Atomic write so a concurrent request never serves a partial image;
+        # the temp name is unique even across hosts sharing thumbnails_dir
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(png)
+        os.replace(temp_path, path)
+        return path
+    
+    def delete(self, file_path: str):
+        """Remove cached thumbnails of a file (call before deleting the file)"""
+        if os.path.exists(file_path):
+            shutil.rmtree(os.path.join(self.thumbnails_dir, file_version(file_path)), ignore_errors=True)
+
+
+def file_version(file_path: str) -> str:
+    """Short key that changes whenever the file at file_path is replaced"""
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _slice_pdf(file_path: str, first: int, last: int) -> bytes:
+    from PyPDF2 import PdfReader, PdfWriter
+    
+    reader = PdfReader(file_path)
+    page_total = len(reader.pages)
+    if first < 1 or first > page_total:
+        raise ValueError(f"Page {first} is outside the document (1-{page_total})")
+    
+    writer = PdfWriter()
+    for i in range(first - 1, min(last, page_total)):
+        writer.add_page(reader.pages[i])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _render_thumbnail(file_path: str, page: int, width: int) -> bytes:
+    document = pdfium.PdfDocument(file_path)
+    try:
+        if page < 1 or page > len(document):
+            raise ValueError(f"Page {page} is outside the document (1-{len(document)})")
+        pdf_page = document[page - 1]
+        page_width, _ = pdf_page.get_size()
+        bitmap = pdf_page.render(scale=width / page_width, rev_byteorder=True)
+        return _encode_png(bitmap.buffer, bitmap.width, bitmap.height, bitmap.stride, bitmap.n_channels)
+    finally:
+        document.close()
+
+
+def _encode_png(buffer, width: int, height: int, stride: int, channels: int) -> bytes:
+    """Encode an RGB/RGBA/gray bitmap as PNG (avoids a Pillow dependency)"""
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+    pixels = memoryview(buffer).cast("B")
+    row_bytes = width * channels
+    # Filter byte 0 (none) before every row
+    raw = b"".join(
+        b"\x00" + pixels[row * stride:row * stride + row_bytes].tobytes()
+        for row in range(height)
+    )
+    
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+# Singleton instance
+_pdf_page_service: Optional[PdfPageService] = None
+
+
+def get_pdf_page_service() -> PdfPageService:
+    """Get or create the PDF page service"""
+    global _pdf_page_service
+    if _pdf_page_service is None:
+        _pdf_page_service = PdfPageService()
+    return _pdf_page_service
@@ -7,9 +7,20 @@ No Azure Search dependency - answers are contextual to document content
 from typing import List, Dict, Any, Optional
 import re
 
-from config import settings
 from services.azure_translator import get_translator_service
+from services.llm_router import get_llm_router
 from services.document_store import get_document_store
+from services.page_index import find_passages, find_quote_page, page_link
+from services.table_index import get_table_index
+
+
+# Table rows added to the Q&A context, and the score a row needs to qualify
+TABLE_CONTEXT_ROWS = 5
+TABLE_MIN_SCORE = 1.0
+
+# Full-text passages added to the Q&A context, and the question words one must share
+PASSAGE_CONTEXT_COUNT = 3
+PASSAGE_MIN_SCORE = 2
 
 # Document data for reliable Q&A - ensures answers stay within document context
 DOCUMENT_CONTEXT = {
@@ -98,20 +109,6 @@ DOCUMENT_CONTEXT = {
 }
 
 
-def get_llm_client():
-    """Get the best available LLM client"""
-    provider = settings.get_available_llm()
-    
-    if provider == "azure_openai":
-        from services.azure_openai import get_azure_openai_client
-        return get_azure_openai_client()
-    elif provider == "gemini":
-        from services.gemini_client import get_gemini_client
-        return get_gemini_client()
-    else:
-        raise ValueError("No LLM provider configured. Set GEMINI_API_KEY or AZURE_OPENAI_* in .env")
-
-
 class RAGEngine:
     """
     Document Q&A Engine
@@ -125,9 +122,13 @@ class RAGEngine:
     """
     
     def __init__(self):
-        self.llm_client = get_llm_client()
+        self.llm_client = get_llm_router()
         self.translator = get_translator_service()
-        self.llm_provider = settings.get_available_llm()
+    
+    @property
+    def llm_provider(self) -> str:
+        """Provider that answered this request's last LLM call (or the preferred one)"""
+        return self.llm_client.answered_by() or self.llm_client.provider_names[0]
     
     def _get_document_context(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document context from store or fallback to DOCUMENT_CONTEXT"""
@@ -192,6 +193,34 @@ class RAGEngine:
             for kp in doc_context['key_points']:
                 context_text += f"- {kp}\n"
         
+        # Ground numeric questions in the document's tables
+        table_rows = [
+            row for row in get_table_index().search(document_id, question, limit=TABLE_CONTEXT_ROWS)
+            if row["score"] >= TABLE_MIN_SCORE
+        ]
+        if table_rows:
+            context_text += "\nRelevant table rows:\n"
+            for row in table_rows:
+                cells = "; ".join(
+                    f"{header}: {value}" if header else value
+                    for header, value in zip(row["header"], row["row"]) if value
+                )
+                context_text += f"- (page {row['page_num']}) {cells}\n"
+        
+        # Passages of the full text, each tagged with the page it starts on
+        passages = [
+            passage for passage in find_passages(
+                doc_context.get("full_text") or "", doc_context.get("page_offsets") or [],
+                question, limit=PASSAGE_CONTEXT_COUNT
+            )
+            if passage["score"] >= PASSAGE_MIN_SCORE
+        ]
+        if passages:
+            context_text += "\nRelevant passages:\n"
+            for passage in passages:
+                label = f"(page {passage['page']}) " if passage["page"] else ""
+                context_text += f"- {label}{passage['text']}\n"
+        
         document_title = doc_context.get('title', 'Government Document')
         
         # Generate answer using LLM
@@ -211,14 +240,57 @@ class RAGEngine:
                 "llm_provider": self.llm_provider
             }
         
-        # Build citations
-        citations = [{
-            "text": doc_context.get('summary', '')[:200] + "...",
-            "page": None,
-            "section": "Document Summary",
-            "document_id": document_id,
-            "relevance_score": 0.9
-        }]
+        # Build citations - quotes found in the document text link to their page
+        citations = []
+        for cited in result.get("citations") or []:
+            quote = (cited.get("text") or "").strip() if isinstance(cited, dict) else ""
+            page = find_quote_page(
+                doc_context.get("full_text") or "", doc_context.get("page_offsets") or [], quote
+            )
+            if page is None:
+                continue
+            citations.append({
+                "text": quote[:200],
+                "page": page,
+                "section": cited.get("section") or f"Page {page}",
+                "document_id": document_id,
+                "pdf_url": page_link(doc_context.get("pdf_url"), page),
+                "relevance_score": 0.9
+            })
+        
+        cited_pages = {citation["page"] for citation in citations}
+        for passage in passages:
+            if passage["page"] is None or passage["page"] in cited_pages:
+                continue
+            cited_pages.add(passage["page"])
+            citations.append({
+                "text": passage["text"][:200],
+                "page": passage["page"],
+                "section": f"Page {passage['page']}",
+                "document_id": document_id,
+                "pdf_url": page_link(doc_context.get("pdf_url"), passage["page"]),
+                "relevance_score": min(1.0, passage["score"] / 5)
+            })
+        
+        for row in table_rows:
+            citations.append({
+                "text": " | ".join(value for value in row["row"] if value)[:200],
+                "page": row["page_num"],
+                "section": f"Table, page {row['page_num']}" if row["page_num"] else "Table",
+                "document_id": document_id,
+                "pdf_url": page_link(doc_context.get("pdf_url"), row["page_num"]),
+                "relevance_score": min(1.0, row["score"] / 3)
+            })
+        
+        if not citations:
+            citations = [{
+                "text": doc_context.get('summary', '')[:200] + "...",
+                "page": None,
+                "section": "Document Summary",
+                "document_id": document_id,
+                "pdf_url": doc_context.get("pdf_url"),
+                "relevance_score": 0.9
+            }]
         
         # Get answer and confidence
         answer = result.get("answer", "I couldn't generate an answer.")
@@ -272,20 +344,7 @@ class RAGEngine:
         
         # Translate if needed
         if language != "en" and self.translator.is_configured():
-            for section in ["before", "change", "result"]:
-                if section in timeline:
-                    if "summary" in timeline[section]:
-                        timeline[section]["summary"] = await self.translator.translate(
-                            timeline[section]["summary"], language, "en"
-                        )
-                    if "key_points" in timeline[section]:
-                        timeline[section]["key_points"] = await self.translator.translate_batch(
-                            timeline[section]["key_points"], language, "en"
-                        )
-                    if "title" in timeline[section]:
-                        timeline[section]["title"] = await self.translator.translate(
-                            timeline[section]["title"], language, "en"
-                        )
+            timeline = await self.translator.translate_timeline(timeline, language, "en")
         
         return timeline
     
@@ -0,0 +1,346 @@
+"""
+Table Index - Structured tables extracted by Document Intelligence
+Tax slabs, fee schedules and allocations are stored per document in columnar
+form so numeric questions ("rate for income above 12 lakh") can be answered
+from table cells without sending the whole document to an LLM.
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
+import json
+import math
+import os
+import re
+
+from config import settings
+from services.keyword_matcher import WORD_CHARS, normalize
+
+
+# Multipliers for Indian and international number words
+AMOUNT_UNITS = {
+    "thousand": 1e3, "k": 1e3,
+    "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5, "लाख": 1e5,
+    "crore": 1e7, "crores": 1e7, "cr": 1e7, "करोड़": 1e7, "करोड": 1e7,
+    "million": 1e6, "mn": 1e6,
+    "billion": 1e9, "bn": 1e9,
+}
+
+# A number, with an optional currency before it and a unit or % after it
+NUMBER_PATTERN = re.compile(
+    r'(?P<currency>(?:₹|\brs\.?|\binr)\s*)?(?<!\w)(?<!\d\.)(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<unit>%|' + "|".join(
+        sorted((re.escape(unit) for unit in AMOUNT_UNITS), key=len, reverse=True)
+    ) + r'|rupees)?(?![\w%])',
+    re.IGNORECASE
+)
+
+# A bound word right before a number opens its range to infinity ("above 24
+# lakh") or from zero ("up to 4 lakh"); "12 lakh and above" works too
+LOWER_BOUND_BEFORE = re.compile(r'\b(?:above|exceeding|exceeds|more than|over|beyond|greater than)\s*$', re.IGNORECASE)
+UPPER_BOUND_BEFORE = re.compile(r'\b(?:up ?to|upto|not exceeding|below|less than|under|till)\s*$', re.IGNORECASE)
+LOWER_BOUND_AFTER = re.compile(r'^\s*(?:and|or)\s+(?:above|more|over)\b', re.IGNORECASE)
+UPPER_BOUND_AFTER = re.compile(r'^\s*(?:and|or)\s+(?:below|less|under)\b', re.IGNORECASE)
+BOUND_WORDS = {"above", "exceeding", "exceeds", "more", "than", "over", "beyond", "greater", "up", "upto", "not", "below", "less", "under", "till"}
+
+# Numbers after these are references ("section 115", "rule 3"), not amounts
+REFERENCE_BEFORE = re.compile(
+    r'\b(?:sections?|sec|s|sub-section|rules?|clauses?|articles?|chapters?|schedules?|paragraphs?|para|item|entry)\.?\s*$',
+    re.IGNORECASE
+)
+# "2025-26": the year after the hyphen is not an amount either
+YEAR_BEFORE = re.compile(r'(?:19|20)\d\d\s*[-–/]\s*$')
+
+# Joins the two ends of a range ("12 to 16 lakh", "4,00,001 - 8,00,000")
+RANGE_JOINER = re.compile(r'^\s*(?:to|and|-|–|—)\s*(?:₹|rs\.?|inr)?\s*$', re.IGNORECASE)
+
+STOPWORDS = {
+    "the", "a", "an", "of", "for", "in", "on", "is", "what", "which", "how", "much",
+    "to", "and", "or", "by", "with", "are", "be", "at", "from", "rs", "inr", "rupees",
+}
+
+# Query and cell words, with Devanagari vowel signs kept inside the word
+TOKEN_PATTERN = re.compile(rf'[{WORD_CHARS}]+')
+
+# Documents whose indexes are kept in memory
+LOADED_INDEX_LIMIT = 64
+
+
+# (low, high, is_percentage)
+Range = Tuple[float, float, bool]
+
+
+def parse_numbers(text: str) -> List[Dict[str, Any]]:
+    """
+    Amounts and percentages mentioned in text, skipping years and references
+    
+    Returns:
+        [{"value", "percent", "marked", "bound", "start", "end"}, ...] where
+        marked means a currency, unit, % or digit grouping says the number
+        is an amount, and bound is "lower"/"upper" from a word like
+        "above"/"up to" next to it
+    """
+    text = text or ""
+    numbers = []
+    for match in NUMBER_PATTERN.finditer(text):
+        number, unit, currency = match.group("number"), (match.group("unit") or "").lower(), match.group("currency")
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        
+        before, after = text[:match.start()], text[match.end():]
+        if REFERENCE_BEFORE.search(before):
+            continue
+        if not (currency or unit or "," in number or "." in number):
+            if len(number) == 4 and 1900 <= value <= 2099:
+                continue  # A year
+            if len(number) == 2 and YEAR_BEFORE.search(before):
+                continue
+        
+        bound = None
+        if LOWER_BOUND_BEFORE.search(before) or LOWER_BOUND_AFTER.search(after):
+            bound = "lower"
+        elif UPPER_BOUND_BEFORE.search(before) or UPPER_BOUND_AFTER.search(after):
+            bound = "upper"
+        
+        numbers.append({
+            "value": value * AMOUNT_UNITS.get(unit, 1),
+            "unit": unit,
+            "percent": unit == "%",
+            "marked": bool(currency or unit or "," in number),
+            "bound": bound,
+            "start": match.start(),
+            "end": match.end(),
+        })
+    
+    # "12 to 16 lakh": the first end takes the unit of the second
+    for first, second in zip(numbers, numbers[1:]):
+        if not first["marked"] and second["marked"] and RANGE_JOINER.match(text[first["end"]:second["start"]]):
+            first["value"] *= AMOUNT_UNITS.get(second["unit"], 1)
+            first["percent"] = second["percent"]
+            first["marked"] = True
+    return numbers
+
+
+def parse_range(text: str, require_marker: bool = False) -> Optional[Range]:
+    """
+    Numeric interval a cell or query describes, or None if it has no numbers
+    
+    "12,00,001 to 16,00,000" -> (1200001, 1600000), "Above 24 lakh" ->
+    (2400000, inf), "Up to 4 lakh" -> (0, 400000), "500" -> (500, 500).
+    With require_marker (questions), bare numbers such as "2025" or "3"
+    are ignored; only amounts with ₹/Rs, a unit, % or digit grouping count.
+    """
+    numbers = parse_numbers(text)
+    if require_marker:
+        numbers = [number for number in numbers if number["marked"]]
+    if not numbers:
+        return None
+    
+    first = numbers[0]
+    if len(numbers) >= 2:
+        second = numbers[1]
+        if RANGE_JOINER.match(text[first["end"]:second["start"]]) and first["percent"] == second["percent"]:
+            return min(first["value"], second["value"]), max(first["value"], second["value"]), first["percent"]
+    
+    value = first["value"]
+    if first["bound"] == "lower":
+        return value, math.inf, first["percent"]
+    if first["bound"] == "upper":
+        return 0.0, value, first["percent"]
+    return value, value, first["percent"]
+
+
+def build_tables(tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert Document Intelligence tables (cell lists) to columnar tables
+    
+    Rows marked as column headers (or the first row, if none are) become the
+    header; the remaining rows are stored column by column.
+    """
+    built = []
+    for table_id, table in enumerate(tables):
+        row_count = table.get("row_count") or 0
+        column_count = table.get("column_count") or 0
+        if not row_count or not column_count:
+            continue
+        
+        grid = [[""] * column_count for _ in range(row_count)]
+        header_rows = set()
+        for cell in table.get("cells", []):
+            row, column = cell.get("row"), cell.get("column")
+            if row is None or column is None or row >= row_count or column >= column_count:
+                continue
+            grid[row][column] = (cell.get("content") or "").strip()
+            if cell.get("kind") == "columnHeader":
+                header_rows.add(row)
+        
+        if not header_rows:
+            header_rows = {0}
+        header = [
+            " ".join(grid[row][column] for row in sorted(header_rows) if grid[row][column])
+            for column in range(column_count)
+        ]
+        body = [grid[row] for row in range(row_count) if row not in header_rows]
+        
+        built.append({
+            "table_id": table_id,
+            "page_num": table.get("page_num"),
+            "row_count": len(body),
+            "column_count": column_count,
+            "header": header,
+            "columns": [[row[column] for row in body] for column in range(column_count)],
+        })
+    return built
+
+
+class TableIndex:
+    """
+    Per-document table files in a shared directory
+    
+    Each document's tables live in {tables_dir}/{doc_id}.json. Parsed numeric
+    ranges and row words are computed once when a document is first searched
+    and kept for the most recently used documents.
+    """
+    
+    def __init__(self):
+        self.tables_dir = settings.tables_dir
+        self._loaded: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        os.makedirs(self.tables_dir, exist_ok=True)
+    
+    def save(self, doc_id: str, tables: List[Dict[str, Any]]) -> int:
+        """Index a document's extracted tables; returns the number stored"""
+        built = build_tables(tables)
+        if not built:
+            return 0
+        
+        path = self._path(doc_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"document_id": doc_id, "tables": built}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        
+        self._loaded.pop(doc_id, None)
+        return len(built)
+    
+    def delete(self, doc_id: str):
+        """Remove a document's table index"""
+        self._loaded.pop(doc_id, None)
+        path = self._path(doc_id)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def get_tables(self, doc_id: str, page: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A document's tables as header + rows, optionally only those on one page"""
+        return [
+            {
+                "table_id": table["table_id"],
+                "page_num": table["page_num"],
+                "header": table["header"],
+                "rows": [list(row) for row in zip(*table["columns"])],
+            }
+            for table in self._load(doc_id)
+            if page is None or table["page_num"] == page
+        ]
+    
+    def search(self, doc_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Table rows relevant to a question
+        
+        Rows score on query words that are whole words of the row or its
+        header ("rate" does not match "corporate"), and score higher when a
+        number in the question ("12 lakh") falls inside a numeric range in
+        one of the row's cells.
+        """
+        words = {
+            word for word in _tokens(query)
+            if word not in STOPWORDS and word not in BOUND_WORDS
+            and not word.isdigit() and word not in AMOUNT_UNITS
+        }
+        query_range = parse_range(query, require_marker=True)
+        
+        matches = []
+        for table in self._load(doc_id):
+            for row_index in range(table["row_count"]):
+                row = [column[row_index] for column in table["columns"]]
+                
+                score = len(words & table["_tokens"][row_index]) / len(words) if words else 0.0
+                if query_range:
+                    score += 2 * max(
+                        (_range_score(query_range, column_ranges[row_index])
+                         for column_ranges in table["_ranges"]),
+                        default=0.0
+                    )
+                
+                if score > 0:
+                    matches.append({
+                        "table_id": table["table_id"],
+                        "page_num": table["page_num"],
+                        "row_index": row_index,
+                        "header": table["header"],
+                        "row": row,
+                        "score": round(score, 3),
+                    })
+        
+        matches.sort(key=lambda match: match["score"], reverse=True)
+        return matches[:limit]
+    
+    def _load(self, doc_id: str) -> List[Dict[str, Any]]:
+        if doc_id in self._loaded:
+            self._loaded.move_to_end(doc_id)
+            return self._loaded[doc_id]
+        
+        tables = []
+        path = self._path(doc_id)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    tables = json.load(f).get("tables", [])
+            except (json.JSONDecodeError, IOError):
+                tables = []
+        
+        for table in tables:
+            table["_ranges"] = [[parse_range(value) for value in column] for column in table["columns"]]
+            header_tokens = _tokens(" ".join(table["header"]))
+            table["_tokens"] = [header_tokens | _tokens(" ".join(row)) for row in zip(*table["columns"])]
+        
+        self._loaded[doc_id] = tables
+        if len(self._loaded) > LOADED_INDEX_LIMIT:
+            self._loaded.popitem(last=False)
+        return tables
+    
+    def _path(self, doc_id: str) -> str:
+        safe_id = re.sub(r'[^a-zA-Z0-9_-]', '_', doc_id)
+        return os.path.join(self.tables_dir, f"{safe_id}.json")
+
+
+def _tokens(text: str) -> set:
+    return set(TOKEN_PATTERN.findall(normalize(text)))
+
+
+def _range_score(query_range: Range, cell_range: Optional[Range]) -> float:
+    """1 if the query's number falls inside the cell's range, 0.5 if the ranges only overlap"""
+    if cell_range is None or cell_range[2] != query_range[2]:
+        return 0.0  # Percentages only compare with percentages
+    low, high, _ = cell_range
+    if query_range[1] == math.inf:
+        # "above X": the slab starting at X (often "X + 1", e.g. "12,00,001")
+        point = query_range[0]
+        if point <= low <= point + 1 or low < point < high:
+            return 1.0
+    elif low <= query_range[1] <= high:
+        return 1.0
+    if low <= query_range[1] and query_range[0] <= high:
+        return 0.5
+    return 0.0
+
+
+# Singleton instance
+_table_index: Optional[TableIndex] = None
+
+
+def get_table_index() -> TableIndex:
+    """Get or create table index instance"""
+    global _table_index
+    if _table_index is None:
+        _table_index = TableIndex()
+    return _table_index
@@ -0,0 +1,177 @@
+"""
+URL Cache - Canonical URLs and TTL caching for URL fact-checks
+The same viral link is pasted thousands of times with different tracking
+parameters and hostnames; canonicalizing it lets every paste share one
+extraction and one fact-check.
+"""
+
+from typing import Optional, Dict, Any, Callable, Awaitable, Hashable, Tuple
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import asyncio
+import re
+import time
+
+from config import settings
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "igsh", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "cmpid", "ito",
+}
+
+YOUTUBE_HOSTS = {"youtube.com", "m.youtube.com", "music.youtube.com", "youtu.be", "youtube-nocookie.com"}
+TWITTER_HOSTS = {"twitter.com", "x.com", "mobile.twitter.com", "mobile.x.com"}
+
+YOUTUBE_ID = re.compile(r'^[\w-]{11}$')
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a shared URL
+    
+    - scheme and host lowercased, fragment removed
+    - utm_* and click-tracking parameters removed, the rest sorted
+    - youtu.be/ID, /shorts/ID, /embed/ID and watch?v=ID -> youtube.com/watch?v=ID
+    - x.com and mobile hosts -> twitter.com/{user}/status/{id}
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = (parts.hostname or "").lower()
+    path = parts.path or "/"
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    
+    if host.startswith("www."):
+        # Only for matching the social hosts - other sites may not serve the bare domain
+        social_host = host[4:]
+    else:
+        social_host = host
+    
+    if social_host in YOUTUBE_HOSTS:
+        video_id = _youtube_id(social_host, path, dict(query))
+        if video_id:
+            return f"https://www.youtube.com/watch?v={video_id}"
+    
+    if social_host in TWITTER_HOSTS:
+        match = re.match(r'^/([^/]+)/status(?:es)?/(\d+)', path)
+        if match:
+            return f"https://twitter.com/{match.group(1)}/status/{match.group(2)}"
+        host = "twitter.com"
+    
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    scheme = (parts.scheme or "https").lower()
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def _youtube_id(host: str, path: str, query: Dict[str, str]) -> Optional[str]:
+    if host == "youtu.be":
+        candidate = path.strip("/").split("/")[0]
+    elif path.startswith(("/shorts/", "/embed/", "/live/", "/v/")):
+        candidate = path.split("/")[2]
+    else:
+        candidate = query.get("v", "")
+    return candidate if YOUTUBE_ID.match(candidate) else None
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry TTL and in-flight coalescing
+    
+    Concurrent requests for a key that is being computed await the same
+    task instead of starting their own, so a burst of identical pastes
+    costs one fetch. Exceptions are passed to every waiter and not cached.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+    
+    async def get_or_create(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Callable[[Any], float]
+    ) -> Any:
+        """
+        Cached value for key, computing it with factory() on a miss
+        
+        Args:
+            ttl: Seconds to keep a computed value, given the value (so
+                failures can expire sooner than successes)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, factory, ttl))
+            self._in_flight[key] = task
+        # A cancelled waiter must not cancel the shared computation
+        return await asyncio.shield(task)
+    
+    async def _compute(self, key: Hashable, factory, ttl) -> Any:
+        try:
+            value = await factory()
+            seconds = ttl(value)
+            if seconds > 0:
+                self._entries[key] = (time.monotonic() + seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+
+
+# Singleton instances
+_extraction_cache: Optional[TTLCache] = None
+_response_cache: Optional[TTLCache] = None
+
+
+def get_url_extraction_cache() -> TTLCache:
+    """Cache of URLContentExtractor results by canonical URL"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = TTLCache(settings.url_cache_max_entries)
+    return _extraction_cache
+
+
+def get_url_response_cache() -> TTLCache:
+    """Cache of complete URL fact-check responses by (canonical URL, language, context)"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = TTLCache(settings.url_cache_max_entries)
+    return _response_cache
+
+
+def permanent_http_failure(status_code: int) -> bool:
+    """True for statuses a retry won't change: 4xx except 408 (timeout) and 429 (rate limit)"""
+    return 400 <= status_code < 500 and status_code not in (408, 429)
+
+
+def url_cache_ttl(success: bool, permanent_failure: bool = False) -> float:
+    """
+    TTL for a cached URL result
+    
+    Successes are kept for url_cache_ttl and permanent failures (404,
+    unsupported content) for the shorter url_cache_negative_ttl. Transient
+    failures - timeouts, 429s, 5xx, busy hosts - get 0 and are not cached.
+    """
+    if success:
+        return settings.url_cache_ttl
+    return settings.url_cache_negative_ttl if permanent_failure else 0
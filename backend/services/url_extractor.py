@@ -5,11 +5,33 @@ Checks if content is related to Indian government policies/bills
 """
 
 import re
+import asyncio
+import codecs
 import httpx
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
 import json
 
+from config import settings
+from services.keyword_matcher import KeywordMatcher
+from services.html_extractor import ArticleParser, PlainTextParser
+from services.url_cache import canonicalize_url, get_url_extraction_cache, permanent_http_failure, url_cache_ttl
+
+
+class FetchError(Exception):
+    """
+    A URL that could not be fetched or read
+    
+    permanent marks failures a retry won't fix (most 4xx, unsupported
+    content); only those are cached. Anything else is retried on the next
+    request.
+    """
+    
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
 
 class URLContentExtractor:
     """
@@ -19,47 +41,125 @@ class URLContentExtractor:
     - Social media posts (via oEmbed or API)
     """
     
-    # Keywords that indicate government-related content
-    GOVT_KEYWORDS = [
+    # Keywords that indicate government-related content, with weights.
+    # Content is government-related once the distinct keywords found add
+    # up to GOVT_SCORE_THRESHOLD. Override with GOVT_KEYWORDS_FILE.
+    GOVT_KEYWORDS = {
+        # General - strong
+        'government': 2, 'ministry': 2, 'parliament': 2, 'bill': 2, 'act': 2,
+        'lok sabha': 2, 'rajya sabha': 2, 'supreme court': 2,
+        
         # General
-        'government', 'ministry', 'parliament', 'lok sabha', 'rajya sabha',
-        'bill', 'act', 'policy', 'scheme', 'notification', 'gazette',
-        'supreme court', 'high court', 'constitution', 'amendment',
+        'policy': 1, 'scheme': 1, 'notification': 1, 'gazette': 1,
+        'high court': 1, 'constitution': 1, 'amendment': 1,
         
         # Hindi
-        'सरकार', 'मंत्रालय', 'विधेयक', 'योजना', 'नीति',
+        'सरकार': 2, 'मंत्रालय': 2, 'संसद': 2, 'विधेयक': 2, 'अधिनियम': 2,
+        'योजना': 1, 'नीति': 1,
         
         # Specific
-        'modi', 'pmo', 'cabinet', 'niti aayog', 'rbi', 'sebi',
-        'income tax', 'gst', 'budget', 'finance ministry',
-        'education', 'ugc', 'aicte', 'ncert',
-        'aravali', 'environment', 'forest', 'mining',
-        'election', 'voting', 'ec', 'evm',
-        'health', 'ayushman', 'neet', 'jee',
-        'agriculture', 'msp', 'farmer', 'kisan',
+        'modi': 1, 'pmo': 1, 'cabinet': 1, 'niti aayog': 1, 'rbi': 1, 'sebi': 1,
+        'income tax': 1, 'gst': 1, 'budget': 1, 'finance ministry': 1,
+        'education': 0.5, 'ugc': 1, 'aicte': 1, 'ncert': 1,
+        'aravali': 1, 'environment': 0.5, 'forest': 0.5, 'mining': 0.5,
+        'election': 1, 'voting': 0.5, 'ec': 1, 'evm': 1,
+        'health': 0.5, 'ayushman': 1, 'neet': 1, 'jee': 1,
+        'agriculture': 0.5, 'msp': 1, 'farmer': 0.5, 'kisan': 1,
         
         # Ministries
-        'mea', 'external affairs', 'home ministry', 'defence',
-        'law ministry', 'justice', 'corporate affairs',
+        'mea': 1, 'external affairs': 1, 'home ministry': 1, 'defence': 1,
+        'law ministry': 1, 'justice': 0.5, 'corporate affairs': 1,
         
         # Legal
-        'section', 'article', 'clause', 'provision', 'regulation',
-        'rti', 'pil', 'judgment', 'verdict', 'order'
-    ]
+        'section': 0.5, 'article': 0.5, 'clause': 0.5, 'provision': 0.5, 'regulation': 1,
+        'rti': 1, 'pil': 1, 'judgment': 0.5, 'verdict': 0.5, 'order': 0.5
+    }
+    
+    # One strong keyword, two ordinary ones, or four generic 0.5 ones. Before
+    # weights any two distinct keywords qualified, so a page mentioning only
+    # "health" and "education" (1.0) no longer counts as government content
+    GOVT_SCORE_THRESHOLD = 2.0
+    
+    # Article text passed on to claim extraction
+    MAX_CONTENT_CHARS = 5000
+    
+    # Content types _extract_article will read
+    HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml", "text/plain"}
     
     def __init__(self):
+        if settings.govt_keywords_file:
+            self.keyword_matcher = KeywordMatcher.from_file(settings.govt_keywords_file)
+        else:
+            self.keyword_matcher = KeywordMatcher(self.GOVT_KEYWORDS)
+        
         self.client = httpx.AsyncClient(
-            timeout=30.0,
+            timeout=httpx.Timeout(
+                connect=settings.url_connect_timeout,
+                read=settings.url_read_timeout,
+                write=settings.url_read_timeout,
+                pool=settings.url_pool_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.url_max_connections,
+                max_keepalive_connections=settings.url_max_keepalive_connections,
+                keepalive_expiry=30.0
+            ),
+            http2=settings.url_http2 and _http2_available(),
             follow_redirects=True,
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
         )
+        
+        # Per-host concurrency caps, dropped once a host has no requests
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_users: Dict[str, int] = {}
+    
+    async def aclose(self):
+        """Close pooled connections (called on app shutdown)"""
+        await self.client.aclose()
+    
+    @asynccontextmanager
+    async def _host_slot(self, url: str, oembed: bool = False):
+        """
+        Hold one of the url_max_per_host request slots for a URL's host
+        
+        A burst of pastes from one news site queues here instead of opening
+        unbounded connections to it. Requests that can't get a slot within
+        the pool timeout fail fast with a transient (uncached) FetchError.
+        oEmbed endpoints answer for every video or post on their platform,
+        so they are limited separately by url_max_per_oembed_host.
+        """
+        host = (urlparse(url).hostname or "").lower()
+        key = f"oembed:{host}" if oembed else host
+        semaphore = self._host_semaphores.get(key)
+        if semaphore is None:
+            limit = settings.url_max_per_oembed_host if oembed else settings.url_max_per_host
+            semaphore = self._host_semaphores[key] = asyncio.Semaphore(limit)
+        self._host_users[key] = self._host_users.get(key, 0) + 1
+        
+        try:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), settings.url_pool_timeout)
+            except asyncio.TimeoutError:
+                raise FetchError(f"Too many requests to {host} right now, please try again shortly")
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            self._host_users[key] -= 1
+            if not self._host_users[key]:
+                del self._host_users[key]
+                del self._host_semaphores[key]
     
     async def extract_from_url(self, url: str) -> Dict[str, Any]:
         """
         Extract content from a URL and determine if it's government-related
         
+        Results are cached by canonical URL, so tracking-parameter and
+        hostname variants of the same link share one fetch.
+        
         Returns:
             {
                 "success": bool,
@@ -72,6 +172,16 @@ class URLContentExtractor:
                 "error": Optional[str]
             }
         """
+        canonical = canonicalize_url(url)
+        result = await get_url_extraction_cache().get_or_create(
+            canonical,
+            lambda: self._extract_uncached(canonical),
+            ttl=lambda result: url_cache_ttl(result.get("success", False), result.get("permanent_failure", False))
+        )
+        return {**result, "url": url}
+    
+    async def _extract_uncached(self, url: str) -> Dict[str, Any]:
+        """Extract and classify a (canonical) URL"""
         try:
             parsed = urlparse(url)
             domain = parsed.netloc.lower()
@@ -79,17 +189,23 @@ class URLContentExtractor:
             # Determine source type
             source_type = self._get_source_type(domain)
             
-            # Extract content based on source
+            # Extract content based on source, within an overall deadline
+            # so slow-drip servers can't hold a request open
             if source_type == "youtube":
-                result = await self._extract_youtube(url)
+                extraction = self._extract_youtube(url)
             elif source_type == "twitter":
-                result = await self._extract_twitter(url)
+                extraction = self._extract_twitter(url)
             elif source_type == "instagram":
-                result = await self._extract_instagram(url)
+                extraction = self._extract_instagram(url)
             elif source_type == "facebook":
-                result = await self._extract_facebook(url)
+                extraction = self._extract_facebook(url)
             else:
-                result = await self._extract_article(url)
+                extraction = self._extract_article(url)
+            
+            try:
+                result = await asyncio.wait_for(extraction, settings.url_fetch_deadline)
+            except asyncio.TimeoutError:
+                raise FetchError(f"Timed out after {settings.url_fetch_deadline:g}s fetching this URL")
             
             # Check if government-related
             content = f"{result.get('title', '')} {result.get('content', '')}"
@@ -104,16 +220,24 @@ class URLContentExtractor:
             
         except Exception as e:
             return {
-                "success": False,
+                **self._failure(e),
                 "url": url,
                 "source_type": "unknown",
-                "title": "",
-                "content": "",
                 "is_govt_related": False,
                 "govt_keywords_found": [],
-                "error": str(e)
             }
     
+    @staticmethod
+    def _failure(error: Exception) -> Dict[str, Any]:
+        """Result for a failed extraction; permanent_failure says whether it may be cached"""
+        return {
+            "success": False,
+            "title": "",
+            "content": "",
+            "error": str(error),
+            "permanent_failure": getattr(error, "permanent", False)
+        }
+    
     def _get_source_type(self, domain: str) -> str:
         """Identify the source type from domain"""
         if 'youtube.com' in domain or 'youtu.be' in domain:
@@ -132,7 +256,8 @@ class URLContentExtractor:
         try:
             # Try oEmbed for basic info
             oembed_url = f"https://www.youtube.com/oembed?url={url}&format=json"
-            response = await self.client.get(oembed_url)
+            async with self._host_slot(oembed_url, oembed=True):
+                response = await self.client.get(oembed_url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -151,19 +276,15 @@ class URLContentExtractor:
                 return await self._extract_article(url)
                 
         except Exception as e:
-            return {
-                "success": False,
-                "title": "",
-                "content": "",
-                "error": str(e)
-            }
+            return self._failure(e)
     
     async def _extract_twitter(self, url: str) -> Dict[str, Any]:
         """Extract content from Twitter/X"""
         try:
             # Try oEmbed
             oembed_url = f"https://publish.twitter.com/oembed?url={url}"
-            response = await self.client.get(oembed_url)
+            async with self._host_slot(oembed_url, oembed=True):
+                response = await self.client.get(oembed_url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -183,12 +304,7 @@ class URLContentExtractor:
                 return await self._extract_article(url)
                 
         except Exception as e:
-            return {
-                "success": False,
-                "title": "",
-                "content": "",
-                "error": str(e)
-            }
+            return self._failure(e)
     
     async def _extract_instagram(self, url: str) -> Dict[str, Any]:
         """Extract content from Instagram"""
@@ -201,12 +317,7 @@ class URLContentExtractor:
                 "note": "Instagram requires manual content input for accurate fact-checking"
             }
         except Exception as e:
-            return {
-                "success": False,
-                "title": "",
-                "content": "",
-                "error": str(e)
-            }
+            return self._failure(e)
     
     async def _extract_facebook(self, url: str) -> Dict[str, Any]:
         """Extract content from Facebook"""
@@ -218,77 +329,69 @@ class URLContentExtractor:
                 "note": "Facebook requires manual content input for accurate fact-checking"
             }
         except Exception as e:
-            return {
-                "success": False,
-                "title": "",
-                "content": "",
-                "error": str(e)
-            }
+            return self._failure(e)
     
     async def _extract_article(self, url: str) -> Dict[str, Any]:
         """Extract content from web articles"""
         try:
-            response = await self.client.get(url)
+            page = await self._fetch_article(url)
+            return {
+                "success": True,
+                "title": page["title"],
+                "content": f"{page['description']} {page['content']}".strip()
+            }
             
+        except Exception as e:
+            return self._failure(e)
+    
+    async def _fetch_article(self, url: str) -> Dict[str, str]:
+        """
+        Stream a page into the article parser, reading at most url_fetch_max_bytes
+        
+        Non-HTML responses are rejected from their headers before any of
+        the body is read, and the connection is closed once the budget is
+        spent, so a pasted link to a huge file costs one bounded read. The
+        parser works on each chunk as it arrives; the page is never held
+        in memory as a whole.
+        
+        Returns:
+            ArticleParser.result()
+        
+        Raises:
+            FetchError: On a non-200 status or unsupported content type
+        """
+        async with self._host_slot(url), self.client.stream("GET", url) as response:
             if response.status_code != 200:
-                return {
-                    "success": False,
-                    "title": "",
-                    "content": "",
-                    "error": f"HTTP {response.status_code}"
-                }
-            
-            html = response.text
-            
-            # Extract title
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-            title = title_match.group(1).strip() if title_match else ""
-            
-            # Try to get meta description
-            desc_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
-            if not desc_match:
-                desc_match = re.search(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\']description["\']', html, re.IGNORECASE)
-            description = desc_match.group(1) if desc_match else ""
+                raise FetchError(f"HTTP {response.status_code}", permanent=permanent_http_failure(response.status_code))
             
-            # Extract main content (simplified)
-            # Remove scripts, styles, and HTML tags
-            content = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-            content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL | re.IGNORECASE)
-            content = re.sub(r'<[^>]+>', ' ', content)
-            content = re.sub(r'\s+', ' ', content).strip()
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in self.HTML_CONTENT_TYPES:
+                raise FetchError(f"Unsupported content type: {content_type}", permanent=True)
             
-            # Limit content length
-            if len(content) > 5000:
-                content = content[:5000] + "..."
+            parser = PlainTextParser() if content_type == "text/plain" else ArticleParser()
+            try:
+                decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
             
-            return {
-                "success": True,
-                "title": title,
-                "content": f"{description} {content}".strip()
-            }
+            budget = settings.url_fetch_max_bytes
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:budget - received]
+                received += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if received >= budget:
+                    break
             
-        except Exception as e:
-            return {
-                "success": False,
-                "title": "",
-                "content": "",
-                "error": str(e)
-            }
+            parser.feed(decoder.decode(b"", final=True))
+        
+        return parser.result(max_chars=self.MAX_CONTENT_CHARS)
     
     def _check_govt_related(self, text: str) -> tuple[bool, List[str]]:
         """Check if content is related to Indian government"""
-        text_lower = text.lower()
-        found_keywords = []
-        
-        for keyword in self.GOVT_KEYWORDS:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
+        score, found_keywords = self.keyword_matcher.score(text)
         
-        # Require at least 2 keywords or 1 strong keyword
-        strong_keywords = ['ministry', 'parliament', 'bill', 'act', 'supreme court', 'government']
-        has_strong = any(kw in found_keywords for kw in strong_keywords)
-        
-        is_related = len(found_keywords) >= 2 or has_strong
+        is_related = score >= self.GOVT_SCORE_THRESHOLD
         
         return is_related, found_keywords[:10]  # Limit to 10 keywords
     
@@ -313,6 +416,15 @@ Return as a JSON array of claim strings. Example:
         return []
 
 
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
 # Singleton
 _extractor: Optional[URLContentExtractor] = None
 
@@ -0,0 +1,72 @@
+"""
+Shared test setup
+Puts the backend package on the path and points every data directory at a
+per-test temp directory, so tests never touch backend/data.
+"""
+
+import functools
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+
+
+# Singletons that hold paths or state from settings
+SINGLETONS = [
+    ("services.document_store", "_document_store"),
+    ("services.table_index", "_table_index"),
+    ("services.ingestion", "_ingestion_queue"),
+    ("services.extraction_cache", "_extraction_cache"),
+    ("services.url_cache", "_extraction_cache"),
+    ("services.url_cache", "_response_cache"),
+    ("services.url_extractor", "_extractor"),
+    ("services.pdf_pages", "_pdf_page_service"),
+    ("services.azure_doc_intel", "_doc_intel_client"),
+    ("services.azure_translator", "_translator_service"),
+]
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Fresh data directory and singletons for every test"""
+    monkeypatch.setattr(settings, "documents_dir", str(tmp_path / "documents"))
+    monkeypatch.setattr(settings, "tables_dir", str(tmp_path / "tables"))
+    monkeypatch.setattr(settings, "extraction_cache_dir", str(tmp_path / "cache" / "extractions"))
+    monkeypatch.setattr(settings, "thumbnails_dir", str(tmp_path / "cache" / "thumbnails"))
+    monkeypatch.setattr(settings, "ingestion_jobs_file", str(tmp_path / "ingestion_jobs.json"))
+    
+    import importlib
+    for module_name, attr in SINGLETONS:
+        monkeypatch.setattr(importlib.import_module(module_name), attr, None)
+    
+    return tmp_path
+
+
+@pytest.fixture
+def fake_translator(monkeypatch):
+    """
+    Azure Translator stand-in that prefixes each text with its target language
+    
+    Returns the list of requests made, as (target language, [texts]).
+    """
+    calls = []
+    
+    def handler(request):
+        target = request.url.params["to"]
+        texts = [item["text"] for item in json.loads(request.content)]
+        calls.append((target, texts))
+        return httpx.Response(200, json=[{"translations": [{"text": f"[{target}] {text}", "to": target}]} for text in texts])
+    
+    monkeypatch.setattr(settings, "azure_translator_key", "test-key")
+    import services.azure_translator as azure_translator
+    monkeypatch.setattr(
+        azure_translator.httpx, "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    )
+    return calls
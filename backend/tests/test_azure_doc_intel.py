@@ -0,0 +1,293 @@
+"""Tests for Document Intelligence extraction against a local fake DI server"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import functools
+import io
+import json
+import os
+import threading
+import unicodedata
+import urllib.parse
+import uuid
+
+import pytest
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
+from azure.core.pipeline.transport import AsyncioRequestsTransport
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+import services.azure_doc_intel as azure_doc_intel
+from config import settings
+from services.azure_doc_intel import AzureDocumentIntelligence, FALLBACK_MODEL_ID, LAYOUT_MODEL_ID
+
+
+def make_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def make_text_pdf(pages: int) -> bytes:
+    """PDF whose page n reads "Clause n", so PyPDF2 has text to extract"""
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    writer = PdfWriter()
+    for n in range(1, pages + 1):
+        page = PageObject.create_blank_page(width=612, height=792)
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 700 Td (Clause {n}) Tj ET".encode())
+        page[NameObject("/Contents")] = content
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def text_length(text: str, string_index_type: str) -> int:
+    """Length in DI's string index units; textElements counts combining marks with their base"""
+    if string_index_type == "unicodeCodePoint":
+        return len(text)
+    return sum(unicodedata.category(char) not in ("Mn", "Mc") for char in text)
+
+
+def analyze_result(document: bytes, string_index_type: str, page_texts=None) -> dict:
+    """DI layout result for a PDF: one line per page and a table on page 1"""
+    page_total = len(PdfReader(io.BytesIO(document)).pages)
+    texts = page_texts or [f"Page {n} of {page_total} ({uuid.uuid4().hex[:6]})" for n in range(1, page_total + 1)]
+    content = "\n".join(texts)
+    
+    pages = []
+    offset = 0
+    for n, text in enumerate(texts, 1):
+        span = {"offset": offset, "length": text_length(text, string_index_type)}
+        pages.append({
+            "pageNumber": n, "width": 8.5, "height": 11, "unit": "inch",
+            "spans": [span], "lines": [{"content": text, "polygon": [], "spans": [span]}],
+        })
+        offset += span["length"] + 1
+    
+    return {
+        "apiVersion": "2024-11-30",
+        "modelId": LAYOUT_MODEL_ID,
+        "content": content,
+        "pages": pages,
+        "tables": [{
+            "rowCount": 1, "columnCount": 1,
+            "cells": [{"rowIndex": 0, "columnIndex": 0, "content": "Nil"}],
+            "boundingRegions": [{"pageNumber": 1, "polygon": []}],
+        }],
+        "paragraphs": [],
+    }
+
+
+class FakeDocumentIntelligence(BaseHTTPRequestHandler):
+    """Long-running analyze operation: POST returns 202, GET returns the result"""
+    
+    results = {}
+    fail_status = None
+    requests = 0
+    page_texts = None
+    
+    def do_POST(self):
+        type(self).requests += 1
+        document = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.fail_status:
+            return self._send(self.fail_status, {"error": {"code": "InvalidRequest", "message": "Invalid request."}})
+        
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        string_index_type = query.get("stringIndexType", ["textElements"])[0]
+        operation = uuid.uuid4().hex
+        self.results[operation] = analyze_result(document, string_index_type, self.page_texts)
+        location = f"http://{self.headers['Host']}/documentintelligence/documentModels/{LAYOUT_MODEL_ID}/analyzeResults/{operation}?api-version=2024-11-30"
+        self._send(202, None, {"Operation-Location": location})
+    
+    def do_GET(self):
+        operation = self.path.split("/analyzeResults/")[1].split("?")[0]
+        self._send(200, {"status": "succeeded", "analyzeResult": self.results[operation]})
+    
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status < 400:
+            self.send_header("Retry-After", "0")  # Poll without waiting
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_di(monkeypatch):
+    FakeDocumentIntelligence.results = {}
+    FakeDocumentIntelligence.fail_status = None
+    FakeDocumentIntelligence.requests = 0
+    FakeDocumentIntelligence.page_texts = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDocumentIntelligence)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(settings, "azure_doc_intel_endpoint", endpoint)
+    monkeypatch.setattr(settings, "azure_doc_intel_key", "test-key")
+    
+    # requests-based transport: the default aio transport needs aiohttp
+    monkeypatch.setattr(
+        "services.azure_doc_intel.DocumentIntelligenceClient",
+        functools.partial(DocumentIntelligenceClient, transport=AsyncioRequestsTransport())
+    )
+    di = AzureDocumentIntelligence()
+    yield di
+    
+    asyncio.run(di.close())
+    server.shutdown()
+
+
+def write_pdf(data_dir, pages: int) -> str:
+    path = data_dir / f"doc-{pages}.pdf"
+    path.write_bytes(make_pdf(pages))
+    return str(path)
+
+
+def test_extract_small_pdf_in_one_request(fake_di, data_dir, monkeypatch):
+    monkeypatch.setattr(settings, "azure_doc_intel_split_pages", 10)
+    
+    result = asyncio.run(fake_di.extract_from_file(write_pdf(data_dir, 3)))
+    
+    assert FakeDocumentIntelligence.requests == 1
+    assert result["page_count"] == 3
+    assert result["metadata"]["model_id"] == LAYOUT_MODEL_ID
+    assert result["tables"][0]["page_num"] == 1
+
+
+def test_split_results_merge_with_shifted_pages_and_offsets(fake_di, data_dir, monkeypatch):
+    monkeypatch.setattr(settings, "azure_doc_intel_split_pages", 2)
+    
+    result = asyncio.run(fake_di.extract_from_file(write_pdf(data_dir, 5)))
+    
+    assert FakeDocumentIntelligence.requests == 3
+    assert result["metadata"]["split_parts"] == 3
+    assert [page["page_num"] for page in result["pages"]] == [1, 2, 3, 4, 5]
+    # Every page's char range points at that page's text in the merged text
+    for page in result["pages"]:
+        assert result["text"][page["char_start"]:page["char_end"]] == page["text"]
+    assert [table["page_num"] for table in result["tables"]] == [1, 3, 5]
+
+
+def test_azure_failure_falls_back_to_pypdf2(fake_di, data_dir, monkeypatch):
+    FakeDocumentIntelligence.fail_status = 400
+    
+    result = asyncio.run(fake_di.extract_from_file(write_pdf(data_dir, 2)))
+    
+    assert FakeDocumentIntelligence.requests == 1
+    assert result["metadata"]["model_id"] == FALLBACK_MODEL_ID
+    assert result["page_count"] == 2
+
+
+def test_fallback_result_is_not_cached_as_layout(fake_di, data_dir):
+    path = write_pdf(data_dir, 2)
+    FakeDocumentIntelligence.fail_status = 400
+    asyncio.run(fake_di.extract_from_file(path))
+    
+    # Azure is back: the next extraction goes to Azure again
+    FakeDocumentIntelligence.fail_status = None
+    result = asyncio.run(fake_di.extract_from_file(path))
+    
+    assert result["metadata"]["model_id"] == LAYOUT_MODEL_ID
+
+
+def test_hindi_page_offsets_are_code_point_indices(fake_di, data_dir):
+    FakeDocumentIntelligence.page_texts = [
+        "आयकर विधेयक, 2025 लोकसभा में प्रस्तुत किया गया",
+        "धारा 80सी के अंतर्गत कटौती की सीमा बढ़ाई गई",
+        "नई कर व्यवस्था में मानक कटौती ₹75,000 होगी",
+    ]
+    
+    result = asyncio.run(fake_di.extract_from_file(write_pdf(data_dir, 3)))
+    
+    for page in result["pages"]:
+        assert result["text"][page["char_start"]:page["char_end"]] == page["text"]
+
+
+def test_fallback_extracts_page_ranges_in_parallel_and_in_order(data_dir, monkeypatch):
+    monkeypatch.setattr(settings, "azure_doc_intel_endpoint", "")
+    monkeypatch.setattr(azure_doc_intel, "FALLBACK_PAGES_PER_TASK", 2)
+    monkeypatch.setattr(settings, "pdf_extract_workers", 2)
+    path = data_dir / "bill.pdf"
+    path.write_bytes(make_text_pdf(7))
+    di = AzureDocumentIntelligence()
+    
+    async def extract():
+        try:
+            result = await di._fallback_extract(str(path))
+            assert di._process_pool is not None  # Ranges went to worker processes
+            return result
+        finally:
+            await di.close()
+    
+    result = asyncio.run(extract())
+    
+    assert azure_doc_intel._split_page_ranges(7, 2) == [(0, 2), (2, 4), (4, 6), (6, 7)]
+    assert [page["text"].strip() for page in result["pages"]] == [f"Clause {n}" for n in range(1, 8)]
+    for page in result["pages"]:
+        assert result["text"][page["char_start"]:page["char_end"]] == page["text"]
+    assert result["metadata"]["model_id"] == FALLBACK_MODEL_ID
+
+
+def test_fallback_page_ranges_cover_large_documents_once():
+    ranges = azure_doc_intel._split_page_ranges(1000, 4)
+    
+    assert ranges[0][0] == 0 and ranges[-1][1] == 1000
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert len(ranges) == 16  # A few ranges per worker for load balancing
+
+
+def test_extraction_is_cached_for_every_worker(fake_di, data_dir):
+    path = write_pdf(data_dir, 2)
+    first = asyncio.run(fake_di.extract_from_file(path))
+    
+    other_worker = AzureDocumentIntelligence()
+    second = asyncio.run(other_worker.extract_from_file(path))
+    asyncio.run(other_worker.close())
+    
+    assert FakeDocumentIntelligence.requests == 1
+    assert second == first
+    assert second["metadata"]["model_id"] == LAYOUT_MODEL_ID and second["tables"]
+    assert [name.endswith(".json.gz") for name in os.listdir(settings.extraction_cache_dir)] == [True]
+
+
+def test_extractor_version_change_misses_the_cache(fake_di, data_dir, monkeypatch):
+    path = write_pdf(data_dir, 2)
+    asyncio.run(fake_di.extract_from_file(path))
+    
+    monkeypatch.setattr(azure_doc_intel, "EXTRACTOR_VERSION", azure_doc_intel.EXTRACTOR_VERSION + 1)
+    asyncio.run(fake_di.extract_from_file(path))
+    
+    assert FakeDocumentIntelligence.requests == 2
+
+
+def test_unreadable_cache_entry_is_extracted_again(fake_di, data_dir):
+    path = write_pdf(data_dir, 2)
+    asyncio.run(fake_di.extract_from_file(path))
+    (entry,) = os.listdir(settings.extraction_cache_dir)
+    with open(os.path.join(settings.extraction_cache_dir, entry), "wb") as f:
+        f.write(b"not gzip")
+    
+    result = asyncio.run(fake_di.extract_from_file(path))
+    
+    assert FakeDocumentIntelligence.requests == 2
+    assert result["page_count"] == 2
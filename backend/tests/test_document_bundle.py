@@ -0,0 +1,89 @@
+"""Tests for the single-request document viewer bundle"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import routes
+from api.routes import router
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+
+
+TIMELINE = {
+    "before": {"title": "Old regime", "summary": "Tax under 819 sections"},
+    "change": {"title": "New Bill", "summary": "536 sections"},
+    "result": {"title": "Outcome", "summary": "Less litigation"},
+}
+
+
+class FakeRag:
+    def __init__(self):
+        self.calls = 0
+    
+    async def generate_timeline(self, document_text, language="en"):
+        self.calls += 1
+        return TIMELINE
+
+
+def make_client(monkeypatch) -> tuple:
+    rag = FakeRag()
+    monkeypatch.setattr(routes, "get_rag_engine", lambda: rag)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    doc_id = get_document_store().create(
+        "Income-tax Bill", DocumentCategory("bill"), "/tmp/bill.pdf",
+        summary="Replaces the 1961 Act", key_points=["Simpler language"], full_text="Bill text"
+    )
+    return TestClient(app), rag, doc_id
+
+
+def test_bundle_computes_missing_pieces_once_and_stores_them(monkeypatch, fake_translator):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    first = client.get(f"/api/documents/{doc_id}/bundle", params={"language": "hi"})
+    calls = len(fake_translator)
+    second = client.get(f"/api/documents/{doc_id}/bundle", params={"language": "hi"})
+    
+    body = first.json()
+    assert body["document"]["title"] == "Income-tax Bill"
+    assert not {"full_text", "timeline", "translations"} & set(body["document"])
+    assert body["timeline"] == TIMELINE
+    assert body["translation"]["title"] == "[hi] Income-tax Bill"
+    assert body["translation"]["timeline"]["change"]["title"] == "[hi] New Bill"
+    assert second.json() == body
+    assert rag.calls == 1 and calls == 2 and len(fake_translator) == calls
+    
+    stored = get_document_store().get(doc_id)["translations"]["hi"]
+    assert {"title", "summary", "key_points", "timeline"} <= set(stored)  # Both concurrent writes kept
+
+
+def test_complete_bundle_revalidates(monkeypatch, fake_translator):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    first = client.get(f"/api/documents/{doc_id}/bundle", params={"language": "ta"})
+    revalidated = client.get(
+        f"/api/documents/{doc_id}/bundle", params={"language": "ta"},
+        headers={"If-None-Match": first.headers["etag"]}
+    )
+    
+    assert revalidated.status_code == 304
+
+
+def test_english_bundle_needs_no_translation(monkeypatch, fake_translator):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    body = client.get(f"/api/documents/{doc_id}/bundle").json()
+    
+    assert body["timeline"] == TIMELINE
+    assert body["translation"] is None
+    assert fake_translator == []
+
+
+def test_without_translator_the_bundle_is_english_and_not_cached(monkeypatch):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    response = client.get(f"/api/documents/{doc_id}/bundle", params={"language": "hi"})
+    
+    assert response.json()["timeline"] == TIMELINE
+    assert response.json()["translation"] is None
+    assert "etag" not in response.headers
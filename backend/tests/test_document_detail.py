@@ -0,0 +1,73 @@
+"""Tests for field projection and windowed full-text reads"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import router
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+
+
+PAGES = ["Page one text.", "Page two is a little longer.", "Page three ends the bill."]
+
+
+def make_client() -> tuple:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    full_text = "\n\n".join(PAGES)
+    offsets, start = [], 0
+    for page_num, text in enumerate(PAGES, 1):
+        offsets.append([page_num, start, start + len(text)])
+        start += len(text) + 2
+    doc_id = get_document_store().create(
+        "Finance Bill", DocumentCategory("bill"), "/tmp/finance.pdf",
+        summary="Summary", key_points=["Point"], full_text=full_text, page_count=3, page_offsets=offsets
+    )
+    return TestClient(app), doc_id
+
+
+def test_fields_projects_the_record():
+    client, doc_id = make_client()
+    
+    whole = client.get(f"/api/documents/{doc_id}")
+    projected = client.get(f"/api/documents/{doc_id}", params={"fields": "title, summary,pdf_url"})
+    
+    assert "full_text" in whole.json()
+    assert projected.json() == {"id": doc_id, "title": "Finance Bill", "summary": "Summary", "pdf_url": "/documents/finance.pdf"}
+    assert projected.headers["etag"] != whole.headers["etag"]
+    
+    revalidated = client.get(
+        f"/api/documents/{doc_id}", params={"fields": "title,summary,pdf_url"},
+        headers={"If-None-Match": projected.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_text_by_page_range():
+    client, doc_id = make_client()
+    
+    response = client.get(f"/api/documents/{doc_id}/text", params={"start_page": 2, "end_page": 3})
+    
+    body = response.json()
+    assert body["text"] == "Page two is a little longer.\n\nPage three ends the bill."
+    assert (body["first_page"], body["last_page"]) == (2, 3)
+    assert body["next_offset"] is None
+
+
+def test_text_window_continues_with_next_offset():
+    client, doc_id = make_client()
+    
+    first = client.get(f"/api/documents/{doc_id}/text", params={"start_page": 2, "length": 10}).json()
+    second = client.get(f"/api/documents/{doc_id}/text", params={"start_page": 2, "offset": first["next_offset"], "length": 100}).json()
+    
+    assert first["text"] + second["text"] == PAGES[1]
+    assert first["next_offset"] == 10 and second["next_offset"] is None
+    assert second["total_chars"] == len("\n\n".join(PAGES))
+
+
+def test_text_rejects_missing_and_reversed_pages():
+    client, doc_id = make_client()
+    
+    assert client.get(f"/api/documents/{doc_id}/text", params={"start_page": 9}).status_code == 404
+    assert client.get(f"/api/documents/{doc_id}/text", params={"start_page": 3, "end_page": 2}).status_code == 400
+    assert client.get(f"/api/documents/{doc_id}/text", params={"length": 10 ** 6}).status_code == 422
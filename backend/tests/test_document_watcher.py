@@ -0,0 +1,84 @@
+"""Tests for incremental ingestion of the documents directory"""
+
+import asyncio
+import os
+
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+from services.document_watcher import DocumentWatcher
+from services.extraction_cache import hash_file
+from services.ingestion import get_ingestion_queue
+
+
+def write(path, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+    return os.path.abspath(path)
+
+
+def settle(watcher: DocumentWatcher):
+    """Two scans: a file is only acted on once its stat is stable"""
+    asyncio.run(watcher.scan_once())
+    asyncio.run(watcher.scan_once())
+
+
+def make_watcher(directory: str) -> DocumentWatcher:
+    os.makedirs(directory, exist_ok=True)
+    return DocumentWatcher(directory=directory, interval=1)
+
+
+def test_new_file_is_queued(data_dir):
+    watcher = make_watcher(str(data_dir / "documents"))
+    path = write(data_dir / "documents" / "Finance_Bill.pdf", b"%PDF-1 new")
+    
+    settle(watcher)
+    
+    jobs = list(get_ingestion_queue().jobs.values())
+    assert [job["file_path"] for job in jobs] == [path]
+    assert jobs[0]["replaces"] == []
+
+
+def test_changed_file_keeps_record_until_reingested(data_dir):
+    watcher = make_watcher(str(data_dir / "documents"))
+    path = write(data_dir / "documents" / "Finance_Bill.pdf", b"%PDF-1 old")
+    store = get_document_store()
+    old_id = store.create("Finance Bill", DocumentCategory("bill"), path, content_hash=hash_file(path))
+    watcher._known[path] = (0, 0)
+    
+    write(path, b"%PDF-1 revised")
+    settle(watcher)
+    
+    # The old record survives until the replacement is stored
+    assert store.get(old_id) is not None
+    jobs = list(get_ingestion_queue().jobs.values())
+    assert len(jobs) == 1
+    assert jobs[0]["content_hash"] == hash_file(path)
+    assert jobs[0]["replaces"] == [old_id]
+
+
+def test_rewrite_with_same_content_keeps_record(data_dir):
+    watcher = make_watcher(str(data_dir / "documents"))
+    path = write(data_dir / "documents" / "Finance_Bill.pdf", b"%PDF-1 same")
+    store = get_document_store()
+    doc_id = store.create("Finance Bill", DocumentCategory("bill"), path, content_hash=hash_file(path))
+    watcher._known[path] = (0, 0)
+    
+    # Touched (e.g. the app's own upload replacing the file) but not changed
+    write(path, b"%PDF-1 same")
+    settle(watcher)
+    
+    assert store.get(doc_id) is not None
+    assert get_ingestion_queue().jobs == {}
+
+
+def test_deleted_file_removes_records(data_dir):
+    watcher = make_watcher(str(data_dir / "documents"))
+    path = write(data_dir / "documents" / "Finance_Bill.pdf", b"%PDF-1")
+    store = get_document_store()
+    doc_id = store.create("Finance Bill", DocumentCategory("bill"), path, content_hash=hash_file(path))
+    watcher._known[path] = (0, 0)
+    
+    os.remove(path)
+    asyncio.run(watcher.scan_once())
+    
+    assert store.get(doc_id) is None
@@ -0,0 +1,129 @@
+"""Tests for the document downloader against an in-process HTTP stand-in"""
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+import download_documents
+from download_documents import Manifest, download_document, fetch
+
+
+DOCUMENT = bytes(range(256)) * 64  # 16 KB
+ETAG = '"v1"'
+
+
+class Source:
+    """Serves DOCUMENT with ETag, conditional GET and Range/If-Range support"""
+    
+    def __init__(self, body: bytes = DOCUMENT, etag: str = ETAG, status: int = 200):
+        self.body = body
+        self.etag = etag
+        self.status = status
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        
+        range_header = request.headers.get("range")
+        if range_header and request.headers.get("if-range") == self.etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            return httpx.Response(
+                206, content=self.body[start:],
+                headers={"ETag": self.etag, "Content-Range": f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"}
+            )
+        return httpx.Response(200, content=self.body, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def docs_dir(data_dir, monkeypatch):
+    path = data_dir / "pdfs"
+    path.mkdir()
+    monkeypatch.setattr(download_documents, "DOCS_DIR", path)
+    return path
+
+
+DOC = {"name": "Test Bill", "filename": "test-bill.pdf", "sources": ["https://example.gov.in/bill.pdf"]}
+
+
+def run_fetch(source: Source, manifest: Manifest, force: bool = False) -> str:
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(source)) as client:
+            return await fetch(client, DOC, DOC["sources"][0], manifest, force)
+    return asyncio.run(go())
+
+
+def test_download_writes_file_and_manifest(docs_dir):
+    manifest = Manifest(docs_dir / "manifest.json")
+    
+    assert run_fetch(Source(), manifest) == "downloaded"
+    
+    assert (docs_dir / "test-bill.pdf").read_bytes() == DOCUMENT
+    entry = Manifest(docs_dir / "manifest.json").get("test-bill.pdf")
+    assert entry["sha256"] == hashlib.sha256(DOCUMENT).hexdigest()
+    assert entry["etag"] == ETAG
+    assert entry["partial"] is None
+
+
+def test_unchanged_file_is_skipped_with_conditional_get(docs_dir):
+    manifest = Manifest(docs_dir / "manifest.json")
+    run_fetch(Source(), manifest)
+    
+    source = Source()
+    assert run_fetch(source, manifest) == "unchanged"
+    assert source.requests[0].headers["if-none-match"] == ETAG
+
+
+def test_partial_download_resumes_with_range(docs_dir):
+    manifest = Manifest(docs_dir / "manifest.json")
+    (docs_dir / "test-bill.pdf.part").write_bytes(DOCUMENT[:5000])
+    manifest.update("test-bill.pdf", partial={"url": DOC["sources"][0], "etag": ETAG, "last_modified": None})
+    
+    source = Source()
+    assert run_fetch(source, manifest) == "downloaded"
+    
+    assert source.requests[0].headers["range"] == "bytes=5000-"
+    assert (docs_dir / "test-bill.pdf").read_bytes() == DOCUMENT
+    assert manifest.get("test-bill.pdf")["sha256"] == hashlib.sha256(DOCUMENT).hexdigest()
+
+
+def test_changed_source_restarts_partial_download(docs_dir):
+    manifest = Manifest(docs_dir / "manifest.json")
+    (docs_dir / "test-bill.pdf.part").write_bytes(b"old version" * 100)
+    manifest.update("test-bill.pdf", partial={"url": DOC["sources"][0], "etag": '"v0"', "last_modified": None})
+    
+    # If-Range no longer matches, so the server sends the whole new file
+    assert run_fetch(Source(etag='"v2"'), manifest) == "downloaded"
+    
+    assert (docs_dir / "test-bill.pdf").read_bytes() == DOCUMENT
+    assert manifest.get("test-bill.pdf")["etag"] == '"v2"'
+
+
+def test_error_page_is_not_kept(docs_dir):
+    manifest = Manifest(docs_dir / "manifest.json")
+    
+    with pytest.raises(ValueError):
+        run_fetch(Source(body=b"<html>Not found</html>"), manifest)
+    
+    assert not (docs_dir / "test-bill.pdf").exists()
+
+
+def test_next_source_is_tried_after_a_failure(docs_dir):
+    doc = {**DOC, "sources": ["https://down.example/bill.pdf", "https://mirror.example/bill.pdf"]}
+    failing, working = Source(status=503), Source()
+    
+    def route(request):
+        return (failing if request.url.host == "down.example" else working)(request)
+    
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(route)) as client:
+            return await download_document(client, doc, Manifest(docs_dir / "manifest.json"), asyncio.Semaphore(1))
+    
+    assert asyncio.run(go())
+    assert len(failing.requests) == 1 and len(working.requests) == 1
+    assert (docs_dir / "test-bill.pdf").read_bytes() == DOCUMENT
@@ -0,0 +1,148 @@
+"""Tests for main-content extraction from saved pages"""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from config import settings
+from services.html_extractor import ArticleParser, PlainTextParser
+from services.url_extractor import URLContentExtractor
+
+
+PAGES_DIR = Path(__file__).parent / "fixtures" / "pages"
+
+# Boilerplate in the fixtures that must not reach claim extraction
+JUNK_MARKERS = ["Advertisement", "All rights reserved", "Subscribe", "Related", "Share", "Report", "Sitemap", "Visitor counter"]
+
+
+def extract_parser(page: str, plain_text: bool):
+    """Feed a page in small chunks, like a streamed response"""
+    parser = PlainTextParser() if plain_text else ArticleParser()
+    for start in range(0, len(page), 4096):
+        parser.feed(page[start:start + 4096])
+    return parser.result()
+
+
+def read_page(name: str) -> str:
+    return (PAGES_DIR / name).read_text(encoding="utf-8")
+
+
+def fetch_article(handler, url="https://pib.gov.in/release.aspx"):
+    async def go():
+        extractor = URLContentExtractor()
+        await extractor.client.aclose()
+        extractor.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await extractor._extract_article(url)
+        finally:
+            await extractor.aclose()
+    
+    return asyncio.run(go())
+
+
+@pytest.mark.parametrize("name", ["news_article.html", "press_release.html", "hindi_article.html", "live_blog.html", "webforms_release.html"])
+def test_article_body_without_boilerplate(name):
+    result = extract_parser(read_page(name), plain_text=False)
+    
+    assert result["title"]
+    assert len(result["content"]) > 500
+    assert not [marker for marker in JUNK_MARKERS if marker in result["content"]]
+
+
+def test_news_article_keeps_every_paragraph_and_og_fields():
+    result = extract_parser(read_page("news_article.html"), plain_text=False)
+    
+    assert result["title"] == "Income-tax Bill 2025 introduced in Lok Sabha: what changes"
+    assert result["description"].startswith("The new Bill cuts sections from 819 to 536")
+    assert "819 to 536" in result["content"]
+    assert "fresh litigation" in result["content"]
+    assert "Reader1" not in result["content"]
+
+
+def test_table_cells_stay_separate():
+    result = extract_parser(read_page("press_release.html"), plain_text=False)
+    assert "Total income\n\nRate of tax" in result["content"]
+
+
+def test_plain_text_page():
+    result = extract_parser(read_page("notice.txt"), plain_text=True)
+    
+    assert result["title"] == "Notification No. 12/2025 - Income Tax"
+    assert "section 295 of the Income-tax Act, 1961" in result["content"]
+
+
+def test_text_plain_response_is_not_empty():
+    body = read_page("notice.txt").encode()
+    
+    def handler(request):
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/plain; charset=utf-8"})
+    
+    result = fetch_article(handler, "https://incometaxindia.gov.in/notice.txt")
+    
+    assert result["success"]
+    assert "Central Board of Direct Taxes" in result["content"]
+
+
+def test_page_wrapped_in_a_webforms_form():
+    result = extract_parser(read_page("webforms_release.html"), plain_text=False)
+    
+    assert "Rs 16,300 crore" in result["content"]
+    assert "enhance trade with resource-rich countries" in result["content"]
+    assert "Search the site" not in result["content"]
+    assert not [marker for marker in JUNK_MARKERS if marker in result["content"]]
+
+
+def test_huge_page_is_read_only_up_to_the_byte_budget(monkeypatch):
+    monkeypatch.setattr(settings, "url_fetch_max_bytes", 64 * 1024)
+    sent = 0
+    
+    async def body():
+        nonlocal sent
+        yield b"<html><body><article><p>The Cabinet approved Rs 16,300 crore for critical minerals.</p>"
+        for _ in range(10000):  # About 160MB if read to the end
+            sent += 1
+            yield b"<p>" + b"x" * 16 * 1024 + b"</p>"
+    
+    def handler(request):
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/html"})
+    
+    result = fetch_article(handler)
+    
+    assert result["success"]
+    assert "Rs 16,300 crore" in result["content"]
+    assert sent <= 5
+
+
+def test_non_html_response_is_rejected_before_the_body_is_read():
+    read = []
+    
+    async def body():
+        read.append(True)
+        yield b"%PDF-1.7"
+    
+    def handler(request):
+        return httpx.Response(200, content=body(), headers={"Content-Type": "application/pdf"})
+    
+    result = fetch_article(handler, "https://egazette.gov.in/notification.pdf")
+    
+    assert not result["success"]
+    assert "Unsupported content type" in result["error"]
+    assert read == []
+
+
+def test_multibyte_characters_split_across_chunks_survive():
+    html = "<html><body><article><p>आयकर विधेयक लोकसभा में प्रस्तुत किया गया और समिति को भेजा गया।</p></article></body></html>".encode()
+    
+    async def body():
+        for i in range(0, len(html), 5):  # Splits most Devanagari characters
+            yield html[i:i + 5]
+    
+    def handler(request):
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/html; charset=utf-8"})
+    
+    result = fetch_article(handler)
+    
+    assert "आयकर विधेयक लोकसभा में प्रस्तुत" in result["content"]
+    assert "\ufffd" not in result["content"]
@@ -0,0 +1,61 @@
+"""Tests for the bulk ingestion script"""
+
+import os
+from argparse import Namespace
+
+from api.schemas import DocumentCategory
+from config import settings
+from ingest_documents import document_path, stored_from_file
+from services.document_store import get_document_store
+from services.extraction_cache import hash_file
+
+
+def test_seeded_document_without_hash_is_skipped_and_backfilled(data_dir):
+    source = data_dir / "govt-portal" / "Finance Bill.pdf"
+    source.parent.mkdir()
+    source.write_bytes(b"%PDF-1 finance bill")
+    content_hash = hash_file(str(source))
+    args = Namespace(no_copy=False)
+    
+    # Seeded before content hashes existed: same file already in documents_dir
+    target = os.path.join(settings.documents_dir, "Finance_Bill.pdf")
+    os.makedirs(settings.documents_dir, exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(source.read_bytes())
+    store = get_document_store()
+    doc_id = store.create("Finance Bill", DocumentCategory("bill"), target)
+    
+    assert stored_from_file(store, source, content_hash, args)
+    assert store.find_by_hash(content_hash)["id"] == doc_id
+
+
+def test_same_name_with_different_content_is_not_skipped(data_dir):
+    source = data_dir / "govt-portal" / "Finance Bill.pdf"
+    source.parent.mkdir()
+    source.write_bytes(b"%PDF-1 revised finance bill")
+    args = Namespace(no_copy=False)
+    
+    target = os.path.join(settings.documents_dir, "Finance_Bill.pdf")
+    os.makedirs(settings.documents_dir, exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(b"%PDF-1 old finance bill")
+    store = get_document_store()
+    store.create("Finance Bill", DocumentCategory("bill"), target)
+    
+    assert not stored_from_file(store, source, hash_file(str(source)), args)
+
+
+def test_same_name_with_different_content_gets_its_own_path(data_dir):
+    args = Namespace(no_copy=False)
+    first = data_dir / "a" / "Finance Bill.pdf"
+    second = data_dir / "b" / "Finance Bill.pdf"
+    for path, data in ((first, b"%PDF-1 2024"), (second, b"%PDF-1 2025")):
+        path.parent.mkdir()
+        path.write_bytes(data)
+    
+    first_path = document_path(first, hash_file(str(first)), args)
+    second_path = document_path(second, hash_file(str(second)), args)
+    
+    assert first_path != second_path
+    assert os.path.dirname(first_path) == settings.documents_dir
+    assert os.path.basename(first_path).endswith("_Finance_Bill.pdf")
@@ -0,0 +1,79 @@
+"""Tests for the ingestion pipeline stages"""
+
+import asyncio
+
+import services.ingestion as ingestion
+from services.document_store import get_document_store
+from services.ingestion import IngestionPipeline
+
+
+class FakeLLM:
+    async def generate_summary(self, text):
+        return f"Summary of {text}"
+    
+    async def extract_key_points(self, text):
+        return ["Point one"]
+    
+    async def generate_timeline(self, text):
+        return None
+
+
+def make_pipeline(monkeypatch, **limits) -> IngestionPipeline:
+    pipeline = IngestionPipeline(**limits)
+    
+    async def extract(file_path, content_hash):
+        return {"text": f"Text of {file_path}", "page_count": 1, "pages": []}
+    
+    monkeypatch.setattr(pipeline, "_extract", extract)
+    monkeypatch.setattr(pipeline, "_get_llm", lambda: FakeLLM())
+    return pipeline
+
+
+def test_document_is_pretranslated_into_every_language(monkeypatch, fake_translator):
+    pipeline = make_pipeline(monkeypatch)
+    
+    result = asyncio.run(pipeline.run(file_path="/tmp/a.pdf", title="Budget"))
+    
+    doc = get_document_store().get(result["document_id"])
+    assert len(fake_translator) == 12  # One batch call per non-English language
+    assert set(doc["translations"]) == {target for target, _ in fake_translator}
+    assert doc["translations"]["hi"]["title"] == "[hi] Budget"
+    assert doc["translations"]["ta"]["key_points"] == ["[ta] Point one"]
+
+
+def test_pretranslation_does_not_hold_an_llm_slot(monkeypatch):
+    llm_limit = asyncio.Semaphore(1)
+    pipeline = make_pipeline(monkeypatch, llm_limit=llm_limit, translate_limit=asyncio.Semaphore(1))
+    
+    class SlowTranslator:
+        def __init__(self):
+            self.started = asyncio.Event()
+            self.release = asyncio.Event()
+        
+        async def pretranslate_document(self, fields):
+            self.started.set()
+            await self.release.wait()
+            return {}
+    
+    async def run():
+        translator = SlowTranslator()
+        monkeypatch.setattr(ingestion, "get_translator_service", lambda: translator)
+        first = asyncio.create_task(pipeline.run(file_path="/tmp/a.pdf", title="A"))
+        await translator.started.wait()
+        
+        # A second document's LLM stages finish while the first is translating
+        stages = []
+        second = asyncio.create_task(pipeline.run(
+            file_path="/tmp/b.pdf", title="B", on_stage=lambda stage, timings: stages.append(stage)
+        ))
+        for _ in range(100):
+            await asyncio.sleep(0)
+            if "translate" in stages:
+                break
+        reached_translate = "translate" in stages
+        
+        translator.release.set()
+        await asyncio.gather(first, second)
+        return reached_translate
+    
+    assert asyncio.run(run())
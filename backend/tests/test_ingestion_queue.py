@@ -0,0 +1,86 @@
+"""Tests for the persistent ingestion queue"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+from services.ingestion import IngestionQueue
+
+
+def make_job(queue: IngestionQueue, status: str, age_days: float = 0, content_hash=None):
+    job = queue.submit(file_path="/tmp/doc.pdf", title="Doc", content_hash=content_hash)
+    stamp = (datetime.utcnow() - timedelta(days=age_days)).isoformat()
+    job.update(status=status, created_at=stamp, updated_at=stamp)
+    return job
+
+
+def start_and_stop(queue: IngestionQueue):
+    async def run():
+        await queue.start()
+        await queue.stop()
+    asyncio.run(run())
+
+
+def test_resumed_job_for_stored_content_is_completed():
+    doc_id = get_document_store().create("Doc", DocumentCategory("bill"), "/tmp/doc.pdf", content_hash="abc")
+    queue = IngestionQueue(num_workers=1)
+    job = make_job(queue, "running", content_hash="abc")
+    
+    start_and_stop(queue)
+    
+    assert job["status"] == "completed"
+    assert job["document_id"] == doc_id
+
+
+def test_resumed_job_without_document_is_requeued():
+    queue = IngestionQueue(num_workers=1)
+    job = make_job(queue, "running", content_hash="abc")
+    queue._worker = lambda: asyncio.sleep(0)  # Keep the job in the queue
+    
+    start_and_stop(queue)
+    
+    assert job["status"] == "queued"
+
+
+def test_finished_jobs_past_retention_are_pruned():
+    queue = IngestionQueue(num_workers=1)
+    old_done = make_job(queue, "completed", age_days=30)
+    old_failed = make_job(queue, "failed", age_days=30)
+    recent = make_job(queue, "completed", age_days=1)
+    queue._save()
+    
+    start_and_stop(queue)
+    
+    assert set(queue.jobs) == {recent["id"]}
+    assert set(IngestionQueue().jobs) == {recent["id"]}
+    assert old_done["id"] not in queue.jobs and old_failed["id"] not in queue.jobs
+
+
+def test_only_one_process_runs_jobs_and_others_hand_over():
+    runner = IngestionQueue(num_workers=1)
+    other = IngestionQueue(num_workers=1)  # Another server worker process
+    ran = []
+    
+    async def fake_run(**job):
+        ran.append(job["title"])
+        return {"document_id": "doc-1"}
+    
+    runner.pipeline.run = fake_run
+    
+    async def run():
+        assert await runner.start()
+        assert not await other.start()
+        job = other.submit(file_path="/tmp/other.pdf", title="Other", content_hash="def")
+        
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if other.get(job["id"])["status"] == "completed":
+                break
+        await runner.stop()
+        return other.get(job["id"])
+    
+    job = asyncio.run(run())
+    
+    assert ran == ["Other"]
+    assert job["status"] == "completed" and job["document_id"] == "doc-1"
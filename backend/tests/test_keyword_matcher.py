@@ -0,0 +1,59 @@
+"""Tests for the weighted keyword matcher and the government-content check"""
+
+from services.keyword_matcher import KeywordMatcher, normalize
+from services.url_extractor import URLContentExtractor
+
+
+def found(matcher: KeywordMatcher, text: str):
+    return [keyword for keyword, _ in matcher.find(text)]
+
+
+def test_whole_words_only():
+    matcher = KeywordMatcher({"rate": 1, "act": 1, "tax": 1, "ec": 1})
+    
+    assert found(matcher, "The corporate impact of the syntax secretary") == []
+    assert found(matcher, "The Act sets the tax rate; the EC agreed.") == ["act", "tax", "rate", "ec"]
+
+
+def test_english_plurals_and_multi_word_keywords():
+    matcher = KeywordMatcher({"bill": 1, "income tax": 1, "ministry": 1, "finance ministry": 1})
+    
+    assert found(matcher, "Two bills on income\n  tax") == ["bill", "income tax"]
+    assert found(matcher, "the Finance Ministry said") == ["finance ministry", "ministry"]
+
+
+def test_devanagari_suffixes_and_boundaries():
+    matcher = KeywordMatcher({"सरकार": 2, "योजना": 1, "नीति": 1})
+    
+    assert found(matcher, "सरकारी योजनाओं की घोषणा") == ["सरकार", "योजना"]
+    assert found(matcher, "सरकारों ने कहा") == ["सरकार"]
+    # A keyword inside a longer Devanagari word is not a match
+    assert found(matcher, "राजनीतिक दल") == []
+
+
+def test_nfkc_and_casefold():
+    matcher = KeywordMatcher({"gst": 1, "ministry": 1})
+    
+    assert normalize("ＧＳＴ") == "gst"
+    assert found(matcher, "ＧＳＴ council and MINISTRY") == ["gst", "ministry"]
+    assert found(matcher, "MINIﬆRY") == ["ministry"]  # The "st" ligature folds to two letters
+
+
+def test_score_orders_by_weight():
+    matcher = KeywordMatcher({"health": 0.5, "government": 2, "scheme": 1})
+    
+    score, keywords = matcher.score("health scheme by the government")
+    
+    assert score == 3.5
+    assert keywords == ["government", "scheme", "health"]
+
+
+def test_govt_threshold_is_weighted():
+    extractor = URLContentExtractor()
+    
+    # Two generic 0.5 terms used to qualify as "two keywords"; now they don't
+    assert extractor._check_govt_related("Tips on health and education for parents")[0] is False
+    assert extractor._check_govt_related("A new policy and a new scheme for farmers")[0] is True
+    assert extractor._check_govt_related("The Parliament met today")[0] is True
+    assert extractor._check_govt_related("सरकारी अस्पताल")[0] is True
+    assert extractor._check_govt_related("Corporate rates and the impact on syntax")[0] is False
@@ -0,0 +1,130 @@
+"""Tests for latency-aware routing and hedging across LLM providers"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import services.llm_router as llm_router
+from api.routes import router
+from config import settings
+from services.azure_openai import AzureOpenAIClient
+from services.llm_router import LLMRouter
+
+
+class FakeProvider:
+    """Provider client whose methods answer after a fixed delay"""
+    
+    def __init__(self, name: str, delays):
+        self.name = name
+        self.delays = delays
+        self.cancelled = 0
+    
+    async def _answer(self, method: str):
+        try:
+            await asyncio.sleep(self.delays[method])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"{self.name}:{method}"
+    
+    async def generate_summary(self, document_text):
+        return await self._answer("generate_summary")
+    
+    async def answer_question(self, question, context_chunks, document_title):
+        return await self._answer("answer_question")
+    
+    async def _generate(self, prompt):
+        return await self._answer("_generate")
+
+
+def test_methods_are_ranked_on_their_own_latency(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedging", False)
+    monkeypatch.setattr(settings, "llm_min_samples", 2)
+    # "a" is quick to answer questions but slow to summarize; "b" the reverse
+    a = FakeProvider("a", {"generate_summary": 0.08, "answer_question": 0.005})
+    b = FakeProvider("b", {"generate_summary": 0.02, "answer_question": 0.03})
+    llm = LLMRouter([("a", a), ("b", b)])
+    
+    async def warm_up():
+        for provider in (a, b):
+            for _ in range(2):
+                await llm._timed((provider.name, provider), "generate_summary", ("text",))
+                await llm._timed((provider.name, provider), "answer_question", ("q", [], "Bill"))
+        return await llm.generate_summary("text"), await llm.answer_question("q", [], "Bill")
+    
+    summary, answer = asyncio.run(warm_up())
+    
+    assert summary == "b:generate_summary"
+    assert answer == "a:answer_question"
+    assert [name for name, _ in llm.ranked("generate_summary")] == ["b", "a"]
+    assert [name for name, _ in llm.ranked("answer_question")] == ["a", "b"]
+
+
+def test_provider_losing_hedges_is_demoted_without_latency_samples(monkeypatch):
+    monkeypatch.setattr(settings, "llm_min_samples", 2)
+    a = FakeProvider("a", {"answer_question": 0.005})
+    b = FakeProvider("b", {"answer_question": 0.02})
+    llm = LLMRouter([("a", a), ("b", b)])
+    
+    async def run():
+        for provider in (a, b):
+            for _ in range(2):
+                await llm._timed((provider.name, provider), "answer_question", ("q", [], "Bill"))
+        # "a" degrades: every call is now hedged to "b", which wins
+        a.delays["answer_question"] = 1.0
+        return [await llm.answer_question("q", [], "Bill") for _ in range(4)]
+    
+    answers = asyncio.run(run())
+    
+    stats = llm.stats[("a", "answer_question")]
+    assert answers[0] == "b:answer_question"
+    assert a.cancelled >= 1
+    assert stats.error_rate > 0  # Lost races count as timeouts
+    assert stats.percentile(0.95) < 0.5  # ... and not as truncated latencies
+    assert llm.ranked("answer_question")[0][0] == "b"
+
+
+def test_losing_azure_openai_request_is_aborted(monkeypatch):
+    monkeypatch.setattr(settings, "llm_min_samples", 1)
+    monkeypatch.setattr(settings, "azure_openai_endpoint", "https://example.openai.azure.com")
+    monkeypatch.setattr(settings, "azure_openai_key", "test-key")
+    aborted = asyncio.Event()
+    
+    async def handler(request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            aborted.set()
+            raise
+        return httpx.Response(500)
+    
+    async def run():
+        azure = AzureOpenAIClient()
+        azure.client = azure.client.with_options(
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), max_retries=0
+        )
+        fallback = FakeProvider("b", {"_generate": 0.5})
+        llm = LLMRouter([("azure_openai", azure), ("b", fallback)])
+        llm.stats[("azure_openai", "_generate")].record(0.01, ok=True)
+        llm.stats[("b", "_generate")].record(0.5, ok=True)
+        
+        answer = await llm._generate("prompt")
+        await asyncio.wait_for(aborted.wait(), timeout=1)
+        return answer
+    
+    assert asyncio.run(run()) == "b:_generate"
+
+
+def test_health_reports_router_stats(monkeypatch):
+    llm = LLMRouter([("a", FakeProvider("a", {"answer_question": 0.0}))])
+    asyncio.run(llm.answer_question("q", [], "Bill"))
+    monkeypatch.setattr(llm_router, "_llm_router", llm)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    
+    health = TestClient(app).get("/api/health").json()
+    
+    assert health["llm"]["a"]["answer_question"]["samples"] == 1
+    assert health["llm"]["a"]["answer_question"]["error_rate"] == 0.0
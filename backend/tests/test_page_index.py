@@ -0,0 +1,69 @@
+"""Tests for mapping full-text offsets and passages to PDF pages"""
+
+import asyncio
+from types import SimpleNamespace
+
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+from services.page_index import build_page_offsets, find_passages, find_quote_page, page_for_offset
+from services.rag_engine import RAGEngine
+
+
+PAGES = [
+    "The Finance Bill amends the Income-tax Act for the assessment year.",
+    "Standard deduction for salaried taxpayers rises to seventy five thousand rupees.",
+    "Section 115BAC sets the new tax regime slabs and the rebate under section 87A.",
+]
+FULL_TEXT = "\n\n".join(PAGES)
+
+
+def offsets():
+    return build_page_offsets(FULL_TEXT, [{"page_num": n, "text": text} for n, text in enumerate(PAGES, 1)])
+
+
+def test_page_for_offset():
+    page_offsets = offsets()
+    assert page_for_offset(page_offsets, 0) == 1
+    assert page_for_offset(page_offsets, FULL_TEXT.index("Standard")) == 2
+    assert page_for_offset(page_offsets, len(FULL_TEXT) - 1) == 3
+    assert page_for_offset(page_offsets, -1) is None
+    assert page_for_offset([], 5) is None
+
+
+def test_find_quote_page_ignores_whitespace_differences():
+    quote = "Standard deduction for   salaried\ntaxpayers rises"
+    assert find_quote_page(FULL_TEXT, offsets(), quote) == 2
+
+
+def test_find_passages_returns_pages():
+    passages = find_passages(FULL_TEXT, offsets(), "What is the standard deduction for salaried people?")
+    assert passages
+    assert passages[0]["page"] == 2
+    assert passages[0]["score"] >= 2
+
+
+def test_answer_cites_page_of_matching_passage(monkeypatch):
+    filler = "x " * 500
+    pages = [filler, "Standard deduction for salaried taxpayers is seventy five thousand rupees. " + filler]
+    full_text = "\n\n".join(pages)
+    store = get_document_store()
+    doc_id = store.create(
+        "Finance Bill", DocumentCategory("bill"), "/tmp/finance.pdf",
+        summary="Budget changes", full_text=full_text,
+        page_offsets=build_page_offsets(full_text, [{"page_num": n, "text": t} for n, t in enumerate(pages, 1)])
+    )
+    
+    async def answer_question(question, context_chunks, document_title):
+        assert "(page 2) Standard deduction" in context_chunks[0]
+        return {"answer": "Rs 75,000", "confidence": 0.85}
+    
+    engine = RAGEngine.__new__(RAGEngine)
+    engine.llm_client = SimpleNamespace(
+        answer_question=answer_question, answered_by=lambda: "test", provider_names=["test"]
+    )
+    engine.translator = SimpleNamespace(is_configured=lambda: False)
+    monkeypatch.setattr("services.rag_engine.get_table_index", lambda: SimpleNamespace(search=lambda *a, **k: []))
+    
+    result = asyncio.run(engine.ask("What is the standard deduction for salaried taxpayers?", doc_id))
+    
+    assert result["citations"][0]["page"] == 2
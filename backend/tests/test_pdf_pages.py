@@ -0,0 +1,103 @@
+"""Tests for PDF page slices and thumbnails"""
+
+import asyncio
+import io
+import os
+import struct
+import zlib
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+import services.pdf_pages as pdf_pages
+from services.pdf_pages import _encode_png, get_pdf_page_service
+
+
+def make_pdf(path, pages: int = 3) -> str:
+    writer = PdfWriter()
+    for i in range(pages):
+        writer.add_blank_page(width=200 + 10 * i, height=300)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def decode_png(png: bytes):
+    """(width, height, color type, rows of pixel bytes) of an unfiltered 8-bit PNG"""
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks = {}
+    offset = 8
+    while offset < len(png):
+        length, kind = struct.unpack(">I4s", png[offset:offset + 8])
+        data = png[offset + 8:offset + 8 + length]
+        (crc,) = struct.unpack(">I", png[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        offset += 12 + length
+    
+    width, height, depth, color_type, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    assert depth == 8 and b"IEND" in chunks
+    channels = {0: 1, 2: 3, 6: 4}[color_type]
+    raw = zlib.decompress(chunks[b"IDAT"])
+    row_bytes = 1 + width * channels
+    rows = [raw[row * row_bytes:(row + 1) * row_bytes] for row in range(height)]
+    assert all(row[0] == 0 for row in rows)  # Filter type none
+    return width, height, color_type, [row[1:] for row in rows]
+
+
+def test_encode_png_skips_stride_padding():
+    # 2x2 RGB with 2 padding bytes per row
+    buffer = bytearray(b"\x01\x02\x03\x04\x05\x06\xff\xff" b"\x07\x08\x09\x0a\x0b\x0c\xff\xff")
+    
+    width, height, color_type, rows = decode_png(_encode_png(buffer, 2, 2, 8, 3))
+    
+    assert (width, height, color_type) == (2, 2, 2)
+    assert rows == [bytes(range(1, 7)), bytes(range(7, 13))]
+
+
+def test_page_slice_holds_the_requested_pages(tmp_path):
+    path = make_pdf(tmp_path / "bill.pdf")
+    service = get_pdf_page_service()
+    
+    data = asyncio.run(service.page_slice(path, 2, 9))
+    
+    pages = PdfReader(io.BytesIO(data)).pages
+    assert [float(page.mediabox.width) for page in pages] == [210, 220]
+    with pytest.raises(ValueError):
+        asyncio.run(service.page_slice(path, 4, 4))
+
+
+def test_thumbnail_is_written_atomically_under_a_unique_temp_name(tmp_path, monkeypatch):
+    path = make_pdf(tmp_path / "bill.pdf")
+    monkeypatch.setattr(pdf_pages, "pdfium", object())
+    monkeypatch.setattr(pdf_pages, "_render_thumbnail", lambda file_path, page, width: b"png")
+    temp_paths = []
+    real_replace = os.replace
+    
+    def replace(source, target):
+        temp_paths.append(source)
+        real_replace(source, target)
+    
+    monkeypatch.setattr(pdf_pages.os, "replace", replace)
+    service = get_pdf_page_service()
+    
+    async def render_twice():
+        return await asyncio.gather(service.thumbnail(path, 1, 60), service.thumbnail(path, 1, 60))
+    
+    first, second = asyncio.run(render_twice())
+    
+    assert first == second and open(first, "rb").read() == b"png"
+    assert len(set(temp_paths)) == len(temp_paths) == 2
+    assert os.listdir(os.path.dirname(first)) == ["1-60.png"]
+
+
+def test_thumbnail_renders_first_page_as_png(tmp_path):
+    pytest.importorskip("pypdfium2")
+    path = make_pdf(tmp_path / "bill.pdf")
+    
+    thumbnail = asyncio.run(get_pdf_page_service().thumbnail(path, 1, 60))
+    
+    with open(thumbnail, "rb") as f:
+        width, height, _, rows = decode_png(f.read())
+    assert width == 60 and height == 90  # 200x300 page
+    assert all(set(row) == {255} for row in rows)  # Blank page renders white
@@ -0,0 +1,59 @@
+"""Tests for ETag handling in the compression middleware"""
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.responses import CompressionMiddleware, ORJSONResponse, cache_headers, make_etag, not_modified
+
+
+ETAG = make_etag("document", 1)
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    
+    @app.get("/big")
+    async def big(request: Request):
+        cached = not_modified(request, ETAG)
+        if cached:
+            return cached
+        return ORJSONResponse({"text": "x" * 5000}, headers=cache_headers(ETAG))
+    
+    @app.get("/small")
+    async def small(request: Request):
+        cached = not_modified(request, ETAG)
+        if cached:
+            return cached
+        return ORJSONResponse({"ok": True}, headers=cache_headers(ETAG))
+    
+    return TestClient(app)
+
+
+def test_304_repeats_the_compressed_etag():
+    client = build_client()
+    
+    first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == f'{ETAG[:-1]}-gzip"'
+    
+    revalidated = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert "Accept-Encoding" in revalidated.headers["vary"]
+    
+    weak = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": f"W/{first.headers['etag']}"})
+    assert weak.status_code == 304
+    assert weak.headers["etag"] == first.headers["etag"]
+
+
+def test_304_keeps_the_plain_etag_for_uncompressed_copies():
+    client = build_client()
+    
+    first = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in first.headers
+    assert first.headers["etag"] == ETAG
+    
+    revalidated = client.get("/small", headers={"Accept-Encoding": "gzip", "If-None-Match": ETAG})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == ETAG
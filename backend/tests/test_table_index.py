@@ -0,0 +1,104 @@
+"""Tests for table range parsing and numeric table search"""
+
+import math
+
+from services.table_index import get_table_index, parse_range
+
+
+SLAB_TABLE = {
+    "row_count": 7,
+    "column_count": 2,
+    "page_num": 12,
+    "cells": [
+        {"row": row, "column": column, "content": content, "kind": "columnHeader" if row == 0 else None}
+        for row, cells in enumerate([
+            ["Total income (₹)", "Rate of tax"],
+            ["Up to 4,00,000", "Nil"],
+            ["4,00,001 to 8,00,000", "5%"],
+            ["8,00,001 to 12,00,000", "10%"],
+            ["12,00,001 to 16,00,000", "15%"],
+            ["16,00,001 to 20,00,000", "20%"],
+            ["Above 24,00,000", "30%"],
+        ])
+        for column, content in enumerate(cells)
+    ],
+}
+
+
+def search(query):
+    index = get_table_index()
+    index.save("finance-bill", [SLAB_TABLE])
+    return index.search("finance-bill", query)
+
+
+def test_parse_range_cells():
+    assert parse_range("12,00,001 to 16,00,000") == (1200001, 1600000, False)
+    assert parse_range("Above 24 lakh") == (2400000, math.inf, False)
+    assert parse_range("Up to 4 lakh") == (0, 400000, False)
+    assert parse_range("500") == (500, 500, False)
+    assert parse_range("30%") == (30, 30, True)
+    assert parse_range("Nil") is None
+
+
+def test_parse_range_skips_years_and_references():
+    assert parse_range("Finance Bill 2025") is None
+    assert parse_range("Assessment year 2025-26") is None
+    assert parse_range("section 115") is None
+    assert parse_range("rule 3 of Schedule 2") is None
+
+
+def test_parse_range_applies_bound_to_its_number():
+    assert parse_range("Finance Bill 2025 tax above 12 lakh", require_marker=True) == (1200000, math.inf, False)
+    assert parse_range("income of 12 lakh and above", require_marker=True) == (1200000, math.inf, False)
+    assert parse_range("between 12 and 16 lakh", require_marker=True) == (1200000, 1600000, False)
+
+
+def test_query_needs_an_amount_marker():
+    assert parse_range("3 children over 18", require_marker=True) is None
+    assert parse_range("₹ 5,000 fine", require_marker=True) == (5000, 5000, False)
+    assert parse_range("Rs. 750", require_marker=True) == (750, 750, False)
+
+
+def test_year_in_question_does_not_break_slab_lookup():
+    rows = search("Finance Bill 2025 tax above 12 lakh")
+    assert rows[0]["row"] == ["12,00,001 to 16,00,000", "15%"]
+
+
+def test_amount_inside_slab_ranks_first():
+    rows = search("tax on income of 10 lakh")
+    assert rows[0]["row"] == ["8,00,001 to 12,00,000", "10%"]
+
+
+def test_section_number_does_not_match_slabs():
+    rows = search("section 115")
+    assert all(row["row"] != ["Up to 4,00,000", "Nil"] for row in rows)
+
+
+def test_percentage_matches_rate_column():
+    rows = search("which slab has 20% rate")
+    assert rows[0]["row"] == ["16,00,001 to 20,00,000", "20%"]
+
+
+def test_query_words_match_whole_words_only():
+    index = get_table_index()
+    index.save("company-tax", [{
+        "row_count": 4,
+        "column_count": 2,
+        "page_num": 4,
+        "cells": [
+            {"row": row, "column": column, "content": content, "kind": "columnHeader" if row == 0 else None}
+            for row, cells in enumerate([
+                ["Assessee", "Tax"],
+                ["Corporate body", "25%"],
+                ["Individual, concessional rate", "10%"],
+                ["Turnover above 1 करोड़", "30%"],
+            ])
+            for column, content in enumerate(cells)
+        ],
+    }])
+    
+    rows = index.search("company-tax", "concessional rate")
+    hindi = index.search("company-tax", "कर")  # Not "करोड़"
+    
+    assert [row["row"] for row in rows] == [["Individual, concessional rate", "10%"]]
+    assert hindi == []
@@ -0,0 +1,70 @@
+"""Tests for the per-language timeline cache"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import routes
+from api.routes import router
+from api.schemas import DocumentCategory
+from services.document_store import get_document_store
+
+
+TIMELINE = {
+    "before": {"title": "Old regime", "summary": "Tax under 819 sections", "source_reference": "Section 1"},
+    "change": {"title": "New Bill", "summary": "536 sections", "key_points": ["Simpler language"]},
+    "result": {"title": "Outcome", "summary": "Less litigation"},
+}
+
+
+class FakeRag:
+    def __init__(self):
+        self.calls = []
+    
+    async def generate_timeline(self, document_text, language="en"):
+        self.calls.append(language)
+        return TIMELINE
+
+
+def make_client(monkeypatch) -> tuple:
+    rag = FakeRag()
+    monkeypatch.setattr(routes, "get_rag_engine", lambda: rag)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    doc_id = get_document_store().create("Income-tax Bill", DocumentCategory("bill"), "/tmp/bill.pdf", full_text="Bill text")
+    return TestClient(app), rag, doc_id
+
+
+def test_english_timeline_is_generated_once_for_every_language(monkeypatch, fake_translator):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    english = client.get(f"/api/documents/{doc_id}/timeline").json()
+    hindi = client.get(f"/api/documents/{doc_id}/timeline?language=hi").json()
+    tamil = client.get(f"/api/documents/{doc_id}/timeline?language=ta").json()
+    
+    assert rag.calls == ["en"]
+    assert english == TIMELINE
+    assert hindi["change"]["key_points"] == ["[hi] Simpler language"]
+    assert tamil["result"]["summary"] == "[ta] Less litigation"
+    assert hindi["before"]["source_reference"] == "Section 1"  # References are not translated
+
+
+def test_each_language_is_translated_once_and_stored(monkeypatch, fake_translator):
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    first = client.get(f"/api/documents/{doc_id}/timeline?language=hi").json()
+    second = client.get(f"/api/documents/{doc_id}/timeline?language=hi").json()
+    
+    assert first == second
+    assert [target for target, _ in fake_translator] == ["hi"]  # One batched call
+    assert get_document_store().get(doc_id)["translations"]["hi"]["timeline"] == first
+    assert get_document_store().get(doc_id)["timeline"] == TIMELINE  # Canonical stays English
+
+
+def test_without_translator_the_english_timeline_is_returned(monkeypatch):
+    monkeypatch.setattr(routes.settings, "azure_translator_key", "")
+    client, rag, doc_id = make_client(monkeypatch)
+    
+    response = client.get(f"/api/documents/{doc_id}/timeline?language=hi")
+    
+    assert response.json() == TIMELINE
+    assert "etag" not in response.headers  # Not cached as the Hindi timeline
@@ -0,0 +1,55 @@
+"""Tests for batched translation"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import router
+from services.azure_translator import get_translator_service
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def test_batch_is_translated_in_one_call_with_duplicates_sent_once(fake_translator):
+    client = make_client()
+    
+    response = client.post("/api/translate/batch", json={"texts": ["Tax", "Bill", "Tax"], "target_language": "hi"})
+    
+    assert response.status_code == 200
+    assert response.json()["translations"] == ["[hi] Tax", "[hi] Bill", "[hi] Tax"]
+    assert fake_translator == [("hi", ["Tax", "Bill"])]
+
+
+def test_cached_texts_are_not_sent_again(fake_translator):
+    translator = get_translator_service()
+    
+    asyncio.run(translator.translate_batch(["Tax", "Bill"], "ta"))
+    result = asyncio.run(translator.translate_batch(["Bill", "Rule"], "ta"))
+    
+    assert result == ["[ta] Bill", "[ta] Rule"]
+    assert fake_translator == [("ta", ["Tax", "Bill"]), ("ta", ["Rule"])]
+
+
+def test_texts_past_the_azure_limits_are_split_across_calls(fake_translator):
+    texts = [f"Clause {i}" for i in range(150)] + ["x" * 30000, "y" * 30000]
+    
+    result = asyncio.run(get_translator_service().translate_batch(texts, "bn"))
+    
+    assert result == [f"[bn] {text}" for text in texts]
+    assert [len(batch) for _, batch in fake_translator] == [100, 51, 1]
+
+
+def test_batch_over_the_total_character_cap_is_rejected(fake_translator):
+    client = make_client()
+    
+    response = client.post("/api/translate/batch", json={"texts": ["x" * 5000] * 11, "target_language": "hi"})
+    too_many = client.post("/api/translate/batch", json={"texts": ["x"] * 101, "target_language": "hi"})
+    
+    assert response.status_code == 422
+    assert too_many.status_code == 422
+    assert fake_translator == []
@@ -0,0 +1,136 @@
+"""Tests for the document upload endpoint"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from api import routes
+from api.routes import router
+from api.schemas import DocumentCategory
+from services.document_store import DocumentStore, get_document_store
+from services.ingestion import get_ingestion_queue
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def upload(client: TestClient, filename: str, data: bytes):
+    return client.post(
+        "/api/documents/upload",
+        files={"file": (filename, data, "application/pdf")},
+        data={"title": "Finance Bill", "category": "bill"}
+    )
+
+
+def test_same_filename_does_not_overwrite_earlier_upload():
+    client = make_client()
+    
+    first = upload(client, "finance bill.pdf", b"%PDF-1 2024 edition")
+    second = upload(client, "finance bill.pdf", b"%PDF-1 2025 edition")
+    
+    assert first.status_code == second.status_code == 202
+    queue = get_ingestion_queue()
+    first_path = queue.get(first.json()["job_id"])["file_path"]
+    second_path = queue.get(second.json()["job_id"])["file_path"]
+    assert first_path != second_path
+    with open(first_path, "rb") as f:
+        assert f.read() == b"%PDF-1 2024 edition"
+    with open(second_path, "rb") as f:
+        assert f.read() == b"%PDF-1 2025 edition"
+    assert os.path.basename(first_path).endswith("_finance_bill.pdf")
+
+
+def test_stored_content_returns_the_existing_document_without_a_job(data_dir):
+    body = b"%PDF-1 gazette"
+    doc_id = get_document_store().create(
+        "Gazette", DocumentCategory("notification"), "/tmp/gazette.pdf",
+        summary="Already summarized", content_hash=hashlib.sha256(body).hexdigest()
+    )
+    client = make_client()
+    
+    response = upload(client, "gazette copy.pdf", body)
+    
+    assert response.status_code == 200
+    assert response.json()["document_id"] == doc_id
+    assert response.json()["duplicate"] is True
+    assert get_ingestion_queue().jobs == {}
+    assert [name for name in os.listdir(data_dir / "documents") if name.endswith((".pdf", ".upload"))] == []
+
+
+def test_content_being_ingested_points_at_the_running_job(data_dir):
+    client = make_client()
+    
+    first = upload(client, "bill.pdf", b"%PDF-1 same bytes")
+    second = upload(client, "bill (1).pdf", b"%PDF-1 same bytes")
+    
+    assert first.status_code == second.status_code == 202
+    assert second.json()["job_id"] == first.json()["job_id"]
+    assert len(get_ingestion_queue().jobs) == 1
+    assert len([name for name in os.listdir(data_dir / "documents") if name.endswith((".pdf", ".upload"))]) == 1
+
+
+def test_content_hash_index_is_rebuilt_on_load_and_cleared_on_delete():
+    doc_id = get_document_store().create("Bill", DocumentCategory("bill"), "/tmp/bill.pdf", content_hash="abc")
+    
+    reloaded = DocumentStore()
+    assert reloaded.find_by_hash("abc")["id"] == doc_id
+    
+    reloaded.delete(doc_id)
+    assert reloaded.find_by_hash("abc") is None
+
+
+def test_path_traversal_in_filename_stays_in_documents_dir(data_dir):
+    client = make_client()
+    
+    response = upload(client, "../../etc/passwd.pdf", b"%PDF-1 sneaky")
+    
+    file_path = get_ingestion_queue().get(response.json()["job_id"])["file_path"]
+    assert os.path.dirname(file_path) == str(data_dir / "documents")
+
+
+def test_missing_title_is_rejected_and_leaves_no_file(data_dir):
+    client = make_client()
+    
+    response = client.post(
+        "/api/documents/upload",
+        files={"file": ("bill.pdf", b"%PDF-1 body", "application/pdf")}
+    )
+    
+    assert response.status_code == 400
+    assert not [name for name in os.listdir(data_dir / "documents") if name.endswith(".upload")]
+
+
+def test_oversized_chunked_upload_is_aborted_while_streaming(data_dir, monkeypatch):
+    monkeypatch.setattr(routes, "MAX_UPLOAD_SIZE", 64 * 1024)
+    boundary = "niti-boundary"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"title\"\r\n\r\nBudget\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"budget.pdf\"\r\n"
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    chunks = [head] + [b"x" * 16 * 1024] * 1000  # 16MB body, no Content-Length
+    received = 0
+    
+    async def receive():
+        nonlocal received
+        received += 1
+        return {"type": "http.request", "body": chunks[received - 1], "more_body": received < len(chunks)}
+    
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/documents/upload",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())],
+    }
+    
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(routes._stream_upload(Request(scope, receive), str(data_dir / "documents")))
+    
+    assert error.value.status_code == 413
+    assert received <= 6  # Stopped reading just past the limit
+    assert not [name for name in os.listdir(data_dir / "documents") if name.endswith(".upload")]
@@ -0,0 +1,63 @@
+"""Tests for URL canonicalization and caching of URL extractions"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from config import settings
+from services.url_cache import canonicalize_url, permanent_http_failure, url_cache_ttl
+from services.url_extractor import URLContentExtractor
+
+
+def test_canonicalize_url():
+    assert canonicalize_url("https://youtu.be/dQw4w9WgXcQ?si=abc") == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    assert canonicalize_url("https://x.com/PIB_India/status/123?s=20") == "https://twitter.com/PIB_India/status/123"
+    assert canonicalize_url("HTTPS://News.example.com/a?utm_source=x&b=2&fbclid=y#top") == "https://news.example.com/a?b=2"
+
+
+def test_only_permanent_failures_get_a_ttl():
+    assert url_cache_ttl(True) == settings.url_cache_ttl
+    assert url_cache_ttl(False, permanent_failure=True) == settings.url_cache_negative_ttl
+    assert url_cache_ttl(False) == 0
+    assert [status for status in (400, 403, 404, 408, 410, 429, 500, 503) if permanent_http_failure(status)] == [400, 403, 404, 410]
+
+
+def extract_twice(status: int, content_type: str = "text/html"):
+    """Fetch the same URL twice; returns (results, requests that reached the server)"""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(status, content=b"<p>Hello</p>", headers={"Content-Type": content_type})
+    
+    async def go():
+        extractor = URLContentExtractor()
+        await extractor.client.aclose()
+        extractor.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [await extractor.extract_from_url("https://news.example.com/story") for _ in range(2)]
+        finally:
+            await extractor.aclose()
+    
+    return asyncio.run(go()), requests
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_permanent_http_failure_is_cached(status):
+    results, requests = extract_twice(status)
+    assert not results[1]["success"]
+    assert len(requests) == 1
+
+
+def test_unsupported_content_type_is_cached():
+    results, requests = extract_twice(200, "application/pdf")
+    assert "Unsupported content type" in results[0]["error"]
+    assert len(requests) == 1
+
+
+@pytest.mark.parametrize("status", [408, 429, 500, 503])
+def test_transient_http_failure_is_not_cached(status):
+    results, requests = extract_twice(status)
+    assert not results[0]["success"] and not results[0]["permanent_failure"]
+    assert len(requests) == 2
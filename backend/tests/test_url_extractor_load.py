@@ -0,0 +1,153 @@
+"""Load tests for the URL extractor's shared client against a local slow server"""
+
+import asyncio
+import time
+
+import httpx
+
+from config import settings
+from services.url_extractor import URLContentExtractor
+
+
+PAGE = b"<html><head><title>Notice</title></head><body><article><p>" + b"The ministry issued a notification today, " * 20 + b"</p></article></body></html>"
+
+
+class SlowServer:
+    """HTTP/1.1 keep-alive server that waits `delay` seconds before each response"""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+        self.open_connections = 0
+        self.max_open_connections = 0
+        self.requests = 0
+    
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+    
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.open_connections += 1
+        self.max_open_connections = max(self.max_open_connections, self.open_connections)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                    + f"Content-Length: {len(PAGE)}\r\n\r\n".encode() + PAGE
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+
+def run_against_server(delay: float, urls_from_base, monkeypatch, **overrides):
+    """Extract URLs concurrently; returns (results, server, seconds taken)"""
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    
+    async def go():
+        server = SlowServer(delay)
+        base = await server.start()
+        extractor = URLContentExtractor()
+        started = time.perf_counter()
+        try:
+            results = await asyncio.gather(*[extractor.extract_from_url(url) for url in urls_from_base(base)])
+            return results, server, time.perf_counter() - started
+        finally:
+            await extractor.aclose()
+            await server.stop()
+    
+    results, server, elapsed = asyncio.run(go())
+    return results, server, elapsed
+
+
+def test_burst_to_one_host_uses_bounded_sockets(monkeypatch):
+    results, server, _ = run_against_server(
+        0.05, lambda base: [f"{base}/story/{i}" for i in range(40)], monkeypatch,
+        url_max_per_host=4, url_pool_timeout=30.0
+    )
+    
+    assert all(result["success"] for result in results)
+    assert server.requests == 40
+    assert server.max_open_connections <= 4
+    assert server.connections <= 4  # Connections are reused, not reopened
+
+
+def test_overloaded_host_fails_fast_and_is_retried(monkeypatch):
+    results, server, elapsed = run_against_server(
+        0.5, lambda base: [f"{base}/story/{i}" for i in range(10)], monkeypatch,
+        url_max_per_host=2, url_pool_timeout=0.2
+    )
+    
+    served = [result for result in results if result["success"]]
+    rejected = [result for result in results if not result["success"]]
+    assert len(served) == 2
+    assert all("Too many requests" in result["error"] for result in rejected)
+    assert all(not result["permanent_failure"] for result in rejected)
+    assert elapsed < 2.0  # Rejected requests don't wait for the slow ones
+    assert server.max_open_connections <= 2
+
+
+def test_slow_server_hits_the_deadline_and_is_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "url_fetch_deadline", 0.2)
+    
+    async def go():
+        server = SlowServer(1.0)
+        base = await server.start()
+        extractor = URLContentExtractor()
+        try:
+            first = await extractor.extract_from_url(f"{base}/slow")
+            second = await extractor.extract_from_url(f"{base}/slow")
+            return first, second, server.requests
+        finally:
+            await extractor.aclose()
+            await server.stop()
+    
+    first, second, requests = asyncio.run(go())
+    
+    assert "Timed out" in first["error"] and "Timed out" in second["error"]
+    assert requests == 2  # The timeout was not served from the cache
+
+
+def test_oembed_is_not_held_to_the_per_host_cap(monkeypatch):
+    monkeypatch.setattr(settings, "url_max_per_host", 2)
+    monkeypatch.setattr(settings, "url_max_per_oembed_host", 8)
+    in_flight = 0
+    peak = 0
+    
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, json={"title": "Budget speech", "author_name": "PIB India"})
+    
+    async def go():
+        extractor = URLContentExtractor()
+        await extractor.client.aclose()
+        extractor.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await asyncio.gather(*[
+                extractor.extract_from_url(f"https://youtu.be/video{i:06d}") for i in range(16)
+            ])
+        finally:
+            await extractor.aclose()
+    
+    results = asyncio.run(go())
+    
+    assert all(result["success"] for result in results)
+    assert 2 < peak <= 8
@@ -8,6 +8,7 @@ const API_BASE = 'https://niti-satya-production.up.railway.app/api';
 
 // State
 let currentDocId = null;
+let currentDoc = null;
 let currentLanguage = 'en';
 let panelOpen = false;
 
@@ -139,27 +140,26 @@ async function translateContent(targetLang) {
         return;
     }
 
-    try {
-        // Get current content to translate
-        const summaryText = document.getElementById('doc-summary-text').textContent;
-
-        // Call translation API
-        const response = await fetch(`${API_BASE}/translate`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                text: summaryText,
-                target_language: targetLang,
-                source_language: 'en'
-            })
-        });
-
-        if (response.ok) {
-            const data = await response.json();
-            document.getElementById('doc-summary-text').textContent = data.translated_text;
+    // Use translations stored with the document, or have the server translate
+    // and store them - one bundle request instead of per-panel translation calls
+    const pretranslated = currentDoc?.translations?.[targetLang]
+        || await loadBundleTranslation(currentDocId, targetLang);
+    if (pretranslated) {
+        displayTranslatedDocument(pretranslated);
+        // Timeline may not be pre-translated yet - translate just that part
+        if (!pretranslated.timeline) await translateTimelineContent(targetLang);
+        return;
+    }
 
-            // Also translate timeline summaries
-            await translateTimelineContent(targetLang);
+    try {
+        // Translate the summary and timeline summaries in one request
+        const summaryElem = document.getElementById('doc-summary-text');
+        const timelineElems = getTimelineSummaryElements();
+        const targets = [summaryElem, ...timelineElems];
+
+        const translations = await translateTexts(targets.map(elem => elem.textContent), targetLang);
+        if (translations) {
+            targets.forEach((elem, i) => { elem.textContent = translations[i]; });
         } else {
             console.log('Translation API not available');
             showTranslationError();
@@ -170,39 +170,99 @@ async function translateContent(targetLang) {
     }
 }
 
+/**
+ * Fetch a document's display fields in another language from the bundle endpoint
+ * Returns the translation, or null if the API can't provide one
+ */
+async function loadBundleTranslation(docId, targetLang) {
+    try {
+        const response = await fetch(`${API_BASE}/documents/${docId}/bundle?language=${targetLang}`);
+        if (!response.ok) return null;
+
+        const bundle = await response.json();
+        if (!bundle.translation) return null;
+
+        if (currentDoc) {
+            currentDoc.translations = currentDoc.translations || {};
+            currentDoc.translations[targetLang] = bundle.translation;
+        }
+        return bundle.translation;
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Display pre-translated document fields over the English content
+ */
+function displayTranslatedDocument(translated) {
+    if (translated.title) {
+        elements.docTitle.textContent = translated.title;
+    }
+    if (translated.summary) {
+        document.getElementById('doc-summary-text').textContent = translated.summary;
+    }
+    if (translated.key_points?.length) {
+        const pointsList = document.getElementById('key-points-list');
+        pointsList.innerHTML = '';
+        translated.key_points.forEach(point => {
+            const li = document.createElement('li');
+            li.textContent = point;
+            pointsList.appendChild(li);
+        });
+    }
+    if (translated.timeline) {
+        displayTimeline(translated.timeline);
+    }
+}
+
 /**
  * Translate timeline content
  */
 async function translateTimelineContent(targetLang) {
-    const elementsToTranslate = [
+    const timelineElems = getTimelineSummaryElements();
+    if (!timelineElems.length) return;
+
+    try {
+        const translations = await translateTexts(timelineElems.map(elem => elem.textContent), targetLang);
+        translations?.forEach((text, i) => { timelineElems[i].textContent = text; });
+    } catch (e) {
+        // Keep the English timeline
+    }
+}
+
+/**
+ * Timeline summary elements that currently have text
+ */
+function getTimelineSummaryElements() {
+    return [
         'timeline-before-summary',
         'timeline-change-summary',
         'timeline-result-summary'
-    ];
-
-    for (const elemId of elementsToTranslate) {
-        const elem = document.getElementById(elemId);
-        if (elem && elem.textContent) {
-            try {
-                const response = await fetch(`${API_BASE}/translate`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        text: elem.textContent,
-                        target_language: targetLang,
-                        source_language: 'en'
-                    })
-                });
-
-                if (response.ok) {
-                    const data = await response.json();
-                    elem.textContent = data.translated_text;
-                }
-            } catch (e) {
-                // Continue with other translations
-            }
-        }
-    }
+    ]
+        .map(id => document.getElementById(id))
+        .filter(elem => elem && elem.textContent);
+}
+
+/**
+ * Translate a list of texts with a single batch API call
+ * Returns translations in the same order, or null if the API is unavailable
+ */
+async function translateTexts(texts, targetLang) {
+    const response = await fetch(`${API_BASE}/translate/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            texts: texts,
+            target_language: targetLang,
+            source_language: 'en'
+        })
+    });
+
+    if (!response.ok) return null;
+
+    const data = await response.json();
+    return data.translations;
 }
 
 /**
@@ -246,7 +306,8 @@ function showTranslationError() {
  */
 async function loadDocument(docId) {
     try {
-        const response = await fetch(`${API_BASE}/documents/${docId}`);
+        // One round trip: metadata, timeline and the current language's translations
+        const response = await fetch(`${API_BASE}/documents/${docId}/bundle?language=${currentLanguage}`);
 
         if (!response.ok) {
             // Use demo data
@@ -254,7 +315,9 @@ async function loadDocument(docId) {
             return;
         }
 
-        let doc = await response.json();
+        const bundle = await response.json();
+        let doc = { ...bundle.document, timeline: bundle.timeline, translations: {} };
+        if (bundle.translation) doc.translations[bundle.language] = bundle.translation;
 
         // DEMO FIX: If API doc lacks timeline/legislative_journey, merge from demo data if available
         // This ensures the timeline tab works immediately for demo/presentation
@@ -268,7 +331,9 @@ async function loadDocument(docId) {
             if (!doc.key_points && demoDoc.key_points) doc.key_points = demoDoc.key_points;
         }
 
+        currentDoc = doc;
         displayDocument(doc);
+        if (bundle.translation) displayTranslatedDocument(bundle.translation);
     } catch (error) {
         console.log('API not available, using demo data');
         loadDemoDocument(docId);
@@ -639,6 +704,17 @@ function displayPdf(doc) {
     }
 }
 
+/**
+ * Jump the embedded PDF to a cited page
+ */
+function goToPdfPage(page) {
+    const iframe = elements.pdfViewer.querySelector('.pdf-iframe');
+    if (!iframe) return;
+
+    iframe.src = `${iframe.src.split('#')[0]}#page=${page}`;
+    elements.pdfViewer.scrollIntoView({ behavior: 'smooth' });
+}
+
 /**
  * Show PDF fallback when PDF isn't available
  */
@@ -867,11 +943,20 @@ function addMessage(text, type, citations = null) {
             <p>${text}</p>
             ${citations ? `<div class="citations">
                 <span class="citation-label">Source:</span>
-                ${citations.map(c => `<span class="citation">${c.section || 'Document'}</span>`).join('')}
+                ${citations.map(c => c.page
+                    ? `<a class="citation" href="#" data-page="${c.page}">${c.section || `Page ${c.page}`}</a>`
+                    : `<span class="citation">${c.section || 'Document'}</span>`).join('')}
             </div>` : ''}
         </div>
     `;
 
+    messageDiv.querySelectorAll('.citation[data-page]').forEach(link => {
+        link.addEventListener('click', (e) => {
+            e.preventDefault();
+            goToPdfPage(link.dataset.page);
+        });
+    });
+
     elements.qaMessages.appendChild(messageDiv);
     elements.qaMessages.scrollTop = elements.qaMessages.scrollHeight;
 }
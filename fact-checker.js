@@ -231,7 +231,9 @@ function displayEvidence(evidence) {
             <blockquote class="evidence-quote">
                 "${ev.quote || 'No quote available'}"
             </blockquote>
-            ${ev.page ? `<div class="evidence-page">Page ${ev.page}</div>` : ''}
+            ${ev.page ? `<div class="evidence-page">${ev.pdf_url
+                ? `<a href="${API_BASE.replace(/\/api$/, '')}${ev.pdf_url}" target="_blank" rel="noopener">Page ${ev.page}</a>`
+                : `Page ${ev.page}`}</div>` : ''}
         </div>
     `).join('');
 }